@@ -0,0 +1,49 @@
+import argparse
+import timeit
+from decimal import ROUND_HALF_UP, Decimal
+
+from gamba_bot.utils.currency import Money, format_cents, parse_credits_to_cents
+
+
+def decimal_format_cents(cents: int, *, grouping: bool = False) -> str:
+    value = Decimal(cents) / Decimal(100)
+    return f"{value:,.2f}" if grouping else f"{value:.2f}"
+
+
+def decimal_parse_credits_to_cents(amount: float) -> int:
+    value = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+# Balances and stakes reach the cogs as Money already, so the grouped cases time
+# formatting alone; "Money build+grouped" adds the construction.
+LARGE = Money(123_456_789)
+SMALL = Money(12_345)
+
+CASES = (
+    ("format: Decimal baseline", lambda: decimal_format_cents(123_456_789)),
+    ("format: format_cents", lambda: format_cents(123_456_789)),
+    ("format: Decimal grouped", lambda: decimal_format_cents(123_456_789, grouping=True)),
+    ("format: Money grouped", lambda: str(LARGE)),
+    ("format: Money build+grouped", lambda: str(Money(123_456_789))),
+    ("format small: Decimal grouped", lambda: decimal_format_cents(12_345, grouping=True)),
+    ("format small: Money grouped", lambda: str(SMALL)),
+    ("format: Money short", lambda: LARGE.short()),
+    ("parse: Decimal baseline", lambda: decimal_parse_credits_to_cents(1234.56)),
+    ("parse: parse_credits_to_cents", lambda: parse_credits_to_cents(1234.56)),
+    ("parse tie: Decimal baseline", lambda: decimal_parse_credits_to_cents(1234.565)),
+    ("parse tie: parse_credits_to_cents", lambda: parse_credits_to_cents(1234.565)),
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare money formatting and parsing costs.")
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+    for label, fn in CASES:
+        best = min(timeit.repeat(fn, number=args.number, repeat=5))
+        print(f"{label:<32} {best / args.number * 1e9:8.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
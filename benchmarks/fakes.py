@@ -0,0 +1,107 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from gamba_bot.services.jackpot import JackpotPool
+from gamba_bot.services.stats import GameStats
+from gamba_bot.utils.abuse import AbuseDetector
+from gamba_bot.utils.sessions import SessionRegistry
+
+
+_ids = itertools.count(10_000)
+
+
+@dataclass
+class CallLog:
+    record: bool = True
+    latency: float = 0.0
+    count: int = 0
+    calls: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+
+    async def hit(self, name: str, fields: dict[str, Any]) -> None:
+        self.count += 1
+        if self.record:
+            self.calls.append((name, fields))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+@dataclass(frozen=True)
+class FakeUser:
+    id: int
+    display_name: str = "player"
+    bot: bool = False
+
+
+@dataclass(frozen=True)
+class FakeMessage:
+    id: int
+
+
+class FakeResponse:
+    def __init__(self, log: CallLog):
+        self._log = log
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **fields: Any) -> None:
+        self._done = True
+        await self._log.hit("response.defer", fields)
+
+    async def send_message(self, content: Optional[str] = None, **fields: Any) -> None:
+        self._done = True
+        await self._log.hit("response.send_message", {"content": content, **fields})
+
+    async def edit_message(self, **fields: Any) -> None:
+        self._done = True
+        await self._log.hit("response.edit_message", fields)
+
+
+class FakeFollowup:
+    def __init__(self, log: CallLog):
+        self._log = log
+
+    async def send(self, content: Optional[str] = None, **fields: Any) -> None:
+        await self._log.hit("followup.send", {"content": content, **fields})
+
+
+class FakeInteraction:
+    def __init__(
+        self,
+        user: FakeUser,
+        log: CallLog,
+        *,
+        message: Optional[FakeMessage] = None,
+        channel_id: Optional[int] = None,
+        guild: Any = None,
+    ):
+        self.id = next(_ids)
+        self.token = f"token-{self.id}"
+        self.user = user
+        self.message = message
+        self.channel_id = channel_id
+        self.guild = guild
+        self.guild_id = None if guild is None else guild.id
+        self.command = None
+        self.response = FakeResponse(log)
+        self.followup = FakeFollowup(log)
+        self._log = log
+
+    async def edit_original_response(self, **fields: Any) -> None:
+        await self._log.hit("edit_original_response", fields)
+
+
+class FakeBot:
+    def __init__(self, db: Any, *, metrics: Any, responses: Any):
+        self.db = db
+        self.metrics = metrics
+        self.responses = responses
+        self.sessions = SessionRegistry()
+        self.stats = GameStats(metrics=metrics)
+        self.jackpot = JackpotPool(contribution_bps=100, seed=100_000, metrics=metrics)
+        self.abuse: Optional[AbuseDetector] = None
+        self.draining = False
+        self.user = FakeUser(1, "gamba-bot", bot=True)
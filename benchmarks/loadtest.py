@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from benchmarks.fakes import CallLog, FakeBot, FakeInteraction, FakeMessage, FakeUser
+from gamba_bot.cogs.blackjack import BlackjackSessionView
+from gamba_bot.cogs.roulette import RouletteCog
+from gamba_bot.cogs.slots import SlotsView
+from gamba_bot.database import Database
+from gamba_bot.services.games import hand_total, roulette
+from gamba_bot.services.ledger import LedgerClient, LedgerServer
+from gamba_bot.utils.loop import EVENT_LOOPS, LoopMonitor, event_loop_factory
+from gamba_bot.utils.metrics import Metrics
+from gamba_bot.utils.respond import ResponseCoordinator
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoadHarness:
+    def __init__(self, bot: FakeBot, log: CallLog):
+        self.bot = bot
+        self.log = log
+        self.latencies: dict[str, list[float]] = {}
+        self.errors = 0
+
+    async def _timed(self, action: str, call: Callable[[], Awaitable[None]]) -> None:
+        started = time.perf_counter()
+        try:
+            await call()
+        except Exception:
+            self.errors += 1
+        self.latencies.setdefault(action, []).append(time.perf_counter() - started)
+
+    def _interaction(self, user: FakeUser, message: FakeMessage | None = None) -> FakeInteraction:
+        return FakeInteraction(user, self.log, message=message, channel_id=user.id % 50)
+
+    async def roulette_player(self, user: FakeUser, rounds: int, cog: RouletteCog) -> None:
+        for _ in range(rounds):
+            interaction = self._interaction(user)
+            pick = random.choice(("red", "black", "green"))
+            await self._timed(
+                "roulette",
+                lambda: cog.play(
+                    interaction,
+                    stake=100,
+                    title="Roulette",
+                    game_fn=lambda: roulette(100, pick),
+                ),
+            )
+
+    async def slots_player(self, user: FakeUser, rounds: int) -> None:
+        origin = self._interaction(user)
+        record = await self.bot.db.ensure_user(user)
+        view = SlotsView(self.bot, origin_interaction=origin, stake=100, user_record=record)
+        message = FakeMessage(origin.id)
+        for _ in range(rounds):
+            interaction = self._interaction(user, message)
+            await self._timed("slots.spin", lambda: view.spin(interaction))
+        view.stop()
+
+    async def blackjack_player(self, user: FakeUser, rounds: int) -> None:
+        origin = self._interaction(user)
+        record = await self.bot.db.ensure_user(user)
+        view = BlackjackSessionView(self.bot, origin_interaction=origin, balance=record.balance)
+        message = FakeMessage(origin.id)
+        for _ in range(rounds):
+            await self._timed("blackjack.deal", lambda: view.deal_hand(self._interaction(user, message)))
+            while view.round_state is not None and not view.awaiting_new_hand:
+                if hand_total(view.round_state.player_hand) < 17:
+                    await self._timed("blackjack.hit", lambda: view.hit(self._interaction(user, message)))
+                else:
+                    await self._timed("blackjack.stick", lambda: view.stick(self._interaction(user, message)))
+            await self._timed("blackjack.new_hand", lambda: view.new_hand_yes(self._interaction(user, message)))
+        await view.new_hand_no(self._interaction(user, message))
+
+    def report(self, elapsed: float, monitor: LoopMonitor) -> dict[str, object]:
+        actions = {}
+        total = 0
+        for action, samples in sorted(self.latencies.items()):
+            total += len(samples)
+            actions[action] = {
+                "count": len(samples),
+                "p50_ms": round(_percentile(samples, 0.50) * 1000, 2),
+                "p99_ms": round(_percentile(samples, 0.99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+            }
+
+        statements = self.bot.metrics.series("gamba_db_statement_seconds")
+        db_busy = sum(histogram.total for _, histogram in statements)
+        db_count = sum(histogram.count for _, histogram in statements)
+        lag = self.bot.metrics.series("gamba_loop_lag_seconds")
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "actions": total,
+            "throughput_per_s": round(total / elapsed, 1) if elapsed else 0.0,
+            "errors": self.errors,
+            "api_calls": self.log.count,
+            "coalesced_edits": self.bot.responses.coalesced_count,
+            "per_action": actions,
+            "database": {
+                "statements": db_count,
+                "statement_time_s": round(db_busy, 3),
+                "mean_statement_ms": round(db_busy / db_count * 1000, 3) if db_count else 0.0,
+                # Statement time includes waiting on the single aiosqlite worker, so a
+                # ratio well above 1 means callers were queueing for the connection.
+                "contention_ratio": round(db_busy / elapsed, 2) if elapsed else 0.0,
+            },
+            "event_loop": {
+                "lag_p99_ms": round(lag[0][1].quantile(0.99) * 1000, 2) if lag else 0.0,
+                "lag_max_ms": round(monitor.max_lag * 1000, 2),
+                "stalls": monitor.stall_count,
+            },
+        }
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    if args.database == ":memory:":
+        db_path = ":memory:"
+    else:
+        db_path = args.database or os.path.join(tempfile.mkdtemp(prefix="gamba-load-"), "load.db")
+    metrics = Metrics()
+    db = Database(db_path, args.starting_balance, metrics=metrics)
+    await db.initialize()
+    ledger: LedgerServer | None = None
+    if args.ledger:
+        ledger = LedgerServer(db, os.path.join(tempfile.mkdtemp(prefix="gamba-ledger-"), "ledger.sock"), metrics=metrics)
+        await ledger.start()
+        db = LedgerClient(ledger.socket_path, metrics=metrics)
+        await db.initialize()
+    responses = ResponseCoordinator(
+        min_gap_seconds=args.min_gap,
+        global_rate=args.global_rate,
+        metrics=metrics,
+    )
+    bot = FakeBot(db, metrics=metrics, responses=responses)
+    await bot.jackpot.start(db, flush_seconds=1.0)
+    log = CallLog(record=False, latency=args.api_latency)
+    harness = LoadHarness(bot, log)
+    cog = RouletteCog(bot)
+
+    monitor = LoopMonitor(interval_seconds=0.05, metrics=metrics)
+    players = []
+    for idx in range(args.users):
+        user = FakeUser(1_000_000 + idx, f"player-{idx}")
+        game = args.games[idx % len(args.games)]
+        if game == "roulette":
+            players.append(harness.roulette_player(user, args.rounds, cog))
+        elif game == "slots":
+            players.append(harness.slots_player(user, args.rounds))
+        else:
+            players.append(harness.blackjack_player(user, args.rounds))
+
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*players)
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    await bot.jackpot.close()
+    await db.close()
+    if ledger is not None:
+        await ledger.close()
+        await ledger.db.close()
+    report = harness.report(elapsed, monitor)
+    report["event_loop"]["name"] = args.loop  # type: ignore[index]
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Drive the game cogs with simulated interactions.")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--games",
+        nargs="+",
+        choices=("roulette", "slots", "blackjack"),
+        default=["roulette", "slots", "blackjack"],
+    )
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Simulated Discord API latency in seconds.")
+    parser.add_argument("--min-gap", type=float, default=0.4, help="ResponseCoordinator per-user gap.")
+    parser.add_argument("--global-rate", type=float, default=50.0, help="ResponseCoordinator global requests/s.")
+    parser.add_argument("--database", default=None, help="Database path, ':memory:', or a temp file by default.")
+    parser.add_argument("--starting-balance", type=int, default=100_000_000)
+    parser.add_argument(
+        "--ledger",
+        action="store_true",
+        help="Route balance calls through an in-process ledger service over a Unix socket.",
+    )
+    parser.add_argument("--loop", choices=EVENT_LOOPS, default="asyncio", help="Event loop implementation.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def print_report(report: dict[str, object]) -> None:
+    print(
+        f"{report['actions']} actions in {report['elapsed_s']}s "
+        f"({report['throughput_per_s']}/s), errors={report['errors']}, "
+        f"api_calls={report['api_calls']}, coalesced={report['coalesced_edits']}"
+    )
+    for action, stats in report["per_action"].items():  # type: ignore[union-attr]
+        print(f"  {action:<20} n={stats['count']:<7} p50={stats['p50_ms']:>8}ms p99={stats['p99_ms']:>8}ms")
+    database = report["database"]
+    print(
+        f"  database: {database['statements']} statements, "  # type: ignore[index]
+        f"mean {database['mean_statement_ms']}ms, contention ratio {database['contention_ratio']}"  # type: ignore[index]
+    )
+    loop = report["event_loop"]
+    print(
+        f"  event loop ({loop['name']}): lag p99 {loop['lag_p99_ms']}ms, "  # type: ignore[index]
+        f"max {loop['lag_max_ms']}ms, stalls {loop['stalls']}"  # type: ignore[index]
+    )
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    with asyncio.Runner(loop_factory=event_loop_factory(args.loop)) as runner:
+        report = runner.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+import timeit
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from benchmarks.fakes import FakeUser
+from gamba_bot.database import BetEntry, Database
+from gamba_bot.services.games import (
+    blackjack_odds,
+    create_blackjack_round,
+    evaluate_slots,
+    hand_total,
+    roulette,
+    spin_slot_reels,
+)
+from gamba_bot.services.jackpot import JackpotPool
+from gamba_bot.services.stats import GameStats
+from gamba_bot.utils.currency import Money, format_cents, parse_credits_to_cents
+
+SETTLE_MANY_BATCH = 16
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    sync_fn: Optional[Callable[[], object]] = None
+    async_factory: Optional[Callable[[int], Awaitable[float]]] = None
+    iterations: int = 0
+
+
+def _sync_cases() -> list[Benchmark]:
+    two_cards = ["AS", "KD"]
+    five_cards = ["AS", "2H", "AC", "9D", "5S"]
+    held_stops = [3, 7, 11]
+    odds_round = create_blackjack_round(8)
+    game_stats = GameStats()
+    jackpot = JackpotPool(contribution_bps=100, seed=100_000)
+    cases = [
+        ("games.hand_total[2]", lambda: hand_total(two_cards)),
+        ("games.hand_total[5]", lambda: hand_total(five_cards)),
+        ("games.create_blackjack_round[8]", lambda: create_blackjack_round(8)),
+        ("games.spin_slot_reels[free]", lambda: spin_slot_reels(None, [False, False, False])),
+        ("games.spin_slot_reels[held]", lambda: spin_slot_reels(held_stops, [True, False, True])),
+        ("games.evaluate_slots[3oak]", lambda: evaluate_slots(("bell", "bell", "bell"), 250)),
+        ("games.evaluate_slots[miss]", lambda: evaluate_slots(("bar", "lemon", "grape"), 250)),
+        ("games.roulette", lambda: roulette(250, "red")),
+        (
+            "games.blackjack_odds[1k]",
+            lambda: blackjack_odds(
+                odds_round.player_hand, odds_round.dealer_hand[0], odds_round.deck, trials=1_000, seed=7
+            ),
+        ),
+        ("stats.record", lambda: game_stats.record("slots", 123_456_789, 250, -250)),
+        ("jackpot.contribute", lambda: jackpot.contribute(250)),
+        ("currency.format_cents", lambda: format_cents(123_456_789)),
+        ("currency.money_str", lambda: str(Money(123_456_789))),
+        ("currency.parse_credits_to_cents", lambda: parse_credits_to_cents(1234.56)),
+    ]
+    return [Benchmark(name, sync_fn=fn) for name, fn in cases]
+
+
+def _database_case(label: str, path_factory: Callable[[], str], op: str, iterations: int) -> Benchmark:
+    async def run(count: int) -> float:
+        db = Database(path_factory(), 10_000_000_000)
+        await db.initialize()
+        users = [FakeUser(5_000 + idx, f"bench-{idx}") for idx in range(64)]
+        for user in users:
+            await db.ensure_user(user)
+        try:
+            started = time.perf_counter()
+            for idx in range(count):
+                user = users[idx % len(users)]
+                if op == "ensure_user":
+                    await db.ensure_user(user)
+                elif op == "settle_bet":
+                    await db.settle_bet(user, stake=100, delta=random.choice((-100, 100)))
+                elif op == "settle_many":
+                    # Reported per entry, so it compares directly with settle_bet.
+                    if idx % SETTLE_MANY_BATCH == 0:
+                        await db.settle_many(
+                            [
+                                BetEntry(users[(idx + n) % len(users)], 100, random.choice((-100, 100)), "bench")
+                                for n in range(min(SETTLE_MANY_BATCH, count - idx))
+                            ]
+                        )
+                else:
+                    await db.add_credits(user, 100)
+            return time.perf_counter() - started
+        finally:
+            await db.close()
+
+    return Benchmark(f"database.{op}[{label}]", async_factory=run, iterations=iterations)
+
+
+def _temp_path() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="gamba-bench-"), "bench.db")
+
+
+def all_benchmarks(quick: bool = False) -> list[Benchmark]:
+    file_iterations = 50 if quick else 300
+    memory_iterations = 200 if quick else 2_000
+    cases = _sync_cases()
+    for op in ("ensure_user", "settle_bet", "settle_many", "add_credits"):
+        cases.append(_database_case("file", _temp_path, op, file_iterations))
+        cases.append(_database_case("memory", lambda: ":memory:", op, memory_iterations))
+    return cases
+
+
+def measure(benchmark: Benchmark, *, repeat: int = 5, quick: bool = False) -> dict[str, float]:
+    if benchmark.sync_fn is not None:
+        timer = timeit.Timer(benchmark.sync_fn)
+        number, _ = timer.autorange()
+        if quick:
+            number = max(1, number // 4)
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        return {"ns_per_op": best * 1e9, "ops": number}
+
+    assert benchmark.async_factory is not None
+    runs = [asyncio.run(benchmark.async_factory(benchmark.iterations)) for _ in range(max(1, repeat // 2))]
+    best = min(runs) / benchmark.iterations
+    return {"ns_per_op": best * 1e9, "ops": benchmark.iterations}
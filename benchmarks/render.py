@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks.fakes import CallLog, FakeInteraction, FakeUser
+from gamba_bot.cogs.blackjack import STAKE_TIERS, TIER_ORDER, BlackjackSessionView
+from gamba_bot.cogs.slots import SlotsView
+from gamba_bot.database import UserRecord
+from gamba_bot.services.jackpot import JackpotPool
+from gamba_bot.utils.currency import Money
+
+
+def _per_click(label: str, clicks: int, fn) -> None:
+    started = time.perf_counter()
+    for idx in range(clicks):
+        fn(idx)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed / clicks * 1e6:8.1f} us/click")
+
+
+async def bench(clicks: int) -> None:
+    bot = SimpleNamespace(jackpot=JackpotPool(contribution_bps=100, seed=100_000))
+    interaction = FakeInteraction(FakeUser(1), CallLog(record=False))
+
+    blackjack = BlackjackSessionView(bot, origin_interaction=interaction, balance=Money(5_000_000))
+    blackjack._watchdog_task.cancel()
+    stakes = [(tier, value) for tier in TIER_ORDER for value in STAKE_TIERS[tier]["values"]]
+
+    def blackjack_click(idx: int) -> None:
+        blackjack.selected_tier, blackjack.selected_stake = stakes[idx % len(stakes)]
+        blackjack._rebuild_controls()
+        blackjack._payload.update(blackjack._build_embed(), blackjack)
+
+    def blackjack_repeat_click(idx: int) -> None:
+        blackjack._rebuild_controls()
+        blackjack._payload.update(blackjack._build_embed(), blackjack)
+
+    record = UserRecord(1, "player", Money(5_000_000), "", "")
+    slots = SlotsView(bot, origin_interaction=interaction, stake=150, user_record=record)
+
+    def slots_click(idx: int) -> None:
+        slots.holds[idx % 3] = not slots.holds[idx % 3]
+        slots._sync_hold_buttons()
+        slots._payload.update(slots.build_embed(footer="Select holds, then press Spin."), slots)
+
+    _per_click("blackjack stake change", clicks, blackjack_click)
+    _per_click("blackjack unchanged click", clicks, blackjack_repeat_click)
+    def slots_idle_click(idx: int) -> None:
+        # Other players' spins move the shared pool between this view's renders.
+        bot.jackpot.contribute(150)
+        slots._payload.update(slots.build_embed(footer="Select holds, then press Spin."), slots)
+
+    _per_click("slots hold toggle", clicks, slots_click)
+    _per_click("slots unchanged click", clicks, slots_idle_click)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure embed render cost per click.")
+    parser.add_argument("--clicks", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.clicks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from benchmarks.micro import all_benchmarks, measure
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[tuple[str, float, float, float]]:
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous["ns_per_op"]:
+            continue
+        ratio = result["ns_per_op"] / previous["ns_per_op"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, previous["ns_per_op"], result["ns_per_op"], ratio))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the gamba micro-benchmark suite.")
+    parser.add_argument("-k", "--filter", default="*", help="Glob matched against benchmark names.")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown before flagging (0.15 = 15%%).")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations, for smoke runs.")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for benchmark in all_benchmarks(quick=args.quick):
+        if not fnmatch.fnmatch(benchmark.name, args.filter):
+            continue
+        result = measure(benchmark, repeat=args.repeat, quick=args.quick)
+        results[benchmark.name] = result
+        print(f"{benchmark.name:<40} {result['ns_per_op'] / 1000:12.3f} us/op")
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions = compare(report, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions above {args.threshold:.0%} against {baseline.get('commit') or args.compare}.")
+        return 0
+    print(f"Regressions above {args.threshold:.0%} against {baseline.get('commit') or args.compare}:")
+    for name, before, after, ratio in regressions:
+        print(f"  {name:<40} {before / 1000:10.3f} -> {after / 1000:10.3f} us/op ({ratio - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
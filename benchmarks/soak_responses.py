@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.fakes import CallLog, FakeInteraction, FakeUser
+from gamba_bot.utils.respond import ResponseCoordinator
+
+
+async def soak(users: int, report_every: int, max_tracked: int) -> None:
+    coordinator = ResponseCoordinator(
+        min_gap_seconds=0.0,
+        global_rate=1e12,
+        channel_rate=1e12,
+        channel_burst=1e12,
+        max_tracked=max_tracked,
+    )
+    log = CallLog(record=False)
+    tracemalloc.start()
+    started = time.perf_counter()
+    baseline = None
+    for user_id in range(1, users + 1):
+        interaction = FakeInteraction(FakeUser(user_id), log, channel_id=user_id % 5_000)
+        await coordinator.edit_original(interaction, content="soak")
+        if user_id % report_every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            if baseline is None:
+                baseline = current
+            report = coordinator.memory_report()
+            print(
+                f"{user_id:>9} users  traced={current / 1024:9.1f} KiB  "
+                f"drift={(current - baseline) / 1024:+8.1f} KiB  peak={peak / 1024:9.1f} KiB  "
+                f"tracked={report['users']}  evicted={report['user_evictions']}"
+            )
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+    print(f"{users} edits in {elapsed:.1f}s ({users / elapsed:,.0f}/s), API calls: {log.count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive ResponseCoordinator with many distinct users.")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--report-every", type=int, default=100_000)
+    parser.add_argument("--max-tracked", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(soak(args.users, args.report_every, args.max_tracked))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
 import asyncio
+import hashlib
+import json
 import logging
+import signal
+from contextlib import nullcontext
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from gamba_bot.config import Settings
 from gamba_bot.database import Database
+from gamba_bot.services import games
+from gamba_bot.services.backup import BackupJob
+from gamba_bot.services.compute import ComputeExecutor
+from gamba_bot.services.jackpot import JackpotPool
+from gamba_bot.services.ledger import LedgerClient
+from gamba_bot.services.rewards import TopupJob
+from gamba_bot.services.stats import GameStats
+from gamba_bot.utils.abuse import AbuseDetector, refusal_text
+from gamba_bot.utils.logs import LogPipeline, configure_logging
+from gamba_bot.utils.loop import LoopMonitor, event_loop_factory
+from gamba_bot.utils.metrics import Metrics, MetricsServer
 from gamba_bot.utils.respond import ResponseCoordinator
+from gamba_bot.utils.sessions import SessionRegistry, shard_id_for
+from gamba_bot.utils.timing import ImportProfiler, PhaseTimer
 
 
 COGS = (
@@ -17,40 +35,285 @@ COGS = (
     "gamba_bot.cogs.poker",
     "gamba_bot.cogs.minesweeper",
     "gamba_bot.cogs.wordlinks",
+    "gamba_bot.cogs.history",
 )
 
+# Commands that place bets; only these go through the abuse detector.
+GAME_COMMANDS = frozenset(("roulette", "slots", "blackjack", "poker", "minesweeper", "wordlinks"))
 
-class GambaBot(commands.Bot):
+
+def command_tree_digest(tree: app_commands.CommandTree) -> str:
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda data: (data.get("type", 1), data["name"]),
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class GambaTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if getattr(self.client, "draining", False):
+            await interaction.response.send_message(
+                "The bot is restarting; try again in a few seconds.",
+                ephemeral=True,
+            )
+            return False
+        abuse = getattr(self.client, "abuse", None)
+        command = interaction.command
+        if abuse is not None and command is not None and command.qualified_name in GAME_COMMANDS:
+            # Answered from memory: a refused command never reaches the database.
+            verdict = abuse.check(interaction.user.id, command.qualified_name)
+            if not verdict.allowed:
+                await interaction.response.send_message(refusal_text(verdict), ephemeral=True)
+                return False
+        return True
+
+
+class GambaBot(commands.AutoShardedBot):
     def __init__(self, settings: Settings):
         intents = discord.Intents.default()
         intents.message_content = True
-        super().__init__(command_prefix="!", intents=intents)
+        intents.members = settings.members_intent
+        metrics = Metrics(enabled=settings.metrics_enabled)
+        self.startup = PhaseTimer("startup", metrics=metrics)
+        responses = ResponseCoordinator(min_gap_seconds=0.4, metrics=metrics)
+        super().__init__(
+            command_prefix="!",
+            intents=intents,
+            http_trace=responses.trace_config(),
+            shard_count=settings.shard_count,
+            shard_ids=list(settings.shard_ids) if settings.shard_ids is not None else None,
+            tree_cls=GambaTree,
+        )
         self.settings = settings
-        self.db = Database(settings.database_path, settings.starting_balance)
-        self.responses = ResponseCoordinator(min_gap_seconds=0.4)
+        self.metrics = metrics
+        self.db: Database | LedgerClient
+        if settings.ledger_socket:
+            self.db = LedgerClient(settings.ledger_socket, metrics=metrics)
+        else:
+            self.db = Database(settings.database_path, settings.starting_balance, metrics=metrics)
+        self.responses = responses
+        self.sessions = SessionRegistry()
+        self.draining = False
+        self._services_closed = False
+        self.compute = ComputeExecutor(settings.compute_workers, metrics=metrics)
+        self.stats = GameStats(metrics=metrics)
+        self.jackpot = JackpotPool(
+            contribution_bps=settings.jackpot_contribution_bps,
+            seed=settings.jackpot_seed,
+            metrics=metrics,
+        )
+        self.abuse: AbuseDetector | None = None
+        if settings.abuse_detection:
+            self.abuse = AbuseDetector(
+                window_seconds=settings.abuse_window_seconds,
+                max_actions=settings.abuse_max_actions,
+                cooldown_seconds=settings.abuse_cooldown_seconds,
+                strikes_to_block=settings.abuse_strikes_to_block,
+                block_seconds=settings.abuse_block_seconds,
+                rhythm_samples=settings.abuse_rhythm_samples,
+                rhythm_share=settings.abuse_rhythm_share,
+                metrics=metrics,
+            )
+        self.loop_monitor: LoopMonitor | None = None
+        if settings.loop_monitor:
+            self.loop_monitor = LoopMonitor(
+                stall_threshold_seconds=settings.loop_stall_threshold_ms / 1000,
+                metrics=metrics,
+            )
+        self.backups: BackupJob | None = None
+        # With a ledger the database belongs to the ledger process, which takes the
+        # backups; one set per bot process would only compete for the same file.
+        if settings.backup_dir and not settings.ledger_socket:
+            self.backups = BackupJob(
+                settings.database_path,
+                settings.backup_dir,
+                interval_seconds=settings.backup_interval_minutes * 60,
+                retention=settings.backup_retention,
+                pages_per_step=settings.backup_pages_per_step,
+                step_sleep_seconds=settings.backup_step_sleep_ms / 1000,
+                metrics=metrics,
+            )
+        self.topups: TopupJob | None = None
+        if settings.topup_balance > 0:
+            self.topups = TopupJob(
+                floor=settings.topup_balance,
+                interval_seconds=settings.topup_interval_minutes * 60,
+                metrics=metrics,
+            )
+        metrics.add_collector(self._collect_shard_metrics)
+        if metrics.enabled:
+            self.add_listener(self._count_interaction, "on_interaction")
+            self.add_listener(self._count_message, "on_message")
+            self.add_listener(self._count_socket_event, "on_socket_event_type")
+        self.metrics_server: MetricsServer | None = None
+        if settings.metrics_enabled and settings.metrics_port:
+            self.metrics_server = MetricsServer(metrics, settings.metrics_host, settings.metrics_port)
 
     async def setup_hook(self) -> None:
-        await self.db.initialize()
-        for cog in COGS:
-            await self.load_extension(cog)
+        if self.loop_monitor is not None:
+            self.loop_monitor.start()
+        with self.startup.phase("database init"):
+            await self.db.initialize()
+            await self.stats.start(self.db, flush_seconds=self.settings.stats_flush_seconds)
+            await self.jackpot.start(self.db, flush_seconds=self.settings.jackpot_flush_seconds)
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+        with self.startup.phase("compute workers"):
+            await self.compute.start()
+        if self.backups is not None:
+            self.backups.start()
+        if self.topups is not None:
+            self.topups.start(self.db)
+        profiler = ImportProfiler() if self.settings.profile_imports else None
+        with profiler or nullcontext():
+            for cog in COGS:
+                with self.startup.phase(f"load {cog}"):
+                    await self.load_extension(cog)
+        if profiler is not None:
+            logging.info(profiler.report())
+        if not self.settings.lazy_game_tables:
+            with self.startup.phase("game tables"):
+                games.warm_tables()
+        with self.startup.phase("command sync"):
+            await self.sync_commands()
+
+    def _collect_shard_metrics(self, metrics: Metrics) -> None:
+        for shard_id, latency in self.latencies:
+            if latency == latency and latency != float("inf"):
+                metrics.set_gauge("gamba_shard_latency_seconds", latency, shard=shard_id)
+        counts = self.sessions.count_by_shard()
+        for shard_id in self.shards:
+            metrics.set_gauge("gamba_shard_sessions", counts.get(shard_id, 0), shard=shard_id)
+
+    # The raw socket event carries no shard id, so the per-shard breakdown comes from
+    # the dispatched objects, which know their guild.
+    async def _count_interaction(self, interaction: discord.Interaction) -> None:
+        self.metrics.inc("gamba_gateway_events_total", shard=shard_id_for(interaction.guild), event="INTERACTION_CREATE")
+
+    async def _count_message(self, message: discord.Message) -> None:
+        self.metrics.inc("gamba_gateway_events_total", shard=shard_id_for(message.guild), event="MESSAGE_CREATE")
+
+    async def _count_socket_event(self, event_type: str) -> None:
+        self.metrics.inc("gamba_socket_events_total", event=event_type)
+
+    async def sync_commands(self) -> None:
+        # Syncing is rate limited and slow, so only push the tree when its serialized
+        # form differs from the last one this application synced.
+        meta_key = f"command_tree_hash:{self.application_id}"
+        digest = command_tree_digest(self.tree)
+        if not self.settings.force_command_sync and await self.db.get_meta(meta_key) == digest:
+            logging.info("Slash command tree unchanged (%s); skipping sync.", digest[:12])
+            return
         await self.tree.sync()
-        logging.info("Slash commands synced.")
+        await self.db.set_meta(meta_key, digest)
+        logging.info("Slash commands synced (%s).", digest[:12])
+
+    async def on_ready(self) -> None:
+        if not any(name == "gateway ready" for name, _ in self.startup.phases):
+            self.startup.mark("gateway ready")
+            logging.info(self.startup.summary())
+
+    async def on_shard_ready(self, shard_id: int) -> None:
+        logging.info("Shard %s ready (%d guilds).", shard_id, sum(1 for g in self.guilds if g.shard_id == shard_id))
+
+    async def drain(self) -> None:
+        if self.draining:
+            return
+        self.draining = True
+        shutdown = PhaseTimer("shutdown", metrics=self.metrics)
+        logging.info("Draining %d open sessions before shutdown.", len(self.sessions))
+        with shutdown.phase("sessions"):
+            views = self.sessions.views()
+            drains = [view.drain(self.settings.drain_grace_seconds) for view in views]  # type: ignore[attr-defined]
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*drains, return_exceptions=True),
+                    timeout=self.settings.drain_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                logging.warning("%d sessions did not drain in time.", len(self.sessions))
+        with shutdown.phase("pending edits"):
+            try:
+                await asyncio.wait_for(self.responses.wait_idle(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logging.warning("Pending message edits did not finish in time.")
+        with shutdown.phase("compute pool"):
+            await self.compute.close()
+        if self.topups is not None:
+            with shutdown.phase("top-ups"):
+                await self.topups.stop()
+        with shutdown.phase("game stats"):
+            await self.stats.close()
+        with shutdown.phase("jackpot"):
+            await self.jackpot.close()
+        if self.backups is not None:
+            # A running backup pins a WAL snapshot, so stop it before checkpointing.
+            with shutdown.phase("backups"):
+                await self.backups.stop()
+        with shutdown.phase("wal checkpoint"):
+            await self.db.checkpoint()
+        self._services_closed = True
+        with shutdown.phase("disconnect"):
+            await self.close()
+        logging.info(shutdown.summary())
 
     async def close(self) -> None:
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+        # After a drain these were already stopped and flushed, phase by phase.
+        if not self._services_closed:
+            await self.compute.close()
+            if self.backups is not None:
+                await self.backups.stop()
+            if self.topups is not None:
+                await self.topups.stop()
+            await self.stats.close()
+            await self.jackpot.close()
+            self._services_closed = True
         await self.db.close()
         await super().close()
 
 
-async def main() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    )
-    settings = Settings.from_env()
+async def main(settings: Settings, logs: LogPipeline) -> None:
     bot = GambaBot(settings)
+    bot.metrics.add_collector(logs.collect_metrics)
+    drain_task: asyncio.Task[None] | None = None
+
+    def request_drain() -> None:
+        nonlocal drain_task
+        if drain_task is None:
+            drain_task = asyncio.create_task(bot.drain())
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, request_drain)
+    except NotImplementedError:
+        pass
     async with bot:
         await bot.start(settings.discord_token)
+    if drain_task is not None:
+        await drain_task
+
+
+def run() -> None:
+    settings = Settings.from_env()
+    # Handlers only enqueue records; a listener thread formats and writes them, so a
+    # slow log sink never blocks the event loop.
+    logs = configure_logging(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        sampling=settings.log_sampling,
+        queue_size=settings.log_queue_size,
+    )
+    try:
+        with asyncio.Runner(loop_factory=event_loop_factory(settings.event_loop)) as runner:
+            runner.run(main(settings, logs))
+    finally:
+        logs.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -1,15 +1,31 @@
 import asyncio
 import time
+from functools import wraps
+from typing import Any, Awaitable, Callable
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from gamba_bot.database import InsufficientBalanceError
-from gamba_bot.services.games import create_blackjack_round, dealer_must_hit, hand_total, is_blackjack
-from gamba_bot.utils.currency import format_cents
+from gamba_bot.database import BetEntry
+from gamba_bot.services.compute import ComputeBusyError
+from gamba_bot.services.games import (
+    MAX_BLACKJACK_SPOTS,
+    BlackjackRound,
+    BlackjackSpot,
+    blackjack_odds,
+    create_blackjack_round,
+    dealer_must_hit,
+    hand_total,
+    is_blackjack,
+    spot_delta,
+)
+from gamba_bot.utils.currency import Money
+from gamba_bot.utils.render import PayloadCache, StakeTable
+from gamba_bot.utils.sessions import shard_id_for
 
 BLACKJACK_WIN_MULTIPLIER = 1.5
+ODDS_TIMEOUT_SECONDS = 3.0
 
 # Values are in cent-units so the selector can offer 0.01 style low stakes.
 STAKE_TIERS = {
@@ -37,15 +53,61 @@ STAKE_TIERS = {
 
 TIER_ORDER = ("low", "medium", "high", "high_roller")
 
+STAKE_TABLE = StakeTable(STAKE_TIERS, TIER_ORDER)
+STAKE_TIERS_TEXT = "\n".join(f"{STAKE_TIERS[tier]['label']}: {STAKE_TIERS[tier]['description']}" for tier in TIER_ORDER)
+
 
 def _fmt_units(value: int | float) -> str:
-    return format_cents(int(value))
+    return str(Money(int(value)))
 
 
 def _cards_text(cards: list[str]) -> str:
     return " ".join(cards)
 
 
+def _signed_units(delta: int) -> str:
+    if delta > 0:
+        return f"+{_fmt_units(delta)}"
+    if delta < 0:
+        return f"-{_fmt_units(abs(delta))}"
+    return "0.00"
+
+
+def _dealer_result(dealer_total: int) -> str:
+    return f"busted at {dealer_total}" if dealer_total > 21 else f"has {dealer_total}"
+
+
+def _single_spot_summary(spot: BlackjackSpot, dealer_total: int) -> str:
+    total = hand_total(spot.cards)
+    if total > 21:
+        return ""
+    if not spot.split and is_blackjack(spot.cards):
+        return "Blackjack."
+    if dealer_total > 21:
+        return f"Dealer busted at {dealer_total}."
+    if total > dealer_total:
+        return f"You win {total} to {dealer_total}."
+    if total < dealer_total:
+        return f"Dealer wins {dealer_total} to {total}."
+    return f"Push at {total}."
+
+
+def _one_click_at_a_time(
+    action: Callable[..., Awaitable[None]],
+) -> Callable[..., Awaitable[None]]:
+    # Component callbacks skip the tree's checks and can overlap; each session
+    # handles one click at a time, and none once it has closed.
+    @wraps(action)
+    async def wrapper(self: "BlackjackSessionView", interaction: discord.Interaction, *args: Any) -> None:
+        async with self._lock:
+            if self.finished:
+                await interaction.response.send_message("This blackjack session has ended.", ephemeral=True)
+                return
+            await action(self, interaction, *args)
+
+    return wrapper
+
+
 class StakeSelect(discord.ui.Select):
     def __init__(self) -> None:
         super().__init__(placeholder="Select stake", min_values=1, max_values=1, options=[], row=0)
@@ -68,6 +130,16 @@ class TierButton(discord.ui.Button):
         await view.select_tier(interaction, self.tier_key)
 
 
+class SpotsButton(discord.ui.Button):
+    def __init__(self) -> None:
+        super().__init__(label="Spots: 1", style=discord.ButtonStyle.secondary, row=1)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert self.view is not None
+        view: BlackjackSessionView = self.view  # type: ignore[assignment]
+        await view.cycle_spots(interaction)
+
+
 class DealButton(discord.ui.Button):
     def __init__(self) -> None:
         super().__init__(label="Deal Hand", style=discord.ButtonStyle.success, row=2)
@@ -98,6 +170,36 @@ class StickButton(discord.ui.Button):
         await view.stick(interaction)
 
 
+class DoubleButton(discord.ui.Button):
+    def __init__(self) -> None:
+        super().__init__(label="Double", style=discord.ButtonStyle.primary, row=2)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert self.view is not None
+        view: BlackjackSessionView = self.view  # type: ignore[assignment]
+        await view.double_down(interaction)
+
+
+class SplitButton(discord.ui.Button):
+    def __init__(self) -> None:
+        super().__init__(label="Split", style=discord.ButtonStyle.primary, row=3)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert self.view is not None
+        view: BlackjackSessionView = self.view  # type: ignore[assignment]
+        await view.split_hand(interaction)
+
+
+class OddsButton(discord.ui.Button):
+    def __init__(self) -> None:
+        super().__init__(label="Odds", style=discord.ButtonStyle.secondary, row=2)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert self.view is not None
+        view: BlackjackSessionView = self.view  # type: ignore[assignment]
+        await view.show_odds(interaction)
+
+
 class NewHandYesButton(discord.ui.Button):
     def __init__(self) -> None:
         super().__init__(label="New Hand: Yes", style=discord.ButtonStyle.success, row=3)
@@ -119,7 +221,7 @@ class NewHandNoButton(discord.ui.Button):
 
 
 class BlackjackSessionView(discord.ui.View):
-    def __init__(self, bot: commands.Bot, *, origin_interaction: discord.Interaction, balance: int):
+    def __init__(self, bot: commands.Bot, *, origin_interaction: discord.Interaction, balance: Money):
         super().__init__(timeout=None)
         self.bot = bot
         self.origin_interaction = origin_interaction
@@ -127,28 +229,39 @@ class BlackjackSessionView(discord.ui.View):
         self.balance = balance
         self.selected_tier = "low"
         self.selected_stake = STAKE_TIERS["low"]["values"][0]
-        self.round_state = None
+        self.spot_count = 1
+        self.round_state: BlackjackRound | None = None
         self.status = "Choose a stake range and stake amount."
         self.awaiting_new_hand = False
         self.finished = False
         self.idle_timeout_seconds = 60.0
         self.last_action = time.monotonic()
         self._lock = asyncio.Lock()
+        self._payload = PayloadCache()
+        self._select_key: tuple[str, int, int] | None = None
 
         self.stake_select = StakeSelect()
         self.tier_buttons = {tier: TierButton(tier, row=1) for tier in TIER_ORDER}
+        self.spots_button = SpotsButton()
         self.deal_button = DealButton()
         self.hit_button = HitButton()
         self.stick_button = StickButton()
+        self.double_button = DoubleButton()
+        self.split_button = SplitButton()
+        self.odds_button = OddsButton()
         self.new_yes_button = NewHandYesButton()
         self.new_no_button = NewHandNoButton()
 
         self.add_item(self.stake_select)
         for tier in TIER_ORDER:
             self.add_item(self.tier_buttons[tier])
+        self.add_item(self.spots_button)
         self.add_item(self.deal_button)
         self.add_item(self.hit_button)
         self.add_item(self.stick_button)
+        self.add_item(self.double_button)
+        self.add_item(self.odds_button)
+        self.add_item(self.split_button)
         self.add_item(self.new_yes_button)
         self.add_item(self.new_no_button)
 
@@ -164,33 +277,71 @@ class BlackjackSessionView(discord.ui.View):
     async def on_timeout(self) -> None:
         return
 
+    def stop(self) -> None:
+        self.bot.sessions.discard(self)
+        super().stop()
+
+    def hand_in_progress(self) -> bool:
+        return self.round_state is not None and not self.awaiting_new_hand and not self.finished
+
+    async def drain(self, grace_seconds: float) -> None:
+        # Give an open hand the grace period to finish, then stand it for the player
+        # so the stake is settled rather than abandoned.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace_seconds
+        while self.hand_in_progress() and loop.time() < deadline:
+            await asyncio.sleep(0.25)
+        async with self._lock:
+            auto_settled = self.hand_in_progress()
+            if auto_settled:
+                await self._stand(None, edit=False)
+            self.finished = True
+            if self._watchdog_task and not self._watchdog_task.done():
+                self._watchdog_task.cancel()
+            self._disable_all()
+            if auto_settled:
+                self.status = f"{self.status.removesuffix(' New hand?')} The bot is restarting: your hand was stood automatically."
+            else:
+                self.status = "The bot is restarting. Session closed."
+        try:
+            await self._safe_edit(None)
+        except discord.HTTPException:
+            pass
+        self.stop()
+
     async def _idle_watchdog(self) -> None:
         while not self.finished:
             await asyncio.sleep(2)
-            if time.monotonic() - self.last_action >= self.idle_timeout_seconds:
+            if time.monotonic() - self.last_action < self.idle_timeout_seconds:
+                continue
+            async with self._lock:
+                # A click may have been in progress while this waited for the lock.
+                if self.finished or time.monotonic() - self.last_action < self.idle_timeout_seconds:
+                    continue
                 self.finished = True
                 self._disable_all()
                 self.status = "No action for 60 seconds. Session ended."
-                try:
-                    await self.origin_interaction.edit_original_response(embed=self._build_embed(), view=self)
-                except discord.HTTPException:
-                    pass
-                self.stop()
-                return
+            try:
+                await self.bot.responses.edit_original(
+                    self.origin_interaction,
+                    embed=self._build_embed(),
+                    view=self,
+                )
+            except discord.HTTPException:
+                pass
+            self.stop()
+            return
 
     def _disable_all(self) -> None:
         for child in self.children:
             if isinstance(child, discord.ui.Button) or isinstance(child, discord.ui.Select):
                 child.disabled = True
 
-    def _affordable_values(self, tier: str) -> list[int]:
-        return [v for v in STAKE_TIERS[tier]["values"] if v <= self.balance]
+    def _affordable_values(self, tier: str) -> tuple[int, ...]:
+        return STAKE_TABLE.affordable_values(tier, self.balance)
 
     def _best_affordable_tier(self) -> str | None:
-        available = [tier for tier in TIER_ORDER if self._affordable_values(tier)]
-        if not available:
-            return None
-        return available[-1]
+        return STAKE_TABLE.best_affordable_tier(self.balance)
 
     def _normalize_selected_stake(self) -> None:
         tier_values = self._affordable_values(self.selected_tier)
@@ -206,51 +357,64 @@ class BlackjackSessionView(discord.ui.View):
         self.selected_tier = fallback_tier
         self.selected_stake = self._affordable_values(fallback_tier)[-1]
 
+    def _affordable_spots(self) -> int:
+        if self.selected_stake <= 0:
+            return 1
+        return max(1, min(MAX_BLACKJACK_SPOTS, self.balance // self.selected_stake))
+
     def _rebuild_select(self) -> None:
+        tier = self.selected_tier
+        affordable = STAKE_TABLE.affordable_count(tier, self.balance)
+        select_key = (tier, self.selected_stake, affordable)
+        if select_key == self._select_key:
+            return
+        self._select_key = select_key
+
         options = []
-        for value in STAKE_TIERS[self.selected_tier]["values"]:
+        for idx, (value, label) in enumerate(zip(STAKE_TABLE.values[tier], STAKE_TABLE.labels[tier])):
             options.append(
                 discord.SelectOption(
-                    label=_fmt_units(value),
+                    label=label,
                     value=str(value),
                     default=(value == self.selected_stake),
-                    description="Affordable" if value <= self.balance else "Insufficient balance",
+                    description="Affordable" if idx < affordable else "Insufficient balance",
                 )
             )
         self.stake_select.options = options[:25]
-        self.stake_select.disabled = not bool(self._affordable_values(self.selected_tier))
+        self.stake_select.disabled = affordable == 0
 
     def _rebuild_controls(self) -> None:
         self._normalize_selected_stake()
         self._rebuild_select()
 
+        affordable_tiers = STAKE_TABLE.affordable_tiers(self.balance)
         for tier, btn in self.tier_buttons.items():
-            enabled = bool(self._affordable_values(tier))
-            btn.disabled = not enabled
+            btn.disabled = tier not in affordable_tiers
             btn.style = discord.ButtonStyle.primary if tier == self.selected_tier else discord.ButtonStyle.secondary
 
         playing = self.round_state is not None and not self.awaiting_new_hand and not self.finished
         lobby = self.round_state is None and not self.awaiting_new_hand and not self.finished
         post_round = self.awaiting_new_hand and not self.finished
 
+        self.spot_count = min(self.spot_count, self._affordable_spots())
+        self.spots_button.label = f"Spots: {self.spot_count}"
+        self.spots_button.disabled = not (lobby or post_round) or self._affordable_spots() == 1
         self.deal_button.disabled = not lobby or self.selected_stake <= 0
         self.hit_button.disabled = not playing
         self.stick_button.disabled = not playing
+        can_raise = False
+        if playing:
+            assert self.round_state is not None
+            can_raise = self.round_state.total_stake + self.round_state.active_spot.stake <= self.balance
+        self.double_button.disabled = not (playing and can_raise and self.round_state.can_double())  # type: ignore[union-attr]
+        self.split_button.disabled = not (playing and can_raise and self.round_state.can_split())  # type: ignore[union-attr]
+        self.odds_button.disabled = not playing
         self.new_yes_button.disabled = not post_round
         self.new_no_button.disabled = not post_round
 
     def _build_embed(self) -> discord.Embed:
         embed = discord.Embed(title="Blackjack", color=discord.Color.gold())
-        embed.add_field(
-            name="Stake Tiers",
-            value=(
-                "Low Stakes: 0.01 to 10.00\n"
-                "Medium Stakes: 50 to 500\n"
-                "High Stakes: 1,000 to 100,000\n"
-                "High Roller: 500,000 to 50,000,000"
-            ),
-            inline=False,
-        )
+        embed.add_field(name="Stake Tiers", value=STAKE_TIERS_TEXT, inline=False)
         embed.add_field(name="Balance", value=f"`{_fmt_units(self.balance)}`", inline=True)
         if self.selected_stake > 0:
             embed.add_field(name="Selected Stake", value=f"`{_fmt_units(self.selected_stake)}`", inline=True)
@@ -259,7 +423,6 @@ class BlackjackSessionView(discord.ui.View):
         embed.add_field(name="Decks", value="8-deck shoe", inline=True)
 
         if self.round_state is not None:
-            player_total = hand_total(self.round_state.player_hand)
             if self.awaiting_new_hand:
                 dealer_cards = _cards_text(self.round_state.dealer_hand)
                 dealer_total = hand_total(self.round_state.dealer_hand)
@@ -267,11 +430,18 @@ class BlackjackSessionView(discord.ui.View):
             else:
                 dealer_line = f"{self.round_state.dealer_hand[0]} ??"
 
-            embed.add_field(
-                name=f"Player ({player_total})",
-                value=_cards_text(self.round_state.player_hand),
-                inline=False,
-            )
+            spots = self.round_state.spots
+            for idx, spot in enumerate(spots):
+                total = hand_total(spot.cards)
+                if len(spots) == 1:
+                    name = f"Player ({total})"
+                else:
+                    marker = "▶ " if idx == self.round_state.active and self.hand_in_progress() else ""
+                    name = f"{marker}Spot {idx + 1} ({total}) · {_fmt_units(spot.stake)}"
+                value = _cards_text(spot.cards)
+                if spot.doubled:
+                    value += " (doubled)"
+                embed.add_field(name=name, value=value, inline=False)
             embed.add_field(name="Dealer", value=dealer_line, inline=False)
             embed.add_field(name="Cards Remaining", value=str(len(self.round_state.deck)), inline=True)
 
@@ -280,14 +450,20 @@ class BlackjackSessionView(discord.ui.View):
 
     async def _safe_edit(self, interaction: discord.Interaction | None) -> None:
         embed = self._build_embed()
+        if not self._payload.update(embed, self):
+            # Nothing visible changed, so acknowledge the click without an edit.
+            if interaction is not None and not interaction.response.is_done():
+                await interaction.response.defer()
+            return
         if interaction is not None and not interaction.response.is_done():
             try:
                 await interaction.response.edit_message(embed=embed, view=self)
                 return
             except discord.NotFound:
                 pass
-        await self.origin_interaction.edit_original_response(embed=embed, view=self)
+        await self.bot.responses.edit_original(self.origin_interaction, embed=embed, view=self)
 
+    @_one_click_at_a_time
     async def select_tier(self, interaction: discord.Interaction, tier_key: str) -> None:
         self.last_action = time.monotonic()
         if self.round_state is not None and not self.awaiting_new_hand:
@@ -302,6 +478,7 @@ class BlackjackSessionView(discord.ui.View):
         self._rebuild_controls()
         await self._safe_edit(interaction)
 
+    @_one_click_at_a_time
     async def select_stake(self, interaction: discord.Interaction, stake: int) -> None:
         self.last_action = time.monotonic()
         if self.round_state is not None and not self.awaiting_new_hand:
@@ -315,39 +492,103 @@ class BlackjackSessionView(discord.ui.View):
         self._rebuild_controls()
         await self._safe_edit(interaction)
 
-    async def _settle_and_finish_hand(self, interaction: discord.Interaction | None, *, delta: int, summary: str) -> None:
+    async def _settle_round(self, interaction: discord.Interaction | None, *, prefix: str, edit: bool = True) -> None:
+        assert self.round_state is not None
+        round_state = self.round_state
+        if any(hand_total(spot.cards) <= 21 for spot in round_state.spots):
+            while dealer_must_hit(round_state.dealer_hand):
+                round_state.dealer_hit()
+        dealer_total = hand_total(round_state.dealer_hand)
+        deltas = [spot_delta(spot, dealer_total, BLACKJACK_WIN_MULTIPLIER) for spot in round_state.spots]
+        if len(round_state.spots) > 1:
+            results = ", ".join(f"spot {idx + 1} {_signed_units(delta)}" for idx, delta in enumerate(deltas))
+            detail = f"Dealer {_dealer_result(dealer_total)}: {results}."
+        else:
+            detail = _single_spot_summary(round_state.spots[0], dealer_total)
+        summary = " ".join(part for part in (prefix, detail) if part)
+        user = self.origin_interaction.user
+        entries = [BetEntry(user, spot.stake, delta, "blackjack") for spot, delta in zip(round_state.spots, deltas)]
+        await self._settle_and_finish_hand(interaction, entries=entries, summary=summary, edit=edit)
+
+    async def _settle_and_finish_hand(
+        self,
+        interaction: discord.Interaction | None,
+        *,
+        entries: list[BetEntry],
+        summary: str,
+        edit: bool = True,
+    ) -> None:
+        stage = self.bot.metrics.stages("gamba_command_stage_seconds", command="blackjack.hand", game="Blackjack")
+        # Every spot is its own ledger entry, but the round still commits as one
+        # transaction. The hand is over before the write starts, so nothing that
+        # runs while it is in flight can settle the same round again.
+        self.awaiting_new_hand = True
         try:
-            record = await self.bot.db.settle_bet(
-                self.origin_interaction.user,
-                stake=self.selected_stake,
-                delta=delta,
-            )
-        except InsufficientBalanceError:
+            with stage("settle_bet"):
+                outcomes = await self.bot.db.settle_many(entries)
+        except BaseException:
+            self.awaiting_new_hand = False
+            raise
+        guild_id = self.origin_interaction.guild_id
+        for outcome in outcomes:
+            if outcome.accepted:
+                self.bot.stats.record("blackjack", guild_id, outcome.entry.stake, outcome.entry.delta)
+        self.balance = outcomes[-1].record.balance
+        rejected = [idx + 1 for idx, outcome in enumerate(outcomes) if not outcome.accepted]
+        if len(rejected) == len(outcomes):
             self.status = "Insufficient balance to settle hand."
-            self.awaiting_new_hand = True
             self.round_state = None
             self._rebuild_controls()
+            if edit:
+                await self._safe_edit(interaction)
+            return
+
+        delta = sum(outcome.entry.delta for outcome in outcomes if outcome.accepted)
+        self.status = f"{summary} Hand result: {_signed_units(delta)}. Balance: {_fmt_units(self.balance)}."
+        if rejected:
+            spots = ", ".join(str(idx) for idx in rejected)
+            self.status = f"{self.status} Spot {spots} could not be settled (insufficient balance)."
+        self.status = f"{self.status} New hand?"
+        self._rebuild_controls()
+        if edit:
+            with stage("edit"):
+                await self._safe_edit(interaction)
+
+    async def _next_spot(self, interaction: discord.Interaction, status: str) -> None:
+        assert self.round_state is not None
+        if self.round_state.advance():
+            if len(self.round_state.spots) > 1:
+                status = f"{status} Spot {self.round_state.active + 1}: choose an action."
+            else:
+                status = f"{status} Choose Hit or Stick."
+            self.status = status.strip()
+            self._rebuild_controls()
             await self._safe_edit(interaction)
             return
+        await interaction.response.defer()
+        await self._settle_round(interaction, prefix=status)
 
-        self.balance = int(record.balance)
-        self.awaiting_new_hand = True
-        if delta > 0:
-            change = f"+{_fmt_units(delta)}"
-        elif delta < 0:
-            change = f"-{_fmt_units(abs(delta))}"
-        else:
-            change = "0.00"
-        self.status = f"{summary} Hand result: {change}. Balance: {_fmt_units(self.balance)}. New hand?"
+    @_one_click_at_a_time
+    async def cycle_spots(self, interaction: discord.Interaction) -> None:
+        self.last_action = time.monotonic()
+        if self.hand_in_progress():
+            await interaction.response.send_message("Finish the current hand first.", ephemeral=True)
+            return
+        self.spot_count = self.spot_count % self._affordable_spots() + 1
+        self.status = f"Playing {self.spot_count} spot{'s' if self.spot_count > 1 else ''} per deal."
         self._rebuild_controls()
         await self._safe_edit(interaction)
 
+    @_one_click_at_a_time
     async def deal_hand(self, interaction: discord.Interaction) -> None:
         self.last_action = time.monotonic()
+        if self.bot.draining:
+            await interaction.response.send_message("The bot is restarting; no new hands right now.", ephemeral=True)
+            return
         if self.selected_stake <= 0:
             await interaction.response.send_message("No available stake for your balance.", ephemeral=True)
             return
-        if self.balance < self.selected_stake:
+        if self.balance < self.selected_stake * self.spot_count:
             self._normalize_selected_stake()
             self.status = "Stake adjusted to your available balance."
             self._rebuild_controls()
@@ -355,79 +596,127 @@ class BlackjackSessionView(discord.ui.View):
             return
 
         self.awaiting_new_hand = False
-        self.round_state = create_blackjack_round(8)
+        self.round_state = create_blackjack_round(8, [self.selected_stake] * self.spot_count)
 
         if is_blackjack(self.round_state.dealer_hand):
             await interaction.response.defer()
-            await self._settle_and_finish_hand(
-                interaction,
-                delta=-self.selected_stake,
-                summary="Dealer has blackjack.",
-            )
+            user = self.origin_interaction.user
+            entries = [BetEntry(user, spot.stake, -spot.stake, "blackjack") for spot in self.round_state.spots]
+            await self._settle_and_finish_hand(interaction, entries=entries, summary="Dealer has blackjack.")
             return
 
-        if is_blackjack(self.round_state.player_hand):
+        naturals = [spot for spot in self.round_state.spots if is_blackjack(spot.cards)]
+        if len(naturals) == len(self.round_state.spots):
             await interaction.response.defer()
-            delta = int(self.selected_stake * BLACKJACK_WIN_MULTIPLIER)
-            await self._settle_and_finish_hand(
-                interaction,
-                delta=delta,
-                summary="Blackjack.",
-            )
+            user = self.origin_interaction.user
+            entries = [
+                BetEntry(user, spot.stake, int(spot.stake * BLACKJACK_WIN_MULTIPLIER), "blackjack")
+                for spot in self.round_state.spots
+            ]
+            await self._settle_and_finish_hand(interaction, entries=entries, summary="Blackjack.")
             return
 
-        self.status = "Hand dealt. Choose Hit or Stick."
+        self.round_state.advance()
+        if len(self.round_state.spots) > 1:
+            self.status = f"Hands dealt. Spot {self.round_state.active + 1}: choose an action."
+        else:
+            self.status = "Hand dealt. Choose Hit or Stick."
         self._rebuild_controls()
         await self._safe_edit(interaction)
 
+    @_one_click_at_a_time
     async def hit(self, interaction: discord.Interaction) -> None:
         self.last_action = time.monotonic()
-        if self.round_state is None:
+        if not self.hand_in_progress():
             await interaction.response.send_message("Deal a hand first.", ephemeral=True)
             return
+        assert self.round_state is not None
         card = self.round_state.player_hit()
         player_total = hand_total(self.round_state.player_hand)
         if player_total > 21:
-            await interaction.response.defer()
-            await self._settle_and_finish_hand(
-                interaction,
-                delta=-self.selected_stake,
-                summary=f"You drew {card} and busted at {player_total}.",
-            )
+            self.round_state.active_spot.done = True
+            await self._next_spot(interaction, f"You drew {card} and busted at {player_total}.")
             return
+        await self._next_spot(interaction, f"You drew {card}.")
 
-        self.status = f"You drew {card}. Choose Hit or Stick."
-        self._rebuild_controls()
-        await self._safe_edit(interaction)
-
+    @_one_click_at_a_time
     async def stick(self, interaction: discord.Interaction) -> None:
         self.last_action = time.monotonic()
-        if self.round_state is None:
+        if not self.hand_in_progress():
             await interaction.response.send_message("Deal a hand first.", ephemeral=True)
             return
+        assert self.round_state is not None
+        self.round_state.active_spot.done = True
+        await self._next_spot(interaction, "")
 
-        await interaction.response.defer()
-        while dealer_must_hit(self.round_state.dealer_hand):
-            self.round_state.dealer_hit()
-
-        player_total = hand_total(self.round_state.player_hand)
-        dealer_total = hand_total(self.round_state.dealer_hand)
-
-        if dealer_total > 21:
-            delta = int(self.selected_stake * BLACKJACK_WIN_MULTIPLIER)
-            summary = f"Dealer busted at {dealer_total}."
-        elif player_total > dealer_total:
-            delta = int(self.selected_stake * BLACKJACK_WIN_MULTIPLIER)
-            summary = f"You win {player_total} to {dealer_total}."
-        elif player_total < dealer_total:
-            delta = -self.selected_stake
-            summary = f"Dealer wins {dealer_total} to {player_total}."
-        else:
-            delta = 0
-            summary = f"Push at {player_total}."
+    @_one_click_at_a_time
+    async def double_down(self, interaction: discord.Interaction) -> None:
+        self.last_action = time.monotonic()
+        if not self.hand_in_progress():
+            await interaction.response.send_message("Deal a hand first.", ephemeral=True)
+            return
+        assert self.round_state is not None
+        spot = self.round_state.active_spot
+        if not self.round_state.can_double() or self.round_state.total_stake + spot.stake > self.balance:
+            await interaction.response.send_message("You cannot double this hand.", ephemeral=True)
+            return
+        card = self.round_state.double()
+        await self._next_spot(interaction, f"Doubled down and drew {card} ({hand_total(spot.cards)}).")
 
-        await self._settle_and_finish_hand(interaction, delta=delta, summary=summary)
+    @_one_click_at_a_time
+    async def split_hand(self, interaction: discord.Interaction) -> None:
+        self.last_action = time.monotonic()
+        if not self.hand_in_progress():
+            await interaction.response.send_message("Deal a hand first.", ephemeral=True)
+            return
+        assert self.round_state is not None
+        spot = self.round_state.active_spot
+        if not self.round_state.can_split() or self.round_state.total_stake + spot.stake > self.balance:
+            await interaction.response.send_message("You cannot split this hand.", ephemeral=True)
+            return
+        self.round_state.split()
+        await self._next_spot(interaction, "Hand split.")
+
+    async def _stand(self, interaction: discord.Interaction | None, *, edit: bool = True) -> None:
+        assert self.round_state is not None
+        for spot in self.round_state.spots:
+            spot.done = True
+        await self._settle_round(interaction, prefix="", edit=edit)
+
+    async def show_odds(self, interaction: discord.Interaction) -> None:
+        # The hand is read under the lock; the simulation runs outside it, so a
+        # slow estimate never holds up the next click.
+        async with self._lock:
+            self.last_action = time.monotonic()
+            if self.round_state is None or self.awaiting_new_hand or self.finished:
+                await interaction.response.send_message("Deal a hand first.", ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            round_state = self.round_state
+            player_hand = list(round_state.player_hand)
+            upcard = round_state.dealer_hand[0]
+            # The hole card is still face down, so it belongs with the unseen shoe.
+            unseen = [*round_state.deck, *round_state.dealer_hand[1:]]
+        try:
+            odds = await self.bot.compute.run(
+                blackjack_odds,
+                player_hand,
+                upcard,
+                unseen,
+                timeout=ODDS_TIMEOUT_SECONDS,
+            )
+        except (ComputeBusyError, asyncio.TimeoutError):
+            await interaction.followup.send("Odds are unavailable right now; try again shortly.", ephemeral=True)
+            return
+        advice = "Hit" if odds.hit_ev > odds.stand_ev else "Stick"
+        await interaction.followup.send(
+            f"Stick: win {odds.stand_win:.1%}, push {odds.stand_push:.1%}, EV {odds.stand_ev:+.3f}x stake\n"
+            f"Hit once: EV {odds.hit_ev:+.3f}x stake\n"
+            f"Suggested: **{advice}** ({odds.trials:,} simulated hands)",
+            ephemeral=True,
+        )
 
+    @_one_click_at_a_time
     async def new_hand_yes(self, interaction: discord.Interaction) -> None:
         self.last_action = time.monotonic()
         self.awaiting_new_hand = False
@@ -440,6 +729,7 @@ class BlackjackSessionView(discord.ui.View):
         self._rebuild_controls()
         await self._safe_edit(interaction)
 
+    @_one_click_at_a_time
     async def new_hand_no(self, interaction: discord.Interaction) -> None:
         self.last_action = time.monotonic()
         self.finished = True
@@ -460,8 +750,11 @@ class BlackjackCog(commands.Cog):
     async def blackjack_cmd(self, interaction: discord.Interaction) -> None:
         await self.bot.responses.defer(interaction)
         record = await self.bot.db.ensure_user(interaction.user)
-        view = BlackjackSessionView(self.bot, origin_interaction=interaction, balance=int(record.balance))
-        await interaction.edit_original_response(content=None, embed=view._build_embed(), view=view)
+        view = BlackjackSessionView(self.bot, origin_interaction=interaction, balance=record.balance)
+        embed = view._build_embed()
+        view._payload.update(embed, view)
+        self.bot.sessions.add(view, shard_id=shard_id_for(interaction.guild))
+        await interaction.edit_original_response(content=None, embed=embed, view=view)
 
 
 async def setup(bot: commands.Bot) -> None:
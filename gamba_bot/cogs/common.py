@@ -7,7 +7,7 @@ from discord.ext import commands
 
 from gamba_bot.database import InsufficientBalanceError
 from gamba_bot.services.games import GameResult
-from gamba_bot.utils.currency import format_cents
+from gamba_bot.utils.currency import Money
 
 
 class EconomyCog(commands.Cog):
@@ -25,33 +25,42 @@ class EconomyCog(commands.Cog):
         if stake <= 0:
             raise app_commands.AppCommandError("Stake must be greater than zero.")
 
-        await self.bot.db.ensure_user(interaction.user)
-        await self.bot.responses.defer(interaction)
+        command = interaction.command.qualified_name if interaction.command else title.lower()
+        stage = self.bot.metrics.stages("gamba_command_stage_seconds", command=command, game=title)
+        with stage("ensure_user"):
+            await self.bot.db.ensure_user(interaction.user)
+        with stage("defer"):
+            await self.bot.responses.defer(interaction)
         await asyncio.sleep(0.45)
-        result = game_fn()
+        with stage("game"):
+            result = game_fn()
         try:
-            record = await self.bot.db.settle_bet(
-                interaction.user,
-                stake=stake,
-                delta=result.delta,
-            )
+            with stage("settle_bet"):
+                record = await self.bot.db.settle_bet(
+                    interaction.user,
+                    stake=stake,
+                    delta=result.delta,
+                    game=command,
+                )
         except InsufficientBalanceError:
             await self.bot.responses.edit_original(
                 interaction,
                 content="Insufficient balance for that stake.",
             )
             return
+        self.bot.stats.record(command, interaction.guild_id, stake, result.delta)
 
         if result.won:
-            outcome = f"won `{format_cents(max(result.delta, 0))}` credits"
+            outcome = f"won `{Money(max(result.delta, 0))}` credits"
         elif result.delta == 0:
             outcome = "pushed and kept your credits"
         else:
-            outcome = f"lost `{format_cents(abs(result.delta))}` credits"
+            outcome = f"lost `{Money(abs(result.delta))}` credits"
         msg = (
             f"**{title}**\n"
             f"{result.detail}\n"
             f"You {outcome}.\n"
-            f"New balance: `{format_cents(record.balance)}`"
+            f"New balance: `{record.balance}`"
         )
-        await self.bot.responses.edit_original(interaction, content=msg)
+        with stage("edit"):
+            await self.bot.responses.edit_original(interaction, content=msg)
@@ -1,7 +1,105 @@
+import asyncio
+import sqlite3
+import tempfile
+from typing import AsyncIterator, Literal, Optional
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-from gamba_bot.utils.currency import format_cents, parse_credits_to_cents
+from gamba_bot.services.export import ExportError, export_filename, export_table
+from gamba_bot.utils.currency import Money, parse_credits_to_cents
+
+STATS_MESSAGE_LIMIT = 1900
+# /gamestats window -> the ring resolution that covers it.
+GAMESTATS_WINDOWS = {"1h": "1m", "24h": "1h", "30d": "1d"}
+# Matches Discord's page size for listing guild members.
+GRANT_CHUNK_SIZE = 1000
+
+
+async def _member_chunks(
+    guild: discord.Guild,
+    role: Optional[discord.Role],
+    size: int = GRANT_CHUNK_SIZE,
+) -> AsyncIterator[tuple[int, list[discord.Member]]]:
+    # Members are paged from the API rather than read from the cache, so large
+    # guilds are streamed without loading every member at once. Yields how many
+    # members were scanned so far alongside each chunk of recipients.
+    scanned = 0
+    chunk: list[discord.Member] = []
+    async for member in guild.fetch_members(limit=None):
+        scanned += 1
+        if member.bot or (role is not None and member.get_role(role.id) is None):
+            continue
+        chunk.append(member)
+        if len(chunk) >= size:
+            yield scanned, chunk
+            chunk = []
+    yield scanned, chunk
+
+
+def _stats_lines(bot: commands.Bot) -> list[str]:
+    lines = ["**Shards** (latency, guilds, sessions)"]
+    sessions = bot.sessions.count_by_shard()
+    guilds: dict[int, int] = {}
+    for guild in bot.guilds:
+        guilds[guild.shard_id] = guilds.get(guild.shard_id, 0) + 1
+    for shard_id, latency in bot.latencies:
+        lines.append(
+            f"`{shard_id}`: {latency * 1000:.0f}ms, {guilds.get(shard_id, 0)}, {sessions.get(shard_id, 0)}"
+        )
+    monitor = bot.loop_monitor
+    if monitor is not None:
+        lines.append(
+            f"**Event loop**: max lag {monitor.max_lag * 1000:.0f}ms, "
+            f"{monitor.stall_count} stalls over {monitor.stall_threshold_seconds * 1000:.0f}ms"
+        )
+    lines.append("**Command stages** (count, p50, p99)")
+    for labels, histogram in sorted(
+        bot.metrics.series("gamba_command_stage_seconds"),
+        key=lambda item: (item[0].get("command", ""), item[0].get("stage", "")),
+    ):
+        lines.append(
+            f"`{labels.get('command')}` {labels.get('stage')}: {histogram.count}, "
+            f"{histogram.quantile(0.5) * 1000:.1f}ms, {histogram.quantile(0.99) * 1000:.1f}ms"
+        )
+    lines.append("**Database statements** (count, total, p99)")
+    for labels, histogram in sorted(
+        bot.metrics.series("gamba_db_statement_seconds"),
+        key=lambda item: item[1].total,
+        reverse=True,
+    ):
+        lines.append(
+            f"`{labels.get('statement')}`: {histogram.count}, "
+            f"{histogram.total * 1000:.0f}ms, {histogram.quantile(0.99) * 1000:.1f}ms"
+        )
+    return lines
+
+
+def _gamestats_lines(bot: commands.Bot, window: str, guild_id: Optional[int]) -> list[str]:
+    scope = "this server" if guild_id is not None else "all servers"
+    lines = [f"**Game stats, last {window}** ({scope}; bets, hit rate, volume, house edge)"]
+    totals = bot.stats.totals(GAMESTATS_WINDOWS[window], guild_id=guild_id)
+    for game, total in sorted(totals.items()):
+        if not total.bets:
+            continue
+        lines.append(
+            f"`{game}`: {total.bets}, {total.hit_rate * 100:.1f}%, "
+            f"{Money(total.stake)}, {total.house_edge * 100:+.2f}%"
+        )
+    if len(lines) == 1:
+        lines.append("No bets in this window.")
+    return lines
+
+
+async def _send_admin_error(interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+    if isinstance(error, app_commands.MissingPermissions):
+        message = "You must be a server administrator to use this command."
+    else:
+        message = str(error)
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
 
 
 class CoreCog(commands.Cog):
@@ -24,8 +122,30 @@ class CoreCog(commands.Cog):
         record = await self.bot.db.ensure_user(interaction.user)
         await self.bot.responses.send_or_followup(
             interaction,
-            content=f"Balance for `{record.display_name}`: `{format_cents(record.balance)}` credits",
+            content=f"Balance for `{record.display_name}`: `{record.balance}` credits",
+        )
+
+    @app_commands.command(name="daily", description="Claim your daily bonus credits.")
+    @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+    async def daily(self, interaction: discord.Interaction) -> None:
+        settings = self.bot.settings
+        if settings.daily_bonus <= 0:
+            await self.bot.responses.send_or_followup(interaction, content="The daily bonus is disabled.")
+            return
+        record, next_claim_ms = await self.bot.db.claim_daily(
+            interaction.user,
+            settings.daily_bonus,
+            interval_seconds=settings.daily_claim_hours * 3600,
         )
+        next_claim = f"<t:{next_claim_ms // 1000}:R>"
+        if record is None:
+            content = f"You already claimed your daily bonus. The next one is available {next_claim}."
+        else:
+            content = (
+                f"Claimed `{Money(settings.daily_bonus)}` credits.\n"
+                f"New balance: `{record.balance}` credits. Next bonus {next_claim}."
+            )
+        await self.bot.responses.send_or_followup(interaction, content=content)
 
     @app_commands.command(name="admin_give", description="Admin: give credits to a server member.")
     @app_commands.guild_only()
@@ -44,11 +164,133 @@ class CoreCog(commands.Cog):
         await self.bot.responses.send_or_followup(
             interaction,
             content=(
-                f"Gave `{format_cents(amount_cents)}` credits to `{member.display_name}`.\n"
-                f"New balance: `{format_cents(record.balance)}` credits"
+                f"Gave `{amount_cents}` credits to `{member.display_name}`.\n"
+                f"New balance: `{record.balance}` credits"
             ),
         )
 
+    @app_commands.command(name="admin_give_role", description="Admin: give credits to every member of a role.")
+    @app_commands.guild_only()
+    @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(
+        amount="Credit amount to give each member (e.g. 10.50)",
+        role="Role to credit; leave empty for the whole server",
+    )
+    async def admin_give_role(
+        self,
+        interaction: discord.Interaction,
+        amount: app_commands.Range[float, 0.01, 50_000_000.0],
+        role: Optional[discord.Role] = None,
+    ) -> None:
+        if not self.bot.intents.members:
+            raise app_commands.AppCommandError("Role-wide grants need the members intent. Set `MEMBERS_INTENT=1`.")
+        assert interaction.guild is not None
+        if role is not None and role.is_default():
+            role = None
+        amount_cents = parse_credits_to_cents(amount)
+        grant = f"`{Money(amount_cents)}` credits"
+        target = f"`{role.name}`" if role is not None else "everyone in the server"
+        await self.bot.responses.defer(interaction)
+
+        credited = 0
+        progress: Optional[asyncio.Task[None]] = None
+        async for scanned, chunk in _member_chunks(interaction.guild, role):
+            if chunk:
+                credited += await self.bot.db.add_credits_many(chunk, amount_cents)
+            # Progress edits run in the background; one still waiting for its turn
+            # is simply skipped rather than holding up the next chunk.
+            if progress is None or progress.done():
+                progress = asyncio.create_task(
+                    self.bot.responses.edit_original(
+                        interaction,
+                        content=f"Giving {grant} to {target}: {credited} credited, {scanned} members scanned…",
+                    )
+                )
+        if progress is not None:
+            await progress
+        await self.bot.responses.edit_original(
+            interaction,
+            content=f"Gave {grant} each to {credited} members ({target}).",
+        )
+
+    @app_commands.command(name="admin_export", description="Admin: export balances or bet history as a file.")
+    @app_commands.guild_only()
+    @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(table="Table to export", fmt="File format (gzip-compressed)")
+    @app_commands.rename(fmt="format")
+    async def admin_export(
+        self,
+        interaction: discord.Interaction,
+        table: Literal["users", "bet_history"],
+        fmt: Literal["csv", "jsonl"] = "csv",
+    ) -> None:
+        assert interaction.guild is not None
+        if self.bot.settings.ledger_socket:
+            # The database file belongs to the ledger process and may be on another host.
+            raise app_commands.AppCommandError(
+                f"Exports run next to the ledger: use `python -m gamba_bot.services.export {table}` on its host."
+            )
+        await self.bot.responses.defer(interaction)
+        # The export streams into a temporary file from a worker thread on its own
+        # read-only connection; neither the event loop nor the writer waits on it.
+        with tempfile.TemporaryFile() as out:
+            try:
+                count = await asyncio.to_thread(export_table, self.bot.settings.database_path, table, out, fmt=fmt)
+            except (ExportError, sqlite3.Error) as exc:
+                raise app_commands.AppCommandError(f"Export failed: {exc}") from exc
+            size = out.tell()
+            if size > interaction.guild.filesize_limit:
+                await self.bot.responses.edit_original(
+                    interaction,
+                    content=(
+                        f"The export is {size / 1_000_000:.1f} MB, over this server's upload limit. "
+                        f"Run `python -m gamba_bot.services.export {table}` on the host instead."
+                    ),
+                )
+                return
+            out.seek(0)
+            await interaction.edit_original_response(
+                content=f"Exported {count} `{table}` rows. Amounts are in cents.",
+                attachments=[discord.File(out, filename=export_filename(table, fmt, compress=True))],
+            )
+
+    @app_commands.command(name="gamestats", description="Admin: show volume, hit rate and house edge per game.")
+    @app_commands.guild_only()
+    @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(window="Time window", scope="This server only, or every server the bot is in")
+    async def gamestats(
+        self,
+        interaction: discord.Interaction,
+        window: Literal["1h", "24h", "30d"] = "24h",
+        scope: Literal["server", "all"] = "server",
+    ) -> None:
+        guild_id = interaction.guild_id if scope == "server" else None
+        content = "\n".join(_gamestats_lines(self.bot, window, guild_id))
+        await self.bot.responses.send_or_followup(interaction, content=content[:STATS_MESSAGE_LIMIT])
+
+    @app_commands.command(name="stats", description="Admin: show command and database latency statistics.")
+    @app_commands.guild_only()
+    @app_commands.allowed_contexts(guilds=True, dms=False, private_channels=False)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    async def stats(self, interaction: discord.Interaction) -> None:
+        if not self.bot.metrics.enabled:
+            content = "Metrics are disabled. Set `METRICS_ENABLED=1` to collect them."
+        else:
+            content = ""
+            for line in _stats_lines(self.bot):
+                if len(content) + len(line) + 1 > STATS_MESSAGE_LIMIT:
+                    content += "…"
+                    break
+                content += line + "\n"
+        await self.bot.responses.send_or_followup(interaction, content=content)
+
     @balance.error
     async def on_balance_error(
         self,
@@ -60,20 +302,53 @@ class CoreCog(commands.Cog):
         else:
             await interaction.response.send_message(str(error), ephemeral=interaction.guild is not None)
 
+    @daily.error
+    async def on_daily_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        await self.on_balance_error(interaction, error)
+
     @admin_give.error
     async def on_admin_give_error(
         self,
         interaction: discord.Interaction,
         error: app_commands.AppCommandError,
     ) -> None:
-        if isinstance(error, app_commands.MissingPermissions):
-            message = "You must be a server administrator to use this command."
-        else:
-            message = str(error)
-        if interaction.response.is_done():
-            await interaction.followup.send(message, ephemeral=True)
-        else:
-            await interaction.response.send_message(message, ephemeral=True)
+        await _send_admin_error(interaction, error)
+
+    @admin_give_role.error
+    async def on_admin_give_role_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        await _send_admin_error(interaction, error)
+
+    @admin_export.error
+    async def on_admin_export_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        await _send_admin_error(interaction, error)
+
+    @gamestats.error
+    async def on_gamestats_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        await _send_admin_error(interaction, error)
+
+    @stats.error
+    async def on_stats_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        await _send_admin_error(interaction, error)
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -0,0 +1,171 @@
+import asyncio
+import re
+from collections import OrderedDict
+from typing import Any, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from gamba_bot.database import BetRecord
+from gamba_bot.utils.currency import Money
+
+HISTORY_PAGE_SIZE = 10
+PREFETCH_ENTRIES = 256
+
+OLDER = "o"
+NEWER = "n"
+
+Cursor = tuple[int, int]
+
+
+def _signed(value: int) -> str:
+    return f"+{Money(value)}" if value >= 0 else f"-{Money(abs(value))}"
+
+
+def _bet_line(bet: BetRecord) -> str:
+    game = bet.game or "bet"
+    return (
+        f"<t:{bet.ts // 1000}:f> · **{game}** · stake `{bet.stake}` · "
+        f"`{_signed(bet.delta)}` · balance `{bet.balance_after}`"
+    )
+
+
+class HistoryPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"history:(?P<user_id>\d+):(?P<direction>[on]):(?P<ts>\d+):(?P<bet_id>\d+)",
+):
+    # The page cursor lives in the custom id, so buttons keep working without any
+    # per-message state, including after a restart.
+    def __init__(self, user_id: int, direction: str, cursor: Cursor, *, disabled: bool = False):
+        ts, bet_id = cursor
+        super().__init__(
+            discord.ui.Button(
+                label="Older" if direction == OLDER else "Newer",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"history:{user_id}:{direction}:{ts}:{bet_id}",
+                disabled=disabled,
+            )
+        )
+        self.user_id = user_id
+        self.direction = direction
+        self.cursor = cursor
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+    ) -> "HistoryPageButton":
+        cursor = (int(match["ts"]), int(match["bet_id"]))
+        return cls(int(match["user_id"]), match["direction"], cursor)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("This is not your history.", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        cog = interaction.client.get_cog("HistoryCog")
+        assert isinstance(cog, HistoryCog)
+        await cog.turn_page(interaction, self.user_id, self.direction, self.cursor)
+
+
+class HistoryCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # Pages older than a cursor never change (new bets are always newer), so a
+        # prefetched "Older" page stays valid until it is used.
+        self._prefetched: OrderedDict[tuple[int, Cursor], asyncio.Task[list[BetRecord]]] = OrderedDict()
+
+    async def cog_load(self) -> None:
+        self.bot.add_dynamic_items(HistoryPageButton)
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(HistoryPageButton)
+        for task in self._prefetched.values():
+            task.cancel()
+        self._prefetched.clear()
+
+    def _prefetch(self, user_id: int, cursor: Cursor) -> None:
+        key = (user_id, cursor)
+        if key in self._prefetched:
+            return
+        task = asyncio.create_task(self.bot.db.bet_history(user_id, limit=HISTORY_PAGE_SIZE + 1, before=cursor))
+        # A prefetch that fails or is never used is dropped quietly; the page is
+        # fetched again on click.
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._prefetched[key] = task
+        while len(self._prefetched) > PREFETCH_ENTRIES:
+            _, stale = self._prefetched.popitem(last=False)
+            stale.cancel()
+
+    async def _older_page(self, user_id: int, cursor: Optional[Cursor]) -> list[BetRecord]:
+        # Returns up to one row more than a page; the extra row only signals that
+        # there is an older page.
+        if cursor is not None:
+            task = self._prefetched.pop((user_id, cursor), None)
+            self.bot.metrics.inc("gamba_history_prefetch_total", result="miss" if task is None else "hit")
+            if task is not None:
+                try:
+                    return await task
+                except Exception:
+                    pass
+        return await self.bot.db.bet_history(user_id, limit=HISTORY_PAGE_SIZE + 1, before=cursor)
+
+    def _render(self, user_id: int, bets: list[BetRecord], *, has_older: bool, has_newer: bool) -> dict[str, Any]:
+        embed = discord.Embed(title="Bet history", color=discord.Color.dark_teal())
+        if bets:
+            embed.description = "\n".join(_bet_line(bet) for bet in bets)
+        else:
+            embed.description = "No bets yet."
+        view = discord.ui.View(timeout=None)
+        newest = (bets[0].ts, bets[0].id) if bets else (0, 0)
+        oldest = (bets[-1].ts, bets[-1].id) if bets else (0, 0)
+        view.add_item(HistoryPageButton(user_id, NEWER, newest, disabled=not has_newer))
+        view.add_item(HistoryPageButton(user_id, OLDER, oldest, disabled=not has_older))
+        if has_older:
+            # Fetch the next "Older" page while the user reads this one.
+            self._prefetch(user_id, oldest)
+        return {"embed": embed, "view": view}
+
+    async def turn_page(self, interaction: discord.Interaction, user_id: int, direction: str, cursor: Cursor) -> None:
+        stage = self.bot.metrics.stages("gamba_command_stage_seconds", command="history.page", game="History")
+        with stage("query"):
+            if direction == OLDER:
+                bets = await self._older_page(user_id, cursor)
+                has_older, has_newer = len(bets) > HISTORY_PAGE_SIZE, True
+                bets = bets[:HISTORY_PAGE_SIZE]
+            else:
+                bets = await self.bot.db.bet_history(user_id, limit=HISTORY_PAGE_SIZE + 1, after=cursor)
+                has_older, has_newer = True, len(bets) > HISTORY_PAGE_SIZE
+                bets = bets[-HISTORY_PAGE_SIZE:]
+        if not bets or not has_newer:
+            # Back at the newest bets (or the cursor ran off the end): show a full
+            # newest page rather than a partial one.
+            bets = await self._older_page(user_id, None)
+            has_older, has_newer = len(bets) > HISTORY_PAGE_SIZE, False
+            bets = bets[:HISTORY_PAGE_SIZE]
+        with stage("edit"):
+            await interaction.response.edit_message(
+                **self._render(user_id, bets, has_older=has_older, has_newer=has_newer)
+            )
+
+    @app_commands.command(name="history", description="Show your recent bets.")
+    @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+    async def history(self, interaction: discord.Interaction) -> None:
+        await self.bot.responses.defer(interaction)
+        bets = await self._older_page(interaction.user.id, None)
+        page = self._render(
+            interaction.user.id,
+            bets[:HISTORY_PAGE_SIZE],
+            has_older=len(bets) > HISTORY_PAGE_SIZE,
+            has_newer=False,
+        )
+        await interaction.edit_original_response(content=None, **page)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(HistoryCog(bot))
@@ -9,10 +9,16 @@ from gamba_bot.services.games import (
     SLOT_EMOJI,
     SlotResult,
     evaluate_slots,
+    is_slot_jackpot,
     slot_paytable_lines,
     spin_slot_reels,
 )
-from gamba_bot.utils.currency import format_cents, parse_credits_to_cents
+from gamba_bot.utils.abuse import refusal_text
+from gamba_bot.utils.currency import Money, parse_credits_to_cents
+from gamba_bot.utils.render import PayloadCache
+from gamba_bot.utils.sessions import shard_id_for
+
+_HOLD_TEXT = {False: "OFF", True: "ON"}
 
 
 class HoldButton(discord.ui.Button):
@@ -65,6 +71,12 @@ class SlotsView(discord.ui.View):
         self.stops, self.symbols = spin_slot_reels(None, [False, False, False])
         self.last_result: SlotResult | None = None
         self._settle_lock = asyncio.Lock()
+        self._payload = PayloadCache()
+        self._stake_text = f"`{Money(stake)}` credits"
+        # The pool is shared and moves with every spin anywhere; it is sampled only
+        # when this view spins, so hold toggles still hit the payload cache.
+        self._jackpot_text = ""
+        self._sample_jackpot()
 
         self.spin_button = SpinButton()
         self.hold_buttons = [HoldButton(0), HoldButton(1), HoldButton(2)]
@@ -76,10 +88,14 @@ class SlotsView(discord.ui.View):
         self.add_item(self.winnings_button)
         self._sync_hold_buttons()
 
+    def stop(self) -> None:
+        self.bot.sessions.discard(self)
+        super().stop()
+
     def _sync_hold_buttons(self) -> None:
         for idx, btn in enumerate(self.hold_buttons):
             is_held = self.holds[idx]
-            btn.label = f"Hold {idx + 1}: {'ON' if is_held else 'OFF'}"
+            btn.label = f"Hold {idx + 1}: {_HOLD_TEXT[is_held]}"
             btn.style = discord.ButtonStyle.danger if is_held else discord.ButtonStyle.secondary
 
     def _disable_inputs(self) -> None:
@@ -87,6 +103,9 @@ class SlotsView(discord.ui.View):
             if isinstance(child, discord.ui.Button):
                 child.disabled = True
 
+    def _sample_jackpot(self) -> None:
+        self._jackpot_text = f"`{self.bot.jackpot.pool}` credits"
+
     def _machine_line(self) -> str:
         return " | ".join(SLOT_EMOJI[symbol] for symbol in self.symbols)
 
@@ -96,18 +115,19 @@ class SlotsView(discord.ui.View):
         embed.add_field(
             name="Holds",
             value=(
-                f"R1: {'ON' if self.holds[0] else 'OFF'} | "
-                f"R2: {'ON' if self.holds[1] else 'OFF'} | "
-                f"R3: {'ON' if self.holds[2] else 'OFF'}"
+                f"R1: {_HOLD_TEXT[self.holds[0]]} | "
+                f"R2: {_HOLD_TEXT[self.holds[1]]} | "
+                f"R3: {_HOLD_TEXT[self.holds[2]]}"
             ),
             inline=False,
         )
-        embed.add_field(name="Stake / Spin", value=f"`{format_cents(self.stake)}` credits", inline=True)
-        embed.add_field(name="Balance", value=f"`{format_cents(self.balance)}` credits", inline=True)
+        embed.add_field(name="Stake / Spin", value=self._stake_text, inline=True)
+        embed.add_field(name="Balance", value=f"`{self.balance}` credits", inline=True)
+        embed.add_field(name="Jackpot", value=self._jackpot_text, inline=True)
         if self.last_result:
             embed.add_field(
                 name="Last Spin",
-                value=f"{self.last_result.reason}\nNet: `{format_cents(self.last_result.net_delta)}`",
+                value=f"{self.last_result.reason}\nNet: `{Money(self.last_result.net_delta)}`",
                 inline=False,
             )
         embed.set_footer(text=footer)
@@ -120,17 +140,31 @@ class SlotsView(discord.ui.View):
         return True
 
     async def on_timeout(self) -> None:
+        # discord.py marks a timed-out view finished without calling stop().
+        self.bot.sessions.discard(self)
         self._disable_inputs()
         timeout_embed = self.build_embed(footer="Session timed out.")
         try:
-            await self.origin_interaction.edit_original_response(embed=timeout_embed, view=self)
+            await self.bot.responses.edit_original(self.origin_interaction, embed=timeout_embed, view=self)
         except discord.HTTPException:
             return
 
+    async def drain(self, grace_seconds: float) -> None:
+        # A spin already past its defer owns the lock; let it settle first.
+        async with self._settle_lock:
+            self._disable_inputs()
+            embed = self.build_embed(footer="The bot is restarting. Session ended.")
+        try:
+            await self.bot.responses.edit_original(self.origin_interaction, embed=embed, view=self)
+        except discord.HTTPException:
+            pass
+        self.stop()
+
     async def toggle_hold(self, interaction: discord.Interaction, reel_index: int) -> None:
         self.holds[reel_index] = not self.holds[reel_index]
         self._sync_hold_buttons()
         embed = self.build_embed(footer="Select holds, then press Spin.")
+        self._payload.update(embed, self)
         await interaction.response.edit_message(embed=embed, view=self)
 
     async def show_winnings(self, interaction: discord.Interaction) -> None:
@@ -142,40 +176,70 @@ class SlotsView(discord.ui.View):
         )
 
     async def spin(self, interaction: discord.Interaction) -> None:
+        if self.bot.draining:
+            await interaction.response.send_message("The bot is restarting; no new spins right now.", ephemeral=True)
+            return
         if all(self.holds):
             await interaction.response.send_message(
                 "At least one reel must be unheld before spinning.",
                 ephemeral=True,
             )
             return
+        if self.bot.abuse is not None:
+            verdict = self.bot.abuse.check(self.user_id, "slots.spin")
+            if not verdict.allowed:
+                await interaction.response.send_message(refusal_text(verdict), ephemeral=True)
+                return
 
-        await interaction.response.defer()
+        stage = self.bot.metrics.stages("gamba_command_stage_seconds", command="slots.spin", game="Slots")
+        with stage("defer"):
+            await interaction.response.defer()
+        # The edit happens outside the lock so a burst of spins can coalesce into a
+        # single message update carrying the newest result.
         async with self._settle_lock:
             await asyncio.sleep(0.3)
             self.stops, self.symbols = spin_slot_reels(self.stops, self.holds)
             result = evaluate_slots(self.symbols, self.stake)
             self.last_result = result
+            won = Money(0)
             try:
-                record = await self.bot.db.settle_bet(
-                    self.origin_interaction.user,
-                    stake=self.stake,
-                    delta=result.net_delta,
-                )
+                with stage("settle_bet"):
+                    if is_slot_jackpot(self.symbols, self.holds):
+                        record, won = await self.bot.jackpot.claim(
+                            self.origin_interaction.user,
+                            self.stake,
+                            result.net_delta,
+                            game="slots",
+                        )
+                    else:
+                        record = await self.bot.db.settle_bet(
+                            self.origin_interaction.user,
+                            stake=self.stake,
+                            delta=result.net_delta,
+                            game="slots",
+                        )
             except InsufficientBalanceError:
                 self._disable_inputs()
+                self._sample_jackpot()
                 embed = self.build_embed(footer="Insufficient balance for another spin.")
-                await interaction.edit_original_response(embed=embed, view=self)
-                return
-
-            self.balance = record.balance
-            if result.net_delta > 0:
-                footer = f"You won {format_cents(result.gross_win)} (net +{format_cents(result.net_delta)})."
-            elif result.net_delta == 0:
-                footer = "Break-even spin."
             else:
-                footer = f"No payout. Lost {format_cents(abs(result.net_delta))}."
-            embed = self.build_embed(footer=footer)
-            await interaction.edit_original_response(embed=embed, view=self)
+                self.bot.jackpot.contribute(self.stake)
+                self._sample_jackpot()
+                self.bot.stats.record("slots", self.origin_interaction.guild_id, self.stake, result.net_delta + won)
+                self.balance = record.balance
+                if won:
+                    footer = f"JACKPOT! You won {Money(result.gross_win + won)} (jackpot {won})."
+                elif result.net_delta > 0:
+                    footer = f"You won {Money(result.gross_win)} (net +{Money(result.net_delta)})."
+                elif result.net_delta == 0:
+                    footer = "Break-even spin."
+                else:
+                    footer = f"No payout. Lost {Money(abs(result.net_delta))}."
+                embed = self.build_embed(footer=footer)
+            if not self._payload.update(embed, self):
+                return
+        with stage("edit"):
+            await self.bot.responses.edit_original(interaction, embed=embed, view=self)
 
 
 class SlotsCog(commands.Cog):
@@ -208,6 +272,8 @@ class SlotsCog(commands.Cog):
             user_record=record,
         )
         embed = view.build_embed(footer="Press Spin to play. Use Hold buttons to lock reels.")
+        view._payload.update(embed, view)
+        self.bot.sessions.add(view, shard_id=shard_id_for(interaction.guild))
         await interaction.edit_original_response(content=None, embed=embed, view=view)
 
 
@@ -1,14 +1,108 @@
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 from dotenv import load_dotenv
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _parse_shard_ids(value: str) -> Optional[tuple[int, ...]]:
+    value = value.strip()
+    if not value:
+        return None
+    shard_ids: list[int] = []
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        if end:
+            shard_ids.extend(range(int(start), int(end) + 1))
+        else:
+            shard_ids.append(int(start))
+    return tuple(sorted(set(shard_ids)))
+
+
+def _parse_log_sampling(value: str) -> tuple[tuple[str, float], ...]:
+    rates: list[tuple[str, float]] = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, sep, rate = part.partition("=")
+        if not sep:
+            raise ValueError("LOG_SAMPLING entries must look like logger=rate.")
+        rate_value = float(rate)
+        if not 0.0 <= rate_value <= 1.0:
+            raise ValueError("LOG_SAMPLING rates must be between 0 and 1.")
+        rates.append((name.strip(), rate_value))
+    return tuple(rates)
+
+
 @dataclass(frozen=True)
 class Settings:
     discord_token: str
     database_path: str
     starting_balance: int
+    metrics_enabled: bool = False
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+    force_command_sync: bool = False
+    lazy_game_tables: bool = False
+    profile_imports: bool = False
+    # None asks Discord for the recommended shard count.
+    shard_count: Optional[int] = 1
+    shard_ids: Optional[tuple[int, ...]] = None
+    # When set, balances go through the ledger service on this Unix socket instead
+    # of opening the database in-process.
+    ledger_socket: str = ""
+    loop_monitor: bool = False
+    loop_stall_threshold_ms: int = 250
+    event_loop: str = "asyncio"
+    # 0 runs calculations on a background thread instead of worker processes.
+    compute_workers: int = 1
+    log_level: str = "INFO"
+    log_format: str = "text"
+    # Below WARNING, keep this fraction of records from each logger prefix.
+    log_sampling: tuple[tuple[str, float], ...] = ()
+    log_queue_size: int = 10_000
+    # On SIGTERM, open hands get drain_grace_seconds to finish before they are
+    # stood automatically; the whole session drain is capped at drain_timeout_seconds.
+    drain_grace_seconds: float = 10.0
+    drain_timeout_seconds: float = 20.0
+    # Privileged intent; required to list members for role-wide grants.
+    members_intent: bool = False
+    # Online backups are written here when set, keeping the newest backup_retention.
+    backup_dir: str = ""
+    backup_interval_minutes: float = 60.0
+    backup_retention: int = 24
+    backup_pages_per_step: int = 256
+    backup_step_sleep_ms: float = 5.0
+    stats_flush_seconds: float = 60.0
+    # Share of every slots stake, in basis points, that feeds the shared jackpot.
+    jackpot_contribution_bps: int = 100
+    jackpot_seed: int = 100_000
+    jackpot_flush_seconds: float = 5.0
+    # Opt-in. More than abuse_max_actions games within abuse_window_seconds, or a
+    # machine-regular click rhythm, earns a cooldown; abuse_strikes_to_block
+    # cooldowns in a row earn a block.
+    abuse_detection: bool = False
+    abuse_window_seconds: float = 10.0
+    abuse_max_actions: int = 20
+    abuse_cooldown_seconds: float = 15.0
+    abuse_strikes_to_block: int = 3
+    abuse_block_seconds: float = 600.0
+    abuse_rhythm_samples: int = 30
+    abuse_rhythm_share: float = 0.9
+    # /daily pays daily_bonus once per daily_claim_hours; balances below topup_balance
+    # are raised to it by a scheduled job, at most once per topup_interval_minutes.
+    # Amounts are in cents and 0 disables the reward.
+    daily_bonus: int = 10_000
+    daily_claim_hours: float = 24.0
+    topup_balance: int = 5_000
+    topup_interval_minutes: float = 60.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -19,8 +113,57 @@ class Settings:
 
         database_path = os.getenv("DATABASE_PATH", "./data/gamba.db")
         starting_balance = int(os.getenv("STARTING_BALANCE", "100000"))
+        raw_shard_count = os.getenv("SHARD_COUNT", "1").strip().lower()
+        shard_count = None if raw_shard_count == "auto" else int(raw_shard_count)
+        shard_ids = _parse_shard_ids(os.getenv("SHARD_IDS", ""))
+        if shard_ids is not None:
+            if shard_count is None:
+                raise ValueError("SHARD_IDS requires an explicit SHARD_COUNT.")
+            if shard_ids[-1] >= shard_count:
+                raise ValueError("SHARD_IDS must be below SHARD_COUNT.")
         return cls(
             discord_token=token,
             database_path=database_path,
             starting_balance=starting_balance,
+            metrics_enabled=_env_bool("METRICS_ENABLED"),
+            metrics_host=os.getenv("METRICS_HOST", "127.0.0.1"),
+            metrics_port=int(os.getenv("METRICS_PORT", "0")),
+            force_command_sync=_env_bool("FORCE_COMMAND_SYNC"),
+            lazy_game_tables=_env_bool("LAZY_GAME_TABLES"),
+            profile_imports=_env_bool("PROFILE_IMPORTS"),
+            shard_count=shard_count,
+            shard_ids=shard_ids,
+            ledger_socket=os.getenv("LEDGER_SOCKET", "").strip(),
+            loop_monitor=_env_bool("LOOP_MONITOR"),
+            loop_stall_threshold_ms=int(os.getenv("LOOP_STALL_THRESHOLD_MS", "250")),
+            event_loop=os.getenv("EVENT_LOOP", "asyncio").strip().lower() or "asyncio",
+            compute_workers=int(os.getenv("COMPUTE_WORKERS", "1")),
+            log_level=os.getenv("LOG_LEVEL", "INFO").strip().upper() or "INFO",
+            log_format=os.getenv("LOG_FORMAT", "text").strip().lower() or "text",
+            log_sampling=_parse_log_sampling(os.getenv("LOG_SAMPLING", "")),
+            log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            drain_grace_seconds=float(os.getenv("DRAIN_GRACE_SECONDS", "10")),
+            drain_timeout_seconds=float(os.getenv("DRAIN_TIMEOUT_SECONDS", "20")),
+            members_intent=_env_bool("MEMBERS_INTENT"),
+            backup_dir=os.getenv("BACKUP_DIR", "").strip(),
+            backup_interval_minutes=float(os.getenv("BACKUP_INTERVAL_MINUTES", "60")),
+            backup_retention=int(os.getenv("BACKUP_RETENTION", "24")),
+            backup_pages_per_step=int(os.getenv("BACKUP_PAGES_PER_STEP", "256")),
+            backup_step_sleep_ms=float(os.getenv("BACKUP_STEP_SLEEP_MS", "5")),
+            stats_flush_seconds=float(os.getenv("STATS_FLUSH_SECONDS", "60")),
+            jackpot_contribution_bps=int(os.getenv("JACKPOT_CONTRIBUTION_BPS", "100")),
+            jackpot_seed=int(os.getenv("JACKPOT_SEED", "100000")),
+            jackpot_flush_seconds=float(os.getenv("JACKPOT_FLUSH_SECONDS", "5")),
+            abuse_detection=_env_bool("ABUSE_DETECTION"),
+            abuse_window_seconds=float(os.getenv("ABUSE_WINDOW_SECONDS", "10")),
+            abuse_max_actions=int(os.getenv("ABUSE_MAX_ACTIONS", "20")),
+            abuse_cooldown_seconds=float(os.getenv("ABUSE_COOLDOWN_SECONDS", "15")),
+            abuse_strikes_to_block=int(os.getenv("ABUSE_STRIKES_TO_BLOCK", "3")),
+            abuse_block_seconds=float(os.getenv("ABUSE_BLOCK_SECONDS", "600")),
+            abuse_rhythm_samples=int(os.getenv("ABUSE_RHYTHM_SAMPLES", "30")),
+            abuse_rhythm_share=float(os.getenv("ABUSE_RHYTHM_SHARE", "0.9")),
+            daily_bonus=int(os.getenv("DAILY_BONUS", "10000")),
+            daily_claim_hours=float(os.getenv("DAILY_CLAIM_HOURS", "24")),
+            topup_balance=int(os.getenv("TOPUP_BALANCE", "5000")),
+            topup_interval_minutes=float(os.getenv("TOPUP_INTERVAL_MINUTES", "60")),
         )
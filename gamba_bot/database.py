@@ -1,37 +1,210 @@
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache, wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Sequence, TypeVar
 
 import aiosqlite
 import discord
 
+from gamba_bot.utils.currency import Money
+from gamba_bot.utils.metrics import Metrics
+
 
 @dataclass(frozen=True)
 class UserRecord:
     user_id: int
     display_name: str
-    balance: int
+    balance: Money
     created_at: str
     updated_at: str
 
 
+@dataclass(frozen=True)
+class BetEntry:
+    user: discord.abc.User
+    stake: int
+    delta: int
+    game: str
+
+
+@dataclass(frozen=True)
+class BetOutcome:
+    entry: BetEntry
+    accepted: bool
+    # Balance right after this entry (or when it was rejected), and the user's
+    # record once the whole batch is applied.
+    balance: Money
+    record: UserRecord
+
+
+@dataclass(frozen=True)
+class BetRecord:
+    id: int
+    user_id: int
+    # Milliseconds since the epoch.
+    ts: int
+    game: str
+    stake: Money
+    delta: Money
+    balance_after: Money
+
+
 class InsufficientBalanceError(Exception):
     pass
 
 
+_USER_COLUMNS = "user_id, display_name, balance, created_at, updated_at"
+_BET_COLUMNS = "id, user_id, ts, game, stake, delta, balance_after"
+_INSERT_BET = "INSERT INTO bet_history (user_id, ts, game, stake, delta, balance_after) VALUES (?, ?, ?, ?, ?, ?)"
+# Users per statement in settle_many; keeps the bound parameters well under
+# SQLite's variable limit.
+_SETTLE_CHUNK = 500
+
+
+def _user_record(row: aiosqlite.Row) -> UserRecord:
+    return UserRecord(
+        user_id=row["user_id"],
+        display_name=row["display_name"],
+        balance=Money(row["balance"]),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+def _bet_record(row: aiosqlite.Row) -> BetRecord:
+    return BetRecord(
+        id=row["id"],
+        user_id=row["user_id"],
+        ts=row["ts"],
+        game=row["game"],
+        stake=Money(row["stake"]),
+        delta=Money(row["delta"]),
+        balance_after=Money(row["balance_after"]),
+    )
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+@lru_cache(maxsize=256)
+def _statement_label(sql: str) -> str:
+    tokens = sql.split()
+    verb = tokens[0].upper()
+    for idx, token in enumerate(tokens[:-1]):
+        if token.upper() in ("FROM", "INTO", "UPDATE", "EXISTS"):
+            return f"{verb} {tokens[idx + 1]}"
+    return verb
+
+
+T = TypeVar("T")
+
+
+def _serialized(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    @wraps(method)
+    async def wrapper(self: "Database", *args: Any, **kwargs: Any) -> T:
+        async with self._exclusive():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class Database:
-    def __init__(self, db_path: str, starting_balance: int):
+    def __init__(self, db_path: str, starting_balance: int, *, metrics: Optional[Metrics] = None):
         self.db_path = db_path
         self.starting_balance = starting_balance
+        self.metrics = metrics or Metrics(enabled=False)
         self._conn: Optional[aiosqlite.Connection] = None
+        self._batch_depth = 0
+        # Every coroutine shares the one connection, and with it the open
+        # transaction; one task at a time owns it, re-entrantly.
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task[Any]] = None
+
+    async def _execute(self, sql: str, params: Iterable[Any] = ()) -> aiosqlite.Cursor:
+        assert self._conn is not None
+        with self.metrics.time("gamba_db_statement_seconds", statement=_statement_label(sql)):
+            return await self._conn.execute(sql, params)
+
+    async def _commit(self) -> None:
+        assert self._conn is not None
+        if self._batch_depth:
+            return
+        with self.metrics.time("gamba_db_statement_seconds", statement="COMMIT"):
+            await self._conn.commit()
+
+    async def _executemany(self, sql: str, params: Iterable[Iterable[Any]]) -> None:
+        assert self._conn is not None
+        with self.metrics.time("gamba_db_statement_seconds", statement=_statement_label(sql)):
+            await self._conn.executemany(sql, params)
+
+    async def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> list[aiosqlite.Row]:
+        cursor = await self._execute(sql, params)
+        rows = await cursor.fetchall()
+        await cursor.close()
+        return list(rows)
+
+    async def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[aiosqlite.Row]:
+        cursor = await self._execute(sql, params)
+        row = await cursor.fetchone()
+        await cursor.close()
+        return row
+
+    @asynccontextmanager
+    async def _exclusive(self) -> AsyncIterator[None]:
+        task = asyncio.current_task()
+        if self._owner is task:
+            yield
+            return
+        async with self._lock:
+            self._owner = task
+            try:
+                yield
+            finally:
+                self._owner = None
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        # Writes made inside the block share one transaction and one commit. The
+        # connection is held for the whole block, so other callers wait for the
+        # commit instead of joining a transaction that may still roll back. A
+        # nested block is a savepoint: if it fails, only its own writes are undone,
+        # even when the enclosing batch catches the error and carries on.
+        assert self._conn is not None
+        async with self._exclusive():
+            depth = self._batch_depth
+            savepoint = f"batch_{depth}"
+            if depth:
+                await self._execute(f"SAVEPOINT {savepoint}")
+            elif not self._conn.in_transaction:
+                await self._execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if depth:
+                    await self._execute(f"ROLLBACK TO {savepoint}")
+                    await self._execute(f"RELEASE {savepoint}")
+                else:
+                    await self._conn.rollback()
+                raise
+            self._batch_depth -= 1
+            if depth:
+                await self._execute(f"RELEASE {savepoint}")
+            else:
+                await self._commit()
 
     async def initialize(self) -> None:
         os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
         self._conn = await aiosqlite.connect(self.db_path)
         self._conn.row_factory = aiosqlite.Row
-        await self._conn.execute("PRAGMA journal_mode=WAL;")
-        await self._conn.execute(
+        await self._execute("PRAGMA journal_mode=WAL;")
+        await self._execute(
             """
             CREATE TABLE IF NOT EXISTS users (
                 user_id INTEGER PRIMARY KEY,
@@ -42,17 +215,104 @@ class Database:
             )
             """
         )
-        await self._conn.commit()
+        await self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS bot_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        await self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS bet_history (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                game TEXT NOT NULL,
+                stake INTEGER NOT NULL,
+                delta INTEGER NOT NULL,
+                balance_after INTEGER NOT NULL
+            )
+            """
+        )
+        await self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS game_stats (
+                game TEXT NOT NULL,
+                guild_id INTEGER NOT NULL,
+                resolution TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                bets INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                stake INTEGER NOT NULL,
+                delta INTEGER NOT NULL,
+                PRIMARY KEY (resolution, bucket, game, guild_id)
+            )
+            """
+        )
+        await self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS jackpots (
+                name TEXT PRIMARY KEY,
+                pool INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        # Reward claim state, added in place on databases created before it existed.
+        await self._add_column("users", "last_claim", "INTEGER NOT NULL DEFAULT 0")
+        await self._add_column("users", "last_topup", "INTEGER NOT NULL DEFAULT 0")
+        # The top-up job selects `balance < floor AND last_topup <= cutoff`; with this
+        # index it reads only the low-balance range, however many users there are.
+        await self._execute("CREATE INDEX IF NOT EXISTS idx_users_topup ON users (balance, last_topup)")
+        # History pages are read newest first by keyset on (ts, id), which this
+        # index serves directly without a sort.
+        await self._execute(
+            "CREATE INDEX IF NOT EXISTS idx_bet_history_user_ts ON bet_history (user_id, ts DESC, id DESC)"
+        )
+        await self._commit()
+
+    async def _add_column(self, table: str, column: str, definition: str) -> None:
+        columns = {row["name"] for row in await self._fetchall(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            await self._execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @_serialized
+    async def checkpoint(self) -> None:
+        # Fold the WAL back into the main file so a restart does not replay it.
+        await self._fetchone("PRAGMA wal_checkpoint(TRUNCATE);")
 
     async def close(self) -> None:
         if self._conn:
             await self._conn.close()
             self._conn = None
 
+    @_serialized
+    async def get_meta(self, key: str) -> Optional[str]:
+        row = await self._fetchone("SELECT value FROM bot_meta WHERE key = ?", (key,))
+        return None if row is None else row["value"]
+
+    @_serialized
+    async def set_meta(self, key: str, value: str) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        await self._execute(
+            """
+            INSERT INTO bot_meta (key, value, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value=excluded.value,
+                updated_at=excluded.updated_at
+            """,
+            (key, value, now),
+        )
+        await self._commit()
+
+    @_serialized
     async def ensure_user(self, user: discord.abc.User) -> UserRecord:
         now = datetime.now(timezone.utc).isoformat()
-        assert self._conn is not None
-        await self._conn.execute(
+        await self._execute(
             """
             INSERT INTO users (user_id, display_name, balance, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?)
@@ -62,43 +322,29 @@ class Database:
             """,
             (user.id, user.display_name, self.starting_balance, now, now),
         )
-        await self._conn.commit()
+        await self._commit()
         record = await self.get_user(user.id)
         assert record is not None
         return record
 
+    @_serialized
     async def get_user(self, user_id: int) -> Optional[UserRecord]:
-        assert self._conn is not None
-        cursor = await self._conn.execute(
-            "SELECT user_id, display_name, balance, created_at, updated_at FROM users WHERE user_id = ?",
-            (user_id,),
-        )
-        row = await cursor.fetchone()
-        await cursor.close()
-        if row is None:
-            return None
-        return UserRecord(
-            user_id=row["user_id"],
-            display_name=row["display_name"],
-            balance=row["balance"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        row = await self._fetchone(f"SELECT {_USER_COLUMNS} FROM users WHERE user_id = ?", (user_id,))
+        return None if row is None else _user_record(row)
 
-    async def settle_bet(self, user: discord.abc.User, stake: int, delta: int) -> UserRecord:
+    @_serialized
+    async def settle_bet(self, user: discord.abc.User, stake: int, delta: int, *, game: str = "") -> UserRecord:
         if stake <= 0:
             raise ValueError("Stake must be greater than zero.")
 
         await self.ensure_user(user)
-        assert self._conn is not None
         now = datetime.now(timezone.utc).isoformat()
-        async with self._conn.execute(
+        row = await self._fetchone(
             "SELECT balance FROM users WHERE user_id = ?",
             (user.id,),
-        ) as cursor:
-            row = await cursor.fetchone()
+        )
         assert row is not None
-        balance = int(row["balance"])
+        balance = Money(row["balance"])
         if balance < stake:
             raise InsufficientBalanceError(f"Balance {balance} < stake {stake}")
 
@@ -106,35 +352,303 @@ class Database:
         if new_balance < 0:
             raise InsufficientBalanceError("Transaction would result in negative balance.")
 
-        await self._conn.execute(
+        await self._execute(
             "UPDATE users SET balance = ?, display_name = ?, updated_at = ? WHERE user_id = ?",
             (new_balance, user.display_name, now, user.id),
         )
-        await self._conn.commit()
+        await self._execute(_INSERT_BET, (user.id, _now_ms(), game, stake, delta, new_balance))
+        await self._commit()
         record = await self.get_user(user.id)
         assert record is not None
         return record
 
+    @_serialized
+    async def add_to_jackpot(self, name: str, amount: int, *, seed: int) -> Money:
+        # Creates the pool at `seed` on first use; an amount of 0 just reads it.
+        now = datetime.now(timezone.utc).isoformat()
+        row = await self._fetchone(
+            """
+            INSERT INTO jackpots (name, pool, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                pool=pool + ?,
+                updated_at=excluded.updated_at
+            RETURNING pool
+            """,
+            (name, seed + amount, now, amount),
+        )
+        await self._commit()
+        assert row is not None
+        return Money(row["pool"])
+
+    @_serialized
+    async def settle_jackpot_win(
+        self,
+        user: discord.abc.User,
+        stake: int,
+        delta: int,
+        *,
+        name: str,
+        contribution: int,
+        seed: int,
+        game: str = "",
+    ) -> tuple[UserRecord, Money]:
+        # The unflushed contribution, the payout of the whole pool, the reset to
+        # the seed and the bet itself commit together or not at all.
+        async with self.batch():
+            won = await self.add_to_jackpot(name, contribution, seed=seed)
+            await self._execute(
+                "UPDATE jackpots SET pool = ?, updated_at = ? WHERE name = ?",
+                (seed, datetime.now(timezone.utc).isoformat(), name),
+            )
+            record = await self.settle_bet(user, stake, delta + won, game=game)
+        return record, won
+
+    @_serialized
+    async def settle_many(self, entries: Sequence[BetEntry]) -> list[BetOutcome]:
+        for entry in entries:
+            if entry.stake <= 0:
+                raise ValueError("Stake must be greater than zero.")
+        if not entries:
+            return []
+
+        now = datetime.now(timezone.utc).isoformat()
+        users = {entry.user.id: entry.user for entry in entries}
+        user_ids = list(users)
+        async with self.batch():
+            await self._executemany(
+                """
+                INSERT INTO users (user_id, display_name, balance, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    display_name=excluded.display_name,
+                    updated_at=excluded.updated_at
+                """,
+                [(user.id, user.display_name, self.starting_balance, now, now) for user in users.values()],
+            )
+            balances: dict[int, Money] = {}
+            records: dict[int, UserRecord] = {}
+            for start in range(0, len(user_ids), _SETTLE_CHUNK):
+                chunk = user_ids[start : start + _SETTLE_CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                for row in await self._fetchall(f"SELECT {_USER_COLUMNS} FROM users WHERE user_id IN ({marks})", chunk):
+                    records[row["user_id"]] = _user_record(row)
+                    balances[row["user_id"]] = Money(row["balance"])
+
+            # Entries apply in order, so a user's earlier results count towards
+            # whether a later stake is covered.
+            accepted: list[bool] = []
+            after: list[Money] = []
+            for entry in entries:
+                balance = balances[entry.user.id]
+                ok = balance >= entry.stake and balance + entry.delta >= 0
+                if ok:
+                    balance = balance + entry.delta
+                    balances[entry.user.id] = balance
+                accepted.append(ok)
+                after.append(balance)
+
+            changed = list(dict.fromkeys(entry.user.id for entry, ok in zip(entries, accepted) if ok))
+            for start in range(0, len(changed), _SETTLE_CHUNK):
+                chunk = changed[start : start + _SETTLE_CHUNK]
+                values = ", ".join("(?, ?)" for _ in chunk)
+                params: list[Any] = [now]
+                for user_id in chunk:
+                    params += (user_id, int(balances[user_id]))
+                for row in await self._fetchall(
+                    f"""
+                    UPDATE users SET balance = settled.column2, updated_at = ?
+                    FROM (VALUES {values}) AS settled
+                    WHERE users.user_id = settled.column1
+                    RETURNING {_USER_COLUMNS}
+                    """,
+                    params,
+                ):
+                    records[row["user_id"]] = _user_record(row)
+            ts = _now_ms()
+            await self._executemany(
+                _INSERT_BET,
+                [
+                    (entry.user.id, ts, entry.game, entry.stake, entry.delta, int(balance))
+                    for entry, ok, balance in zip(entries, accepted, after)
+                    if ok
+                ],
+            )
+
+        return [
+            BetOutcome(entry=entry, accepted=ok, balance=balance, record=records[entry.user.id])
+            for entry, ok, balance in zip(entries, accepted, after)
+        ]
+
+    @_serialized
+    async def bet_history(
+        self,
+        user_id: int,
+        *,
+        limit: int,
+        before: Optional[tuple[int, int]] = None,
+        after: Optional[tuple[int, int]] = None,
+    ) -> list[BetRecord]:
+        # Keyset paging on (ts, id): each page starts from the cursor through the
+        # index, so it costs the same however far back it is. Results are always
+        # newest first; `after` pages towards newer bets.
+        if after is not None:
+            rows = await self._fetchall(
+                f"""
+                SELECT {_BET_COLUMNS} FROM bet_history
+                WHERE user_id = ? AND (ts, id) > (?, ?)
+                ORDER BY ts, id LIMIT ?
+                """,
+                (user_id, *after, limit),
+            )
+            rows.reverse()
+        elif before is not None:
+            rows = await self._fetchall(
+                f"""
+                SELECT {_BET_COLUMNS} FROM bet_history
+                WHERE user_id = ? AND (ts, id) < (?, ?)
+                ORDER BY ts DESC, id DESC LIMIT ?
+                """,
+                (user_id, *before, limit),
+            )
+        else:
+            rows = await self._fetchall(
+                f"SELECT {_BET_COLUMNS} FROM bet_history WHERE user_id = ? ORDER BY ts DESC, id DESC LIMIT ?",
+                (user_id, limit),
+            )
+        return [_bet_record(row) for row in rows]
+
+    @_serialized
+    async def save_game_stats(
+        self,
+        rows: Sequence[tuple[str, int, str, int, int, int, int, int]],
+        keep_from: Sequence[tuple[str, int]],
+    ) -> None:
+        # Rows carry what each bucket gained since the process last saved it; with a
+        # ledger several bot processes add to the same bucket.
+        async with self.batch():
+            await self._executemany(
+                """
+                INSERT INTO game_stats (game, guild_id, resolution, bucket, bets, wins, stake, delta)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(resolution, bucket, game, guild_id) DO UPDATE SET
+                    bets=bets + excluded.bets,
+                    wins=wins + excluded.wins,
+                    stake=stake + excluded.stake,
+                    delta=delta + excluded.delta
+                """,
+                rows,
+            )
+            await self._executemany("DELETE FROM game_stats WHERE resolution = ? AND bucket < ?", keep_from)
+
+    @_serialized
+    async def load_game_stats(
+        self,
+        since: Sequence[tuple[str, int]],
+    ) -> list[tuple[str, int, str, int, int, int, int, int]]:
+        rows: list[tuple[str, int, str, int, int, int, int, int]] = []
+        for resolution, bucket in since:
+            for row in await self._fetchall(
+                """
+                SELECT game, guild_id, resolution, bucket, bets, wins, stake, delta
+                FROM game_stats WHERE resolution = ? AND bucket >= ?
+                """,
+                (resolution, bucket),
+            ):
+                rows.append(tuple(row))  # type: ignore[arg-type]
+        return rows
+
+    @_serialized
+    async def add_credits_many(self, users: Sequence[discord.abc.User], amount: int) -> int:
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero.")
+        if not users:
+            return 0
+
+        now = datetime.now(timezone.utc).isoformat()
+        # One upsert per user: new users start with the starting balance plus the
+        # grant, existing users are credited in place.
+        async with self.batch():
+            await self._executemany(
+                """
+                INSERT INTO users (user_id, display_name, balance, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    balance=balance + ?,
+                    display_name=excluded.display_name,
+                    updated_at=excluded.updated_at
+                """,
+                [(user.id, user.display_name, self.starting_balance + amount, now, now, amount) for user in users],
+            )
+        return len(users)
+
+    @_serialized
+    async def claim_daily(
+        self,
+        user: discord.abc.User,
+        amount: int,
+        *,
+        interval_seconds: float,
+    ) -> tuple[Optional[UserRecord], int]:
+        # Returns the updated record, or None when the user already claimed within
+        # the interval, and the time (ms) of their next claim.
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero.")
+
+        await self.ensure_user(user)
+        now_ms = _now_ms()
+        interval_ms = int(interval_seconds * 1000)
+        row = await self._fetchone(
+            f"""
+            UPDATE users SET balance = balance + ?, last_claim = ?, updated_at = ?
+            WHERE user_id = ? AND last_claim <= ?
+            RETURNING {_USER_COLUMNS}
+            """,
+            (amount, now_ms, datetime.now(timezone.utc).isoformat(), user.id, now_ms - interval_ms),
+        )
+        await self._commit()
+        if row is not None:
+            return _user_record(row), now_ms + interval_ms
+        row = await self._fetchone("SELECT last_claim FROM users WHERE user_id = ?", (user.id,))
+        assert row is not None
+        return None, row["last_claim"] + interval_ms
+
+    @_serialized
+    async def run_topups(self, floor: int, *, interval_seconds: float) -> int:
+        # One set-based statement and one commit for every eligible user: balances
+        # below `floor` are raised to it, at most once per interval per user.
+        now_ms = _now_ms()
+        cursor = await self._execute(
+            """
+            UPDATE users SET balance = ?, last_topup = ?, updated_at = ?
+            WHERE balance < ? AND last_topup <= ?
+            """,
+            (floor, now_ms, datetime.now(timezone.utc).isoformat(), floor, now_ms - int(interval_seconds * 1000)),
+        )
+        count = cursor.rowcount
+        await cursor.close()
+        await self._commit()
+        return count
+
+    @_serialized
     async def add_credits(self, user: discord.abc.User, amount: int) -> UserRecord:
         if amount <= 0:
             raise ValueError("Amount must be greater than zero.")
 
         await self.ensure_user(user)
-        assert self._conn is not None
         now = datetime.now(timezone.utc).isoformat()
-        async with self._conn.execute(
+        row = await self._fetchone(
             "SELECT balance FROM users WHERE user_id = ?",
             (user.id,),
-        ) as cursor:
-            row = await cursor.fetchone()
+        )
         assert row is not None
-        new_balance = int(row["balance"]) + amount
+        new_balance = Money(row["balance"]) + amount
 
-        await self._conn.execute(
+        await self._execute(
             "UPDATE users SET balance = ?, display_name = ?, updated_at = ? WHERE user_id = ?",
             (new_balance, user.display_name, now, user.id),
         )
-        await self._conn.commit()
+        await self._commit()
         record = await self.get_user(user.id)
         assert record is not None
         return record
@@ -1 +1 @@
-__all__ = ("games",)
+__all__ = ("games", "ledger", "compute", "export", "backup", "stats", "jackpot", "rewards")
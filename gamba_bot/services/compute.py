@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from gamba_bot.services import games
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ComputeBusyError(Exception):
+    pass
+
+
+def _init_worker() -> None:
+    games.warm_tables()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ComputeExecutor:
+    def __init__(self, workers: int, *, max_pending: int = 64, metrics: Optional[Metrics] = None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.metrics = metrics or Metrics(enabled=False)
+        self.metrics.add_collector(self._collect_metrics)
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._executor: Optional[Executor] = None
+
+    async def start(self) -> None:
+        if self.workers <= 0:
+            # No worker processes: keep the API but run jobs on a single thread so
+            # small deployments do not pay for extra interpreters.
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compute")
+            return
+        # Workers are spawned rather than forked: the parent already runs the
+        # aiosqlite and watchdog threads, which a fork would copy mid-flight.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+        log.info("Compute pool ready with %d workers.", len(set(pids)))
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Queued jobs are dropped; a job already running is left to finish in its
+            # worker rather than holding up shutdown.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        if self._executor is None:
+            raise RuntimeError("Compute executor is not running.")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ComputeBusyError("Too many calculations are queued; try again shortly.")
+        self.pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+        try:
+            with self.metrics.time("gamba_compute_seconds", task=func.__name__):
+                return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # A job still waiting in the queue is dropped; one already running in a
+            # worker finishes there and its result is discarded.
+            self.timeouts += 1
+            raise
+        finally:
+            self.pending -= 1
+
+    def _collect_metrics(self, metrics: Metrics) -> None:
+        metrics.set_gauge("gamba_compute_pending", self.pending)
+        metrics.set_counter("gamba_compute_rejected_total", self.rejected)
+        metrics.set_counter("gamba_compute_timeouts_total", self.timeouts)
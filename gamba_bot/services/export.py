@@ -0,0 +1,182 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+from urllib.parse import quote
+
+from gamba_bot.utils.logs import configure_logging
+
+log = logging.getLogger(__name__)
+
+EXPORT_TABLES = {
+    "users": ("user_id", "display_name", "balance", "created_at", "updated_at"),
+    "bet_history": ("id", "user_id", "ts", "game", "stake", "delta", "balance_after"),
+}
+EXPORT_FORMATS = ("csv", "jsonl")
+FETCH_ROWS = 1000
+# Encoded lines are gathered to roughly this size before each compress call.
+WRITE_CHUNK_BYTES = 64 * 1024
+
+
+class ExportError(Exception):
+    pass
+
+
+def open_readonly(database_path: str) -> sqlite3.Connection:
+    # A separate read-only connection: under WAL a reader works from its own
+    # snapshot and never takes the write lock, so the bot keeps committing while
+    # an export runs.
+    uri = f"file:{quote(os.path.abspath(database_path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only=1;")
+    return conn
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return row is not None
+
+
+def iter_rows(conn: sqlite3.Connection, table: str, *, fetch_rows: int = FETCH_ROWS) -> Iterator[tuple[Any, ...]]:
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"Unknown table {table!r}; expected one of {', '.join(EXPORT_TABLES)}.")
+    if not table_exists(conn, table):
+        raise ExportError(f"Table {table!r} does not exist in this database.")
+    columns = ", ".join(EXPORT_TABLES[table])
+    cursor = conn.execute(f"SELECT {columns} FROM {table} ORDER BY rowid")
+    try:
+        while True:
+            rows = cursor.fetchmany(fetch_rows)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def csv_lines(columns: Iterable[str], rows: Iterable[tuple[Any, ...]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def jsonl_lines(columns: Iterable[str], rows: Iterable[tuple[Any, ...]]) -> Iterator[str]:
+    names = tuple(columns)
+    for row in rows:
+        yield json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+
+
+def encode_chunks(lines: Iterable[str], *, compress: bool, chunk_bytes: int = WRITE_CHUNK_BYTES) -> Iterator[bytes]:
+    # gzip framing (wbits=31) written incrementally, so nothing larger than one
+    # chunk is ever held in memory.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            block = b"".join(pending)
+            pending.clear()
+            size = 0
+            if compressor is None:
+                yield block
+            else:
+                compressed = compressor.compress(block)
+                if compressed:
+                    yield compressed
+    block = b"".join(pending)
+    if compressor is None:
+        if block:
+            yield block
+        return
+    yield compressor.compress(block) + compressor.flush()
+
+
+def export_table(
+    database_path: str,
+    table: str,
+    out: BinaryIO,
+    *,
+    fmt: str = "csv",
+    compress: bool = True,
+) -> int:
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+    started = time.perf_counter()
+    count = 0
+
+    def counted(rows: Iterator[tuple[Any, ...]]) -> Iterator[tuple[Any, ...]]:
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    conn = open_readonly(database_path)
+    try:
+        rows = counted(iter_rows(conn, table))
+        columns = EXPORT_TABLES[table]
+        lines = csv_lines(columns, rows) if fmt == "csv" else jsonl_lines(columns, rows)
+        for chunk in encode_chunks(lines, compress=compress):
+            out.write(chunk)
+    finally:
+        conn.close()
+    log.info("Exported %d %s rows as %s in %.2fs.", count, table, fmt, time.perf_counter() - started)
+    return count
+
+
+def export_filename(table: str, fmt: str, *, compress: bool) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    return f"gamba-{table}-{stamp}.{fmt}" + (".gz" if compress else "")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Stream a table from the economy database as CSV or JSONL.")
+    parser.add_argument("table", choices=tuple(EXPORT_TABLES))
+    parser.add_argument("--database", default=os.getenv("DATABASE_PATH", "./data/gamba.db"))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--output", default="-", help="File to write, or - for stdout (default).")
+    parser.add_argument("--no-gzip", action="store_true", help="Write plain text instead of gzip.")
+    args = parser.parse_args(argv)
+    # Logs go to stderr, so exporting to stdout stays clean.
+    logs = configure_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        fmt=os.getenv("LOG_FORMAT", "text").strip().lower() or "text",
+    )
+
+    compress = not args.no_gzip
+    failure = ""
+    try:
+        if args.output == "-":
+            export_table(args.database, args.table, sys.stdout.buffer, fmt=args.format, compress=compress)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, "wb") as out:
+                export_table(args.database, args.table, out, fmt=args.format, compress=compress)
+    except (ExportError, sqlite3.Error) as exc:
+        failure = f"export failed: {exc}\n"
+    finally:
+        logs.stop()
+    if failure:
+        parser.exit(1, failure)
+
+
+if __name__ == "__main__":
+    main()
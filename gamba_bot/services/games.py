@@ -1,6 +1,7 @@
 import random
 from dataclasses import dataclass, field
-from typing import Literal
+from functools import cache
+from typing import Literal, Optional, Sequence
 
 
 @dataclass(frozen=True)
@@ -37,11 +38,46 @@ CARD_VALUES = {
 }
 
 
+@cache
+def _card_points() -> dict[str, int]:
+    return {f"{rank}{suit}": CARD_VALUES[rank] for rank in RANKS for suit in SUITS}
+
+
+@cache
+def _shoe_template(num_decks: int) -> tuple[str, ...]:
+    return tuple(f"{rank}{suit}" for _ in range(num_decks) for suit in SUITS for rank in RANKS)
+
+
+MAX_BLACKJACK_SPOTS = 4
+
+
+@dataclass(slots=True)
+class BlackjackSpot:
+    cards: list[str]
+    stake: int
+    doubled: bool = False
+    split: bool = False
+    done: bool = False
+
+
 @dataclass
 class BlackjackRound:
     deck: list[str] = field(default_factory=list)
-    player_hand: list[str] = field(default_factory=list)
     dealer_hand: list[str] = field(default_factory=list)
+    spots: list[BlackjackSpot] = field(default_factory=list)
+    active: int = 0
+
+    @property
+    def player_hand(self) -> list[str]:
+        return self.spots[self.active].cards
+
+    @property
+    def active_spot(self) -> BlackjackSpot:
+        return self.spots[self.active]
+
+    @property
+    def total_stake(self) -> int:
+        return sum(spot.stake for spot in self.spots)
 
     def draw(self) -> str:
         return self.deck.pop()
@@ -56,27 +92,69 @@ class BlackjackRound:
         self.dealer_hand.append(card)
         return card
 
-
-def create_blackjack_round(num_decks: int = 8) -> BlackjackRound:
+    def can_split(self) -> bool:
+        cards = self.active_spot.cards
+        return (
+            len(cards) == 2
+            and len(self.spots) < MAX_BLACKJACK_SPOTS
+            and CARD_VALUES[cards[0][:-1]] == CARD_VALUES[cards[1][:-1]]
+        )
+
+    def can_double(self) -> bool:
+        return len(self.active_spot.cards) == 2 and not self.active_spot.doubled
+
+    def split(self) -> BlackjackSpot:
+        spot = self.active_spot
+        new_spot = BlackjackSpot(cards=[spot.cards.pop()], stake=spot.stake, split=True)
+        spot.split = True
+        spot.cards.append(self.draw())
+        new_spot.cards.append(self.draw())
+        self.spots.insert(self.active + 1, new_spot)
+        return new_spot
+
+    def double(self) -> str:
+        spot = self.active_spot
+        spot.stake *= 2
+        spot.doubled = True
+        spot.done = True
+        return self.player_hit()
+
+    def advance(self) -> bool:
+        # Moves to the next spot still waiting for a decision; False once every
+        # spot is finished and the dealer can play.
+        for idx in range(len(self.spots)):
+            spot = self.spots[idx]
+            if not spot.done and hand_total(spot.cards) >= 21:
+                spot.done = True
+            if not spot.done:
+                self.active = idx
+                return True
+        return False
+
+
+def create_blackjack_round(num_decks: int = 8, stakes: Sequence[int] = (0,)) -> BlackjackRound:
     if num_decks < 1:
         raise ValueError("num_decks must be at least 1")
-    deck = [f"{rank}{suit}" for _ in range(num_decks) for suit in SUITS for rank in RANKS]
+    if not 1 <= len(stakes) <= MAX_BLACKJACK_SPOTS:
+        raise ValueError(f"A round needs between 1 and {MAX_BLACKJACK_SPOTS} spots.")
+    deck = list(_shoe_template(num_decks))
     random.shuffle(deck)
-    round_state = BlackjackRound(deck=deck)
-    round_state.player_hand.append(round_state.draw())
-    round_state.dealer_hand.append(round_state.draw())
-    round_state.player_hand.append(round_state.draw())
-    round_state.dealer_hand.append(round_state.draw())
+    round_state = BlackjackRound(deck=deck, spots=[BlackjackSpot(cards=[], stake=stake) for stake in stakes])
+    for _ in range(2):
+        for spot in round_state.spots:
+            spot.cards.append(round_state.draw())
+        round_state.dealer_hand.append(round_state.draw())
     return round_state
 
 
 def hand_total(cards: list[str]) -> int:
+    points = _card_points()
     total = 0
     aces = 0
     for card in cards:
-        rank = card[:-1]
-        total += CARD_VALUES[rank]
-        if rank == "A":
+        value = points[card]
+        total += value
+        if value == 11:
             aces += 1
     while total > 21 and aces > 0:
         total -= 10
@@ -92,6 +170,82 @@ def dealer_must_hit(cards: list[str]) -> bool:
     return hand_total(cards) < 14
 
 
+def spot_delta(spot: BlackjackSpot, dealer_total: int, win_multiplier: float) -> int:
+    total = hand_total(spot.cards)
+    if total > 21:
+        return -spot.stake
+    if not spot.split and is_blackjack(spot.cards):
+        return int(spot.stake * win_multiplier)
+    if dealer_total > 21 or total > dealer_total:
+        return int(spot.stake * win_multiplier)
+    if total < dealer_total:
+        return -spot.stake
+    return 0
+
+
+@dataclass(frozen=True)
+class BlackjackOdds:
+    trials: int
+    stand_win: float
+    stand_push: float
+    stand_ev: float
+    hit_ev: float
+
+
+def _dealer_final(dealer_hand: list[str], cards: list[str]) -> int:
+    while dealer_must_hit(dealer_hand):
+        dealer_hand.append(cards.pop())
+    return hand_total(dealer_hand)
+
+
+def _settle_units(player_total: int, dealer_total: int, win_multiplier: float) -> float:
+    if player_total > 21:
+        return -1.0
+    if dealer_total > 21 or player_total > dealer_total:
+        return win_multiplier
+    if player_total < dealer_total:
+        return -1.0
+    return 0.0
+
+
+def blackjack_odds(
+    player_hand: list[str],
+    dealer_upcard: str,
+    unseen: list[str],
+    *,
+    trials: int = 20_000,
+    win_multiplier: float = 1.5,
+    seed: Optional[int] = None,
+) -> BlackjackOdds:
+    # Monte Carlo over the cards the player cannot see (the shoe plus the dealer's
+    # hole card): compare standing now with taking exactly one more card.
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+    rng = random.Random(seed)
+    player_total = hand_total(player_hand)
+    draw_count = min(len(unseen), 16)
+    wins = pushes = 0
+    stand_total = hit_total = 0.0
+    for _ in range(trials):
+        cards = rng.sample(unseen, draw_count)
+        hit_card = cards.pop()
+        dealer_total = _dealer_final([dealer_upcard, cards.pop()], cards)
+        outcome = _settle_units(player_total, dealer_total, win_multiplier)
+        stand_total += outcome
+        if outcome > 0:
+            wins += 1
+        elif outcome == 0:
+            pushes += 1
+        hit_total += _settle_units(hand_total([*player_hand, hit_card]), dealer_total, win_multiplier)
+    return BlackjackOdds(
+        trials=trials,
+        stand_win=wins / trials,
+        stand_push=pushes / trials,
+        stand_ev=stand_total / trials,
+        hit_ev=hit_total / trials,
+    )
+
+
 def roulette(stake: int, pick: Literal["red", "black", "green"]) -> GameResult:
     wheel = random.randint(0, 36)
     actual = "green" if wheel == 0 else ("red" if wheel % 2 == 0 else "black")
@@ -115,36 +269,20 @@ SLOT_EMOJI = {
 }
 
 # Reel strips model weighted symbol frequencies and therefore real symbol odds.
-SLOT_REELS: tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]] = (
-    tuple(
-        ["cherry"] * 14
-        + ["lemon"] * 13
-        + ["grape"] * 9
-        + ["bell"] * 7
-        + ["bar"] * 5
-        + ["diamond"] * 3
-        + ["seven"] * 2
-    ),
-    tuple(
-        ["cherry"] * 15
-        + ["lemon"] * 12
-        + ["grape"] * 8
-        + ["bell"] * 8
-        + ["bar"] * 5
-        + ["diamond"] * 3
-        + ["seven"] * 1
-    ),
-    tuple(
-        ["cherry"] * 13
-        + ["lemon"] * 14
-        + ["grape"] * 9
-        + ["bell"] * 7
-        + ["bar"] * 5
-        + ["diamond"] * 3
-        + ["seven"] * 2
-    ),
+SLOT_REEL_WEIGHTS: tuple[tuple[tuple[str, int], ...], ...] = (
+    (("cherry", 14), ("lemon", 13), ("grape", 9), ("bell", 7), ("bar", 5), ("diamond", 3), ("seven", 2)),
+    (("cherry", 15), ("lemon", 12), ("grape", 8), ("bell", 8), ("bar", 5), ("diamond", 3), ("seven", 1)),
+    (("cherry", 13), ("lemon", 14), ("grape", 9), ("bell", 7), ("bar", 5), ("diamond", 3), ("seven", 2)),
 )
 
+
+@cache
+def slot_reels() -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    strips = tuple(
+        tuple(symbol for symbol, weight in reel for _ in range(weight)) for reel in SLOT_REEL_WEIGHTS
+    )
+    return strips[0], strips[1], strips[2]
+
 SLOT_3OAK_MULTIPLIERS = {
     "seven": 20.0,
     "diamond": 12.0,
@@ -155,6 +293,13 @@ SLOT_3OAK_MULTIPLIERS = {
     "cherry": 2.0,
 }
 
+# Three sevens on a spin with no reels held also wins the progressive jackpot.
+SLOT_JACKPOT_SYMBOL = "seven"
+
+
+def is_slot_jackpot(symbols: tuple[str, str, str], holds: list[bool]) -> bool:
+    return not any(holds) and symbols.count(SLOT_JACKPOT_SYMBOL) == 3
+
 
 def spin_slot_reels(
     current_stops: list[int] | None,
@@ -167,7 +312,7 @@ def spin_slot_reels(
 
     stops: list[int] = []
     symbols: list[str] = []
-    for idx, reel in enumerate(SLOT_REELS):
+    for idx, reel in enumerate(slot_reels()):
         if holds[idx]:
             stop = current_stops[idx] % len(reel)
         else:
@@ -207,6 +352,8 @@ def slot_paytable_lines() -> list[str]:
         lines.append(f"{emoji} {emoji} {emoji} -> {mult}x")
     lines.append("🍒 🍒 _ -> 1.2x")
     lines.append("🍒 _ _ -> 0.4x")
+    jackpot = SLOT_EMOJI[SLOT_JACKPOT_SYMBOL]
+    lines.append(f"{jackpot} {jackpot} {jackpot} with no holds -> jackpot")
     return lines
 
 
@@ -241,17 +388,30 @@ def minesweeper(stake: int, tiles: int) -> GameResult:
     return GameResult(True, int(stake * 1.2), f"Tile {tiles} was safe. Mine was {mine}.")
 
 
+WORDLINKS_WORDS = ("discord", "roulette", "casino", "balance", "blackjack")
+
+
+@cache
+def _wordlinks_dictionary() -> tuple[tuple[str, int], ...]:
+    return tuple((word, len(word)) for word in WORDLINKS_WORDS)
+
+
 def wordlinks(stake: int, guess: int) -> GameResult:
-    words = random.choice(
-        [
-            ("discord", 7),
-            ("roulette", 8),
-            ("casino", 6),
-            ("balance", 7),
-            ("blackjack", 9),
-        ]
-    )
-    word, actual = words
+    word, actual = random.choice(_wordlinks_dictionary())
     if guess == actual:
         return GameResult(True, stake * 3, f'Length of "{word}" is {actual}.')
     return GameResult(False, -stake, f'Length of "{word}" is {actual}.')
+
+
+def warm_tables() -> None:
+    _card_points()
+    _shoe_template(8)
+    slot_reels()
+    _wordlinks_dictionary()
+
+
+def __getattr__(name: str) -> object:
+    # SLOT_REELS used to be built at import time; it is now built on first use.
+    if name == "SLOT_REELS":
+        return slot_reels()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+import discord
+
+from gamba_bot.database import UserRecord
+from gamba_bot.utils.currency import Money
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class JackpotPool:
+    def __init__(
+        self,
+        name: str = "slots",
+        *,
+        contribution_bps: int,
+        seed: int,
+        metrics: Optional[Metrics] = None,
+    ):
+        if not 0 <= contribution_bps <= 10_000:
+            raise ValueError("contribution_bps must be between 0 and 10000")
+        self.name = name
+        self.contribution_bps = contribution_bps
+        self.seed = seed
+        self.metrics = metrics or Metrics(enabled=False)
+        self._db: Any = None
+        # The pool as of the last write, plus whole cents contributed since. The
+        # sub-cent remainder of each contribution is carried in basis-point units.
+        self._settled = seed
+        self._pending = 0
+        self._carry = 0
+        # Flushes and wins never interleave, so a win always sees every cent
+        # that has reached the database.
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def pool(self) -> Money:
+        return Money(self._settled + self._pending)
+
+    def contribute(self, stake: int) -> None:
+        # Hot path: integer arithmetic only; the database sees the total on flush.
+        self._carry += stake * self.contribution_bps
+        cents, self._carry = divmod(self._carry, 10_000)
+        self._pending += cents
+
+    def _publish(self) -> None:
+        self.metrics.set_gauge("gamba_jackpot_pool_cents", float(self.pool), pool=self.name)
+
+    async def start(self, db: Any, *, flush_seconds: float) -> None:
+        self._db = db
+        self._settled = int(await db.add_to_jackpot(self.name, 0, seed=self.seed))
+        self._publish()
+        log.info("Jackpot %r restored at %s.", self.name, Money(self._settled))
+        self._task = asyncio.create_task(self._run(flush_seconds))
+
+    async def _run(self, flush_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Saving jackpot contributions failed.")
+
+    async def flush(self) -> int:
+        if self._db is None:
+            return 0
+        async with self._lock:
+            amount, self._pending = self._pending, 0
+            if not amount:
+                return 0
+            try:
+                with self.metrics.time("gamba_jackpot_flush_seconds"):
+                    pool = await self._db.add_to_jackpot(self.name, amount, seed=self.seed)
+            except BaseException:
+                self._pending += amount
+                raise
+            # Contributions made while the write was in flight stay pending.
+            self._settled = int(pool)
+            self._publish()
+            return amount
+
+    async def claim(
+        self,
+        user: discord.abc.User,
+        stake: int,
+        delta: int,
+        *,
+        game: str = "",
+    ) -> tuple[UserRecord, Money]:
+        # The win is settled against the pool as stored, after adding whatever is
+        # still pending, in the same transaction as the bet; a rejected bet leaves
+        # both the pool and the pending amount untouched.
+        async with self._lock:
+            amount, self._pending = self._pending, 0
+            try:
+                record, won = await self._db.settle_jackpot_win(
+                    user,
+                    stake,
+                    delta,
+                    name=self.name,
+                    contribution=amount,
+                    seed=self.seed,
+                    game=game,
+                )
+            except BaseException:
+                self._pending += amount
+                raise
+            self._settled = self.seed
+            self.metrics.inc("gamba_jackpot_wins_total", pool=self.name)
+            self._publish()
+            log.info("Jackpot %r of %s won by %s.", self.name, won, user.id)
+            return record, won
+
+    async def close(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception:
+            log.exception("Saving jackpot contributions failed.")
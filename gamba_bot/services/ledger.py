@@ -0,0 +1,672 @@
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import signal
+import struct
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import discord
+
+from gamba_bot.database import BetEntry, BetOutcome, BetRecord, Database, InsufficientBalanceError, UserRecord
+from gamba_bot.services.backup import BackupJob
+from gamba_bot.utils.currency import Money
+from gamba_bot.utils.logs import configure_logging
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+# Frame: u32 body length, then u32 request id, u8 opcode (requests) or status
+# (replies), then a tuple of tagged values as the call arguments or result.
+_LENGTH = struct.Struct(">I")
+_HEADER = struct.Struct(">IB")
+_INT = struct.Struct(">q")
+MAX_FRAME_BYTES = 1 << 20
+
+STATUS_OK = 0
+STATUS_INSUFFICIENT = 1
+STATUS_INVALID = 2
+STATUS_ERROR = 3
+
+# Opcodes are part of the wire format: append new methods, never renumber.
+METHODS = {
+    1: "get_meta",
+    2: "set_meta",
+    3: "ensure_user",
+    4: "get_user",
+    5: "settle_bet",
+    6: "add_credits",
+    7: "settle_many",
+    8: "add_credits_many",
+    9: "bet_history",
+    10: "save_game_stats",
+    11: "load_game_stats",
+    12: "add_to_jackpot",
+    13: "settle_jackpot_win",
+    14: "claim_daily",
+    15: "run_topups",
+}
+OPCODES = {name: opcode for opcode, name in METHODS.items()}
+
+
+class LedgerProtocolError(Exception):
+    pass
+
+
+class LedgerError(Exception):
+    pass
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    if value is None:
+        out += b"n"
+    elif value is True:
+        out += b"t"
+    elif value is False:
+        out += b"f"
+    elif isinstance(value, int):
+        out += b"i"
+        out += _INT.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += b"s"
+        out += _LENGTH.pack(len(data))
+        out += data
+    elif isinstance(value, (tuple, list)):
+        out += b"l"
+        out += _LENGTH.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise LedgerProtocolError(f"Cannot encode {type(value).__name__}.")
+
+
+def _decode(data: bytes, offset: int) -> tuple[Any, int]:
+    tag = data[offset : offset + 1]
+    offset += 1
+    if tag == b"n":
+        return None, offset
+    if tag == b"t":
+        return True, offset
+    if tag == b"f":
+        return False, offset
+    if tag == b"i":
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == b"s":
+        (size,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if offset + size > len(data):
+            raise LedgerProtocolError("Truncated string.")
+        return data[offset : offset + size].decode("utf-8"), offset + size
+    if tag == b"l":
+        (count,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        items = []
+        for _ in range(count):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise LedgerProtocolError(f"Unknown tag {tag!r}.")
+
+
+def encode_frame(request_id: int, code: int, values: tuple[Any, ...]) -> bytes:
+    body = bytearray(_HEADER.pack(request_id, code))
+    _encode(values, body)
+    if len(body) > MAX_FRAME_BYTES:
+        raise LedgerProtocolError("Frame too large.")
+    return _LENGTH.pack(len(body)) + bytes(body)
+
+
+def decode_frame(body: bytes) -> tuple[int, int, tuple[Any, ...]]:
+    # Readers only expect LedgerProtocolError; a short read or bad text inside
+    # the body must not escape as anything else.
+    try:
+        request_id, code = _HEADER.unpack_from(body)
+        values, offset = _decode(body, _HEADER.size)
+    except (struct.error, UnicodeDecodeError, RecursionError) as exc:
+        raise LedgerProtocolError(f"Malformed frame: {exc}") from exc
+    if offset != len(body) or not isinstance(values, tuple):
+        raise LedgerProtocolError("Malformed frame.")
+    return request_id, code, values
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if size > MAX_FRAME_BYTES:
+        raise LedgerProtocolError("Frame too large.")
+    return await reader.readexactly(size)
+
+
+def _record_values(record: Optional[UserRecord]) -> Optional[tuple[Any, ...]]:
+    if record is None:
+        return None
+    return (record.user_id, record.display_name, int(record.balance), record.created_at, record.updated_at)
+
+
+def _record_from_values(values: Optional[tuple[Any, ...]]) -> Optional[UserRecord]:
+    if values is None:
+        return None
+    user_id, display_name, balance, created_at, updated_at = values
+    return UserRecord(
+        user_id=user_id,
+        display_name=display_name,
+        balance=Money(balance),
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+@dataclass(frozen=True)
+class LedgerUser:
+    id: int
+    display_name: str
+
+
+class _Call:
+    __slots__ = ("writer", "request_id", "opcode", "args")
+
+    def __init__(self, writer: asyncio.StreamWriter, request_id: int, opcode: int, args: tuple[Any, ...]):
+        self.writer = writer
+        self.request_id = request_id
+        self.opcode = opcode
+        self.args = args
+
+
+class LedgerServer:
+    def __init__(
+        self,
+        db: Database,
+        socket_path: str,
+        *,
+        max_batch: int = 256,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.db = db
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.metrics = metrics or Metrics(enabled=False)
+        self._queue: asyncio.Queue[_Call] = asyncio.Queue()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task[None]] = None
+        self._handlers: dict[int, Callable[..., Awaitable[tuple[Any, ...]]]] = {
+            OPCODES["get_meta"]: self._get_meta,
+            OPCODES["set_meta"]: self._set_meta,
+            OPCODES["ensure_user"]: self._ensure_user,
+            OPCODES["get_user"]: self._get_user,
+            OPCODES["settle_bet"]: self._settle_bet,
+            OPCODES["add_credits"]: self._add_credits,
+            OPCODES["settle_many"]: self._settle_many,
+            OPCODES["add_credits_many"]: self._add_credits_many,
+            OPCODES["bet_history"]: self._bet_history,
+            OPCODES["save_game_stats"]: self._save_game_stats,
+            OPCODES["load_game_stats"]: self._load_game_stats,
+            OPCODES["add_to_jackpot"]: self._add_to_jackpot,
+            OPCODES["settle_jackpot_win"]: self._settle_jackpot_win,
+            OPCODES["claim_daily"]: self._claim_daily,
+            OPCODES["run_topups"]: self._run_topups,
+        }
+
+    async def _get_meta(self, key: str) -> tuple[Any, ...]:
+        return (await self.db.get_meta(key),)
+
+    async def _set_meta(self, key: str, value: str) -> tuple[Any, ...]:
+        await self.db.set_meta(key, value)
+        return ()
+
+    async def _ensure_user(self, user_id: int, display_name: str) -> tuple[Any, ...]:
+        return (_record_values(await self.db.ensure_user(LedgerUser(user_id, display_name))),)
+
+    async def _get_user(self, user_id: int) -> tuple[Any, ...]:
+        return (_record_values(await self.db.get_user(user_id)),)
+
+    async def _settle_bet(
+        self, user_id: int, display_name: str, stake: int, delta: int, game: str = ""
+    ) -> tuple[Any, ...]:
+        # The game was appended to the call later; older clients omit it.
+        record = await self.db.settle_bet(LedgerUser(user_id, display_name), stake, delta, game=game)
+        return (_record_values(record),)
+
+    async def _add_credits(self, user_id: int, display_name: str, amount: int) -> tuple[Any, ...]:
+        record = await self.db.add_credits(LedgerUser(user_id, display_name), amount)
+        return (_record_values(record),)
+
+    async def _settle_many(self, entries: tuple[tuple[Any, ...], ...]) -> tuple[Any, ...]:
+        outcomes = await self.db.settle_many(
+            [
+                BetEntry(LedgerUser(user_id, display_name), stake, delta, game)
+                for user_id, display_name, stake, delta, game in entries
+            ]
+        )
+        return (
+            tuple((outcome.accepted, int(outcome.balance), _record_values(outcome.record)) for outcome in outcomes),
+        )
+
+    async def _add_credits_many(self, users: tuple[tuple[Any, ...], ...], amount: int) -> tuple[Any, ...]:
+        members = [LedgerUser(user_id, display_name) for user_id, display_name in users]
+        return (await self.db.add_credits_many(members, amount),)
+
+    async def _bet_history(
+        self,
+        user_id: int,
+        limit: int,
+        before: Optional[tuple[int, int]],
+        after: Optional[tuple[int, int]],
+    ) -> tuple[Any, ...]:
+        bets = await self.db.bet_history(user_id, limit=limit, before=before, after=after)
+        return (
+            tuple(
+                (bet.id, bet.user_id, bet.ts, bet.game, int(bet.stake), int(bet.delta), int(bet.balance_after))
+                for bet in bets
+            ),
+        )
+
+    async def _save_game_stats(
+        self, rows: tuple[tuple[Any, ...], ...], keep_from: tuple[tuple[Any, ...], ...]
+    ) -> tuple[Any, ...]:
+        await self.db.save_game_stats(rows, keep_from)  # type: ignore[arg-type]
+        return ()
+
+    async def _load_game_stats(self, since: tuple[tuple[Any, ...], ...]) -> tuple[Any, ...]:
+        return (tuple(await self.db.load_game_stats(since)),)  # type: ignore[arg-type]
+
+    async def _add_to_jackpot(self, name: str, amount: int, seed: int) -> tuple[Any, ...]:
+        return (int(await self.db.add_to_jackpot(name, amount, seed=seed)),)
+
+    async def _settle_jackpot_win(
+        self,
+        user_id: int,
+        display_name: str,
+        stake: int,
+        delta: int,
+        name: str,
+        contribution: int,
+        seed: int,
+        game: str,
+    ) -> tuple[Any, ...]:
+        record, won = await self.db.settle_jackpot_win(
+            LedgerUser(user_id, display_name),
+            stake,
+            delta,
+            name=name,
+            contribution=contribution,
+            seed=seed,
+            game=game,
+        )
+        return (_record_values(record), int(won))
+
+    # Intervals travel as integer milliseconds; the protocol has no float type.
+    async def _claim_daily(self, user_id: int, display_name: str, amount: int, interval_ms: int) -> tuple[Any, ...]:
+        record, next_claim_ms = await self.db.claim_daily(
+            LedgerUser(user_id, display_name),
+            amount,
+            interval_seconds=interval_ms / 1000,
+        )
+        return (_record_values(record), next_claim_ms)
+
+    async def _run_topups(self, floor: int, interval_ms: int) -> tuple[Any, ...]:
+        return (await self.db.run_topups(floor, interval_seconds=interval_ms / 1000),)
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        log.info("Ledger listening on %s", self.socket_path)
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # Let calls that were already received commit and get their replies.
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=5.0)
+        except asyncio.TimeoutError:
+            log.warning("Ledger closed with %d calls still queued.", self._queue.qsize())
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_id, opcode, args = decode_frame(await read_frame(reader))
+                self._queue.put_nowait(_Call(writer, request_id, opcode, args))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except LedgerProtocolError:
+            log.warning("Dropping ledger client after a malformed frame.")
+        finally:
+            writer.close()
+
+    async def _apply(self, call: _Call) -> tuple[int, tuple[Any, ...]]:
+        handler = self._handlers.get(call.opcode)
+        if handler is None:
+            return STATUS_ERROR, (f"Unknown ledger method {call.opcode}.",)
+        try:
+            # Each call is a savepoint inside the batch's transaction, so a call
+            # that fails is undone on its own and its neighbours still commit.
+            async with self.db.batch():
+                return STATUS_OK, await handler(*call.args)
+        except InsufficientBalanceError as exc:
+            return STATUS_INSUFFICIENT, (str(exc),)
+        except (TypeError, ValueError) as exc:
+            return STATUS_INVALID, (str(exc),)
+        except Exception as exc:
+            log.exception("Ledger call %s failed.", METHODS[call.opcode])
+            return STATUS_ERROR, (str(exc),)
+
+    async def _run_batches(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # Every call that queued up while the previous batch was committing
+            # shares the next transaction; replies go out only after the commit.
+            with self.metrics.time("gamba_ledger_batch_seconds"):
+                try:
+                    async with self.db.batch():
+                        results = [await self._apply(call) for call in batch]
+                except Exception as exc:
+                    log.exception("Ledger batch of %d calls failed.", len(batch))
+                    results = [(STATUS_ERROR, (str(exc),))] * len(batch)
+            self.metrics.inc("gamba_ledger_calls_total", len(batch))
+            self.metrics.inc("gamba_ledger_batches_total")
+            writers = set()
+            for call, (status, values) in zip(batch, results):
+                if call.writer.is_closing():
+                    continue
+                call.writer.write(encode_frame(call.request_id, status, values))
+                writers.add(call.writer)
+            for writer in writers:
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    writer.close()
+            for _ in batch:
+                self._queue.task_done()
+
+
+class LedgerClient:
+    def __init__(self, socket_path: str, *, metrics: Optional[Metrics] = None):
+        self.socket_path = socket_path
+        self.metrics = metrics or Metrics(enabled=False)
+        self._reader_task: Optional[asyncio.Task[None]] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: dict[int, asyncio.Future[tuple[int, tuple[Any, ...]]]] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        await self._connect()
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+                self._reader_task = asyncio.create_task(self._read_replies(reader))
+            return self._writer
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                request_id, status, values = decode_frame(await read_frame(reader))
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, values))
+        except (asyncio.IncompleteReadError, ConnectionError, LedgerProtocolError) as exc:
+            log.warning("Ledger connection lost: %s", exc)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Ledger connection lost."))
+
+    async def _call(self, method: str, *args: Any) -> tuple[Any, ...]:
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            writer = await self._connect()
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future: asyncio.Future[tuple[int, tuple[Any, ...]]] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        # Requests are written without waiting for earlier replies; the id matches
+        # each reply back to its caller.
+        with self.metrics.time("gamba_ledger_call_seconds", method=method):
+            try:
+                writer.write(encode_frame(request_id, OPCODES[method], args))
+                await writer.drain()
+                status, values = await future
+            finally:
+                self._pending.pop(request_id, None)
+        if status == STATUS_OK:
+            return values
+        message = values[0] if values else ""
+        if status == STATUS_INSUFFICIENT:
+            raise InsufficientBalanceError(message)
+        if status == STATUS_INVALID:
+            raise ValueError(message)
+        raise LedgerError(message)
+
+    async def checkpoint(self) -> None:
+        # The ledger service owns the database file and checkpoints it when it stops.
+        return None
+
+    async def get_meta(self, key: str) -> Optional[str]:
+        return (await self._call("get_meta", key))[0]
+
+    async def set_meta(self, key: str, value: str) -> None:
+        await self._call("set_meta", key, value)
+
+    async def ensure_user(self, user: discord.abc.User) -> UserRecord:
+        record = _record_from_values((await self._call("ensure_user", user.id, user.display_name))[0])
+        assert record is not None
+        return record
+
+    async def get_user(self, user_id: int) -> Optional[UserRecord]:
+        return _record_from_values((await self._call("get_user", user_id))[0])
+
+    async def settle_bet(self, user: discord.abc.User, stake: int, delta: int, *, game: str = "") -> UserRecord:
+        values = await self._call("settle_bet", user.id, user.display_name, int(stake), int(delta), game)
+        record = _record_from_values(values[0])
+        assert record is not None
+        return record
+
+    async def add_credits(self, user: discord.abc.User, amount: int) -> UserRecord:
+        values = await self._call("add_credits", user.id, user.display_name, int(amount))
+        record = _record_from_values(values[0])
+        assert record is not None
+        return record
+
+    async def settle_many(self, entries: Sequence[BetEntry]) -> list[BetOutcome]:
+        if not entries:
+            return []
+        args = tuple(
+            (entry.user.id, entry.user.display_name, int(entry.stake), int(entry.delta), entry.game)
+            for entry in entries
+        )
+        (results,) = await self._call("settle_many", args)
+        outcomes = []
+        for entry, (accepted, balance, values) in zip(entries, results):
+            record = _record_from_values(values)
+            assert record is not None
+            outcomes.append(BetOutcome(entry=entry, accepted=accepted, balance=Money(balance), record=record))
+        return outcomes
+
+    async def add_credits_many(self, users: Sequence[discord.abc.User], amount: int) -> int:
+        if not users:
+            return 0
+        args = tuple((user.id, user.display_name) for user in users)
+        return (await self._call("add_credits_many", args, int(amount)))[0]
+
+    async def bet_history(
+        self,
+        user_id: int,
+        *,
+        limit: int,
+        before: Optional[tuple[int, int]] = None,
+        after: Optional[tuple[int, int]] = None,
+    ) -> list[BetRecord]:
+        (rows,) = await self._call("bet_history", user_id, limit, before, after)
+        return [
+            BetRecord(
+                id=bet_id,
+                user_id=owner,
+                ts=ts,
+                game=game,
+                stake=Money(stake),
+                delta=Money(delta),
+                balance_after=Money(balance_after),
+            )
+            for bet_id, owner, ts, game, stake, delta, balance_after in rows
+        ]
+
+    async def save_game_stats(
+        self,
+        rows: Sequence[tuple[str, int, str, int, int, int, int, int]],
+        keep_from: Sequence[tuple[str, int]],
+    ) -> None:
+        await self._call("save_game_stats", tuple(rows), tuple(keep_from))
+
+    async def load_game_stats(
+        self,
+        since: Sequence[tuple[str, int]],
+    ) -> list[tuple[str, int, str, int, int, int, int, int]]:
+        return list((await self._call("load_game_stats", tuple(since)))[0])
+
+    async def add_to_jackpot(self, name: str, amount: int, *, seed: int) -> Money:
+        return Money((await self._call("add_to_jackpot", name, int(amount), int(seed)))[0])
+
+    async def settle_jackpot_win(
+        self,
+        user: discord.abc.User,
+        stake: int,
+        delta: int,
+        *,
+        name: str,
+        contribution: int,
+        seed: int,
+        game: str = "",
+    ) -> tuple[UserRecord, Money]:
+        values, won = await self._call(
+            "settle_jackpot_win",
+            user.id,
+            user.display_name,
+            int(stake),
+            int(delta),
+            name,
+            int(contribution),
+            int(seed),
+            game,
+        )
+        record = _record_from_values(values)
+        assert record is not None
+        return record, Money(won)
+
+    async def claim_daily(
+        self,
+        user: discord.abc.User,
+        amount: int,
+        *,
+        interval_seconds: float,
+    ) -> tuple[Optional[UserRecord], int]:
+        values, next_claim_ms = await self._call(
+            "claim_daily", user.id, user.display_name, int(amount), int(interval_seconds * 1000)
+        )
+        return _record_from_values(values), next_claim_ms
+
+    async def run_topups(self, floor: int, *, interval_seconds: float) -> int:
+        return (await self._call("run_topups", int(floor), int(interval_seconds * 1000)))[0]
+
+
+async def serve(
+    socket_path: str,
+    database_path: str,
+    starting_balance: int,
+    *,
+    backups: Optional[BackupJob] = None,
+) -> None:
+    db = Database(database_path, starting_balance)
+    await db.initialize()
+    server = LedgerServer(db, socket_path)
+    await server.start()
+    if backups is not None:
+        backups.start()
+    serving = asyncio.current_task()
+    assert serving is not None
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+    except NotImplementedError:
+        pass
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        log.info("Ledger stopping.")
+    finally:
+        await server.close()
+        if backups is not None:
+            # A running backup pins a WAL snapshot, so stop it before checkpointing.
+            await backups.stop()
+        await db.checkpoint()
+        await db.close()
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run the ledger service that owns the economy database.")
+    parser.add_argument("--socket", default=os.getenv("LEDGER_SOCKET", "./data/ledger.sock"))
+    parser.add_argument("--database", default=os.getenv("DATABASE_PATH", "./data/gamba.db"))
+    parser.add_argument("--starting-balance", type=int, default=int(os.getenv("STARTING_BALANCE", "100000")))
+    parser.add_argument("--backup-dir", default=os.getenv("BACKUP_DIR", "").strip())
+    args = parser.parse_args()
+    logs = configure_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        fmt=os.getenv("LOG_FORMAT", "text").strip().lower() or "text",
+    )
+    backups = None
+    if args.backup_dir:
+        backups = BackupJob(
+            args.database,
+            args.backup_dir,
+            interval_seconds=float(os.getenv("BACKUP_INTERVAL_MINUTES", "60")) * 60,
+            retention=int(os.getenv("BACKUP_RETENTION", "24")),
+            pages_per_step=int(os.getenv("BACKUP_PAGES_PER_STEP", "256")),
+            step_sleep_seconds=float(os.getenv("BACKUP_STEP_SLEEP_MS", "5")) / 1000,
+        )
+    try:
+        asyncio.run(serve(args.socket, args.database, args.starting_balance, backups=backups))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logs.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from gamba_bot.utils.currency import Money
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class TopupJob:
+    def __init__(
+        self,
+        *,
+        floor: int,
+        interval_seconds: float,
+        metrics: Optional[Metrics] = None,
+    ):
+        if floor <= 0:
+            raise ValueError("floor must be greater than zero")
+        self.floor = floor
+        self.interval_seconds = interval_seconds
+        self.metrics = metrics or Metrics(enabled=False)
+        self._db: Any = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self, db: Any) -> None:
+        if self._task is None:
+            self._db = db
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        # Each user's last_topup is stored, so running straight after a restart
+        # cannot top anyone up twice within an interval.
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.metrics.inc("gamba_topup_failures_total")
+                log.exception("Balance top-up run failed.")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> int:
+        started = time.perf_counter()
+        count = await self._db.run_topups(self.floor, interval_seconds=self.interval_seconds)
+        elapsed = time.perf_counter() - started
+        self.metrics.observe("gamba_topup_seconds", elapsed)
+        self.metrics.inc("gamba_topup_users_total", count)
+        if count:
+            log.info("Topped up %d balances to %s in %.3fs.", count, Money(self.floor), elapsed)
+        return count
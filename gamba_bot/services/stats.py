@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+# (name, bucket width in seconds, buckets kept): the last hour by minute, the last
+# day by hour and the last 30 days by day.
+RESOLUTIONS = (("1m", 60, 60), ("1h", 3600, 24), ("1d", 86_400, 30))
+RESOLUTION_NAMES = tuple(name for name, _, _ in RESOLUTIONS)
+
+# Counters per bucket: bets, wins, total stake, total player delta.
+_FIELDS = 4
+
+StatRow = tuple[str, int, str, int, int, int, int, int]
+
+
+@dataclass(frozen=True)
+class StatTotals:
+    bets: int = 0
+    wins: int = 0
+    stake: int = 0
+    delta: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.wins / self.bets if self.bets else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        # Share of the stake the house kept; negative when players are ahead.
+        return -self.delta / self.stake if self.stake else 0.0
+
+    def __add__(self, other: "StatTotals") -> "StatTotals":
+        return StatTotals(
+            self.bets + other.bets,
+            self.wins + other.wins,
+            self.stake + other.stake,
+            self.delta + other.delta,
+        )
+
+
+class _Ring:
+    __slots__ = ("width", "size", "buckets", "counters", "unflushed", "dirty", "spilled")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        # The bucket number (time // width) each slot currently holds; a slot whose
+        # bucket has fallen out of the window is reset on its next write.
+        self.buckets = array("q", [-1]) * size
+        self.counters = array("q", [0]) * (size * _FIELDS)
+        # What each slot has gained since the last flush. Other processes write to
+        # the same rows, so only these increments are saved, never the totals.
+        self.unflushed = array("q", [0]) * (size * _FIELDS)
+        self.dirty: set[int] = set()
+        # Increments of a bucket whose slot was reused before they were flushed.
+        self.spilled: list[tuple[int, int, int, int, int]] = []
+
+    def add(self, bucket: int, won: int, stake: int, delta: int) -> None:
+        slot = bucket % self.size
+        base = slot * _FIELDS
+        counters = self.counters
+        unflushed = self.unflushed
+        held = self.buckets[slot]
+        if held != bucket:
+            if held > bucket:
+                # Late write for a bucket this slot has already moved past.
+                return
+            if slot in self.dirty:
+                self.spilled.append((held, *unflushed[base : base + _FIELDS]))
+            self.buckets[slot] = bucket
+            counters[base] = counters[base + 1] = counters[base + 2] = counters[base + 3] = 0
+            unflushed[base] = unflushed[base + 1] = unflushed[base + 2] = unflushed[base + 3] = 0
+        counters[base] += 1
+        counters[base + 1] += won
+        counters[base + 2] += stake
+        counters[base + 3] += delta
+        unflushed[base] += 1
+        unflushed[base + 1] += won
+        unflushed[base + 2] += stake
+        unflushed[base + 3] += delta
+        self.dirty.add(slot)
+
+    def set(self, bucket: int, values: Iterable[int]) -> None:
+        slot = bucket % self.size
+        if self.buckets[slot] > bucket:
+            return
+        self.buckets[slot] = bucket
+        self.counters[slot * _FIELDS : (slot + 1) * _FIELDS] = array("q", values)
+
+    def totals(self, current: int) -> StatTotals:
+        bets = wins = stake = delta = 0
+        oldest = current - self.size
+        counters = self.counters
+        for slot, bucket in enumerate(self.buckets):
+            if oldest < bucket <= current:
+                base = slot * _FIELDS
+                bets += counters[base]
+                wins += counters[base + 1]
+                stake += counters[base + 2]
+                delta += counters[base + 3]
+        return StatTotals(bets, wins, stake, delta)
+
+    def take_dirty(self) -> list[tuple[int, int, int, int, int]]:
+        rows, self.spilled = self.spilled, []
+        unflushed = self.unflushed
+        for slot in sorted(self.dirty):
+            base = slot * _FIELDS
+            rows.append((self.buckets[slot], *unflushed[base : base + _FIELDS]))
+            unflushed[base] = unflushed[base + 1] = unflushed[base + 2] = unflushed[base + 3] = 0
+        self.dirty.clear()
+        return rows
+
+
+class GameStats:
+    def __init__(self, *, metrics: Optional[Metrics] = None):
+        self.metrics = metrics or Metrics(enabled=False)
+        self._series: dict[tuple[str, int], tuple[_Ring, ...]] = {}
+        self._db: Any = None
+        # Increments from a flush that failed, added to the next one.
+        self._unsaved: dict[tuple[str, int, str, int], StatRow] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def _rings(self, game: str, guild_id: int) -> tuple[_Ring, ...]:
+        rings = self._series.get((game, guild_id))
+        if rings is None:
+            rings = tuple(_Ring(width, size) for _, width, size in RESOLUTIONS)
+            self._series[(game, guild_id)] = rings
+        return rings
+
+    def record(
+        self,
+        game: str,
+        guild_id: Optional[int],
+        stake: int,
+        delta: int,
+        *,
+        now: Optional[float] = None,
+    ) -> None:
+        # Hot path: a dict lookup and three in-place array updates per bet.
+        seconds = int(time.time() if now is None else now)
+        won = 1 if delta > 0 else 0
+        for ring in self._rings(game, guild_id or 0):
+            ring.add(seconds // ring.width, won, stake, delta)
+
+    def totals(
+        self,
+        resolution: str,
+        *,
+        guild_id: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> dict[str, StatTotals]:
+        index = RESOLUTION_NAMES.index(resolution)
+        seconds = int(time.time() if now is None else now)
+        by_game: dict[str, StatTotals] = {}
+        for (game, guild), rings in self._series.items():
+            if guild_id is not None and guild != guild_id:
+                continue
+            ring = rings[index]
+            by_game[game] = by_game.get(game, StatTotals()) + ring.totals(seconds // ring.width)
+        return by_game
+
+    def take_dirty(self) -> list[StatRow]:
+        rows: list[StatRow] = []
+        for (game, guild_id), rings in self._series.items():
+            for (name, _, _), ring in zip(RESOLUTIONS, rings):
+                for bucket, bets, wins, stake, delta in ring.take_dirty():
+                    rows.append((game, guild_id, name, bucket, bets, wins, stake, delta))
+        return rows
+
+    def restore(self, rows: Iterable[StatRow]) -> None:
+        for game, guild_id, name, bucket, bets, wins, stake, delta in rows:
+            if name not in RESOLUTION_NAMES:
+                continue
+            self._rings(game, guild_id)[RESOLUTION_NAMES.index(name)].set(bucket, (bets, wins, stake, delta))
+
+    @staticmethod
+    def oldest_buckets(now: Optional[float] = None) -> tuple[tuple[str, int], ...]:
+        seconds = int(time.time() if now is None else now)
+        return tuple((name, seconds // width - size + 1) for name, width, size in RESOLUTIONS)
+
+    async def start(self, db: Any, *, flush_seconds: float) -> None:
+        self._db = db
+        rows = await db.load_game_stats(self.oldest_buckets())
+        self.restore(rows)
+        log.info("Restored %d game stat buckets.", len(rows))
+        self._task = asyncio.create_task(self._run(flush_seconds))
+
+    async def _run(self, flush_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Saving game stats failed.")
+
+    async def flush(self) -> int:
+        # Every bucket touched since the last flush goes out in one batched upsert;
+        # buckets that have left their window are pruned in the same transaction.
+        if self._db is None:
+            return 0
+        for row in self.take_dirty():
+            key = row[:4]
+            earlier = self._unsaved.get(key)
+            if earlier is not None:
+                row = (*key, *(a + b for a, b in zip(earlier[4:], row[4:])))  # type: ignore[assignment]
+            self._unsaved[key] = row
+        if not self._unsaved:
+            return 0
+        rows = list(self._unsaved.values())
+        with self.metrics.time("gamba_stats_flush_seconds"):
+            await self._db.save_game_stats(rows, self.oldest_buckets())
+        for row in rows:
+            if self._unsaved.get(row[:4]) is row:
+                del self._unsaved[row[:4]]
+        return len(rows)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception:
+            log.exception("Saving game stats failed.")
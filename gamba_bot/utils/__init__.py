@@ -1 +1 @@
-__all__ = ("respond", "currency")
+__all__ = ("respond", "currency", "bounded", "render", "metrics", "timing", "sessions", "loop", "logs")
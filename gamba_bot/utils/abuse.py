@@ -0,0 +1,165 @@
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+from gamba_bot.utils.bounded import BoundedStateMap
+from gamba_bot.utils.metrics import Metrics
+
+# Inter-click gaps are histogrammed in 1/8-octave buckets from 32ms up to ~32s.
+# Longer gaps are not scored at all: a slow player is no load, and lumping every
+# long pause into one bucket would make casual play look machine-regular.
+_BUCKETS_PER_OCTAVE = 8
+_MIN_GAP_LOG2 = 5
+_GAP_BUCKETS = 10 * _BUCKETS_PER_OCTAVE
+
+
+def _gap_bucket(gap_seconds: float) -> Optional[int]:
+    ms = gap_seconds * 1000
+    if ms < 2**_MIN_GAP_LOG2:
+        return 0
+    index = int((math.log2(ms) - _MIN_GAP_LOG2) * _BUCKETS_PER_OCTAVE)
+    return index if index < _GAP_BUCKETS else None
+
+
+@dataclass(frozen=True)
+class Verdict:
+    allowed: bool
+    retry_after: float = 0.0
+    reason: str = ""
+
+
+ALLOWED = Verdict(True)
+
+
+class _Activity:
+    __slots__ = ("times", "head", "last", "gaps", "samples", "strikes", "cooldown_until", "blocked_until")
+
+    def __init__(self, max_actions: int) -> None:
+        # The last max_actions timestamps, oldest at `head`: the window check is one
+        # comparison against the action max_actions ago.
+        self.times = array("d", [-math.inf]) * max_actions
+        self.head = 0
+        self.last = -math.inf
+        self.gaps = array("H", [0]) * _GAP_BUCKETS
+        self.samples = 0
+        self.strikes = 0
+        self.cooldown_until = 0.0
+        self.blocked_until = 0.0
+
+
+class AbuseDetector:
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 10.0,
+        max_actions: int = 20,
+        cooldown_seconds: float = 15.0,
+        strikes_to_block: int = 3,
+        block_seconds: float = 600.0,
+        rhythm_samples: int = 30,
+        rhythm_share: float = 0.9,
+        max_tracked: int = 50_000,
+        idle_ttl_seconds: float = 900.0,
+        metrics: Optional[Metrics] = None,
+    ):
+        if max_actions < 1:
+            raise ValueError("max_actions must be at least 1")
+        self.window_seconds = window_seconds
+        self.max_actions = max_actions
+        self.cooldown_seconds = cooldown_seconds
+        self.strikes_to_block = strikes_to_block
+        self.block_seconds = block_seconds
+        self.rhythm_samples = rhythm_samples
+        self.rhythm_share = rhythm_share
+        self.metrics = metrics or Metrics(enabled=False)
+        self.metrics.add_collector(self._collect_metrics)
+        # A blocked user is never evicted, so restarting a script from a fresh
+        # entry is not a way out of a block. Eviction runs inside check(), so it is
+        # judged by the same clock as the check.
+        self._now = 0.0
+        self._users: BoundedStateMap[int, _Activity] = BoundedStateMap(
+            lambda: _Activity(max_actions),
+            max_entries=max_tracked,
+            ttl_seconds=idle_ttl_seconds,
+            can_evict=self._activity_idle,
+        )
+
+    def check(self, user_id: int, action: str, *, now: Optional[float] = None) -> Verdict:
+        # Runs before the handler does any I/O. Refused requests are not counted,
+        # so a cooldown ends on schedule however hard the user keeps clicking.
+        if now is None:
+            now = time.monotonic()
+        self._now = now
+        activity = self._users.get(user_id, now)
+        if activity.blocked_until > now:
+            return self._refuse(action, activity.blocked_until - now, "blocked")
+        if activity.cooldown_until > now:
+            return self._refuse(action, activity.cooldown_until - now, "cooldown")
+
+        if now - activity.times[activity.head] < self.window_seconds:
+            return self._strike(activity, action, now, "rate")
+        activity.times[activity.head] = now
+        activity.head = (activity.head + 1) % self.max_actions
+
+        if self.rhythm_samples and activity.last > -math.inf and self._machine_rhythm(activity, now - activity.last):
+            activity.last = now
+            return self._strike(activity, action, now, "rhythm")
+        activity.last = now
+        return ALLOWED
+
+    def _activity_idle(self, activity: _Activity) -> bool:
+        return activity.blocked_until <= self._now
+
+    def _strike(self, activity: _Activity, action: str, now: float, cause: str) -> Verdict:
+        # Every offence starts with a cooldown, so one steady stretch of clicking
+        # is never a block on its own.
+        if now - activity.cooldown_until > self.block_seconds:
+            # Strikes only add up to a block while cooldowns keep recurring.
+            activity.strikes = 0
+        activity.strikes += 1
+        if activity.strikes >= self.strikes_to_block:
+            return self._block(activity, action, now, cause)
+        activity.cooldown_until = now + self.cooldown_seconds
+        return self._refuse(action, self.cooldown_seconds, cause)
+
+    def _machine_rhythm(self, activity: _Activity, gap: float) -> bool:
+        bucket = _gap_bucket(gap)
+        if bucket is None:
+            return False
+        gaps = activity.gaps
+        gaps[bucket] += 1
+        activity.samples += 1
+        if activity.samples < self.rhythm_samples:
+            return False
+        # Score the histogram, then halve it so it keeps tracking recent play.
+        peak = max(range(_GAP_BUCKETS), key=gaps.__getitem__)
+        neighbour = max(gaps[peak - 1] if peak else 0, gaps[peak + 1] if peak + 1 < _GAP_BUCKETS else 0)
+        regular = gaps[peak] + neighbour >= self.rhythm_share * activity.samples
+        for idx in range(_GAP_BUCKETS):
+            gaps[idx] //= 2
+        activity.samples = sum(gaps)
+        return regular
+
+    def _block(self, activity: _Activity, action: str, now: float, cause: str) -> Verdict:
+        activity.blocked_until = now + self.block_seconds
+        activity.strikes = 0
+        self.metrics.inc("gamba_abuse_blocks_total", cause=cause)
+        return self._refuse(action, self.block_seconds, "blocked")
+
+    def _refuse(self, action: str, retry_after: float, reason: str) -> Verdict:
+        self.metrics.inc("gamba_abuse_refused_total", action=action, reason=reason)
+        return Verdict(False, retry_after, reason)
+
+    def _collect_metrics(self, metrics: Metrics) -> None:
+        metrics.set_gauge("gamba_abuse_tracked_users", len(self._users))
+
+
+def refusal_text(verdict: Verdict) -> str:
+    wait = max(1, math.ceil(verdict.retry_after))
+    if verdict.reason == "blocked":
+        return f"Too many requests; you are blocked from games for {wait}s."
+    if verdict.reason == "rhythm":
+        return f"Your clicks are too regular to look like a person. Try again in {wait}s."
+    return f"Slow down: you are playing too fast. Try again in {wait}s."
@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Entry(Generic[V]):
+    __slots__ = ("value", "touched")
+
+    def __init__(self, value: V, touched: float):
+        self.value = value
+        self.touched = touched
+
+
+class BoundedStateMap(Generic[K, V]):
+    def __init__(
+        self,
+        factory: Callable[[], V],
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        can_evict: Optional[Callable[[V], bool]] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.factory = factory
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.can_evict = can_evict
+        self.evictions = 0
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        for key, entry in self._entries.items():
+            yield key, entry.value
+
+    def peek(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        return None if entry is None else entry.value
+
+    def get(self, key: K, now: Optional[float] = None) -> V:
+        if now is None:
+            now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.touched = now
+            self._entries.move_to_end(key)
+            return entry.value
+
+        value = self.factory()
+        self._entries[key] = _Entry(value, now)
+        # The caller is about to use the new entry, so it is never the one to go,
+        # even when every older entry is pinned and the map runs over capacity.
+        self._evict(now, keep=key)
+        return value
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry.value
+
+    def prune(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.monotonic()
+        return self._evict(now)
+
+    def _evict(self, now: float, *, keep: Optional[K] = None) -> int:
+        evicted = 0
+        skipped = 0
+        entries = self._entries
+        while entries and skipped < len(entries):
+            key, entry = next(iter(entries.items()))
+            if len(entries) <= self.max_entries and now - entry.touched < self.ttl_seconds:
+                break
+            if key == keep or (self.can_evict is not None and not self.can_evict(entry.value)):
+                # Still in use (e.g. a held lock): treat it as fresh and look further on.
+                entries.move_to_end(key)
+                skipped += 1
+                continue
+            del entries[key]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
@@ -1,13 +1,129 @@
+import math
+import re
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
 
+_SHORT_UNITS = (
+    (100_000_000_000_000, "T"),
+    (100_000_000_000, "B"),
+    (100_000_000, "M"),
+    (100_000, "k"),
+)
+_CENT_SUFFIXES = tuple(f".{rem:02d}" for rem in range(100))
+# Half-cent ties are resolved arithmetically while 2 * cents + 1 is still an exact
+# double; larger amounts go through Decimal.
+_EXACT_TIE_LIMIT = 2**51
+# An optional fill and alignment, then a width; a leading 0 is numeric padding.
+_TEXT_SPEC = re.compile(r"(?:.?[<>^])?(?:[1-9]\d*)?")
 
-def parse_credits_to_cents(amount: float) -> int:
-    value = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    cents = int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
-    if cents <= 0:
-        raise ValueError("Stake must be greater than zero.")
-    return cents
 
+def _credits_to_cents(amount: Union[int, float]) -> int:
+    if isinstance(amount, int):
+        return amount * 100
+    scaled = amount * 100
+    nearest = round(scaled)
+    # Away from a half-cent the float product already rounds the right way; only
+    # near-ties fall back to the shortest decimal text, which is what Decimal(str())
+    # would have rounded half-up.
+    if abs(abs(scaled - nearest) - 0.5) > 1e-9 * max(1.0, abs(scaled)):
+        return int(nearest)
+    magnitude = abs(scaled)
+    if magnitude < _EXACT_TIE_LIMIT:
+        # Near a tie, Decimal(str(x)) rounds on the shortest repr of x, which lies
+        # on the same side of the exact half-cent as x itself. The nearest double to
+        # that half-cent is one exact division away, so no text is needed.
+        floor = math.floor(magnitude)
+        cents = floor + 1 if abs(amount) >= (2 * floor + 1) / 200 else floor
+        return -cents if amount < 0 else cents
+    value = Decimal(repr(float(amount))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _grouped(cents: int) -> str:
+    if cents < 0:
+        return "-" + _grouped(-cents)
+    if cents < 100_000:
+        # Below 1,000 credits there is no separator to insert.
+        return str(cents // 100) + _CENT_SUFFIXES[cents % 100]
+    units, rem = divmod(cents, 100)
+    return f"{units:,}{_CENT_SUFFIXES[rem]}"
+
+
+def format_cents(cents: int, *, grouping: bool = False) -> str:
+    if grouping:
+        return _grouped(cents)
+    if cents < 0:
+        return "-" + format_cents(-cents)
+    return str(cents // 100) + _CENT_SUFFIXES[cents % 100]
+
+
+class Money(int):
+    __slots__ = ()
+
+    @classmethod
+    def from_credits(cls, amount: Union[int, float]) -> "Money":
+        return cls(_credits_to_cents(amount))
+
+    @property
+    def cents(self) -> int:
+        return int(self)
+
+    def short(self) -> str:
+        cents = int(self)
+        magnitude = -cents if cents < 0 else cents
+        sign = "-" if cents < 0 else ""
+        for scale, suffix in _SHORT_UNITS:
+            if magnitude >= scale:
+                whole, tenth = divmod(magnitude * 10 // scale, 10)
+                if tenth:
+                    return f"{sign}{whole}.{tenth}{suffix}"
+                return f"{sign}{whole}{suffix}"
+        return format_cents(cents)
+
+    def __repr__(self) -> str:
+        return f"Money({int(self)})"
 
-def format_cents(cents: int) -> str:
-    return f"{(Decimal(cents) / Decimal(100)):.2f}"
+    # Bound straight to the formatter: divmod and comparisons on a Money are plain
+    # int operations, so there is no need for an int() copy or a second call.
+    __str__ = _grouped
+
+    def __format__(self, spec: str) -> str:
+        if not spec:
+            return _grouped(self)
+        if spec == "short":
+            return self.short()
+        if spec == "plain":
+            return format_cents(int(self))
+        if _TEXT_SPEC.fullmatch(spec):
+            # Fill, align and width lay out the credits text...
+            return format(_grouped(self), spec)
+        # ...anything numeric (d, x, ",", ".2f", sign or zero padding) formats
+        # the cents like any other int.
+        return int.__format__(self, spec)
+
+    def __add__(self, other: object) -> "Money":
+        result = int.__add__(self, other)  # type: ignore[operator]
+        return result if result is NotImplemented else Money(result)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: object) -> "Money":
+        result = int.__sub__(self, other)  # type: ignore[operator]
+        return result if result is NotImplemented else Money(result)
+
+    def __rsub__(self, other: object) -> "Money":
+        result = int.__rsub__(self, other)  # type: ignore[operator]
+        return result if result is NotImplemented else Money(result)
+
+    def __neg__(self) -> "Money":
+        return Money(-int(self))
+
+    def __abs__(self) -> "Money":
+        return Money(abs(int(self)))
+
+
+def parse_credits_to_cents(amount: float) -> Money:
+    cents = _credits_to_cents(amount)
+    if cents <= 0:
+        raise ValueError("Stake must be greater than zero.")
+    return Money(cents)
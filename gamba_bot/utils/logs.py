@@ -0,0 +1,141 @@
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterable, Optional
+
+from gamba_bot.utils.metrics import Metrics
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+LOG_FORMATS = ("text", "json")
+
+_RECORD_FIELDS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                payload[key] = value
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: Iterable[tuple[str, float]]):
+        super().__init__()
+        # Longest prefix wins, so "discord.gateway" can be sampled harder than "discord".
+        self.rates = sorted(rates, key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+        self._seen: dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> Optional[tuple[str, float]]:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return prefix, rate
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        match = self._rate_for(record.name)
+        if match is None:
+            return True
+        prefix, rate = match
+        # Deterministic 1-in-N sampling: accumulate the rate and emit whenever it
+        # crosses a whole record.
+        credit = self._seen.get(prefix, 0.0) + rate
+        if credit >= 1.0 - 1e-9:
+            self._seen[prefix] = credit - 1.0
+            return True
+        self._seen[prefix] = credit
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback on the calling thread (the arguments may
+        # not be safe to touch later), but leave formatting to the listener.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for room instead of failing.
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    def __init__(self, handler: DroppingQueueHandler, listener: _Listener, sampler: SamplingFilter):
+        self.handler = handler
+        self.listener = listener
+        self.sampler = sampler
+
+    def collect_metrics(self, metrics: Metrics) -> None:
+        metrics.set_counter("gamba_log_dropped_total", self.handler.dropped)
+        metrics.set_counter("gamba_log_sampled_out_total", self.sampler.sampled_out)
+        metrics.set_gauge("gamba_log_queue_depth", self.handler.queue.qsize())
+
+    def stop(self) -> None:
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        self.listener.stop()
+
+
+def configure_logging(
+    *,
+    level: str = "INFO",
+    fmt: str = "text",
+    sampling: Iterable[tuple[str, float]] = (),
+    queue_size: int = 10_000,
+) -> LogPipeline:
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format {fmt!r}; expected one of {', '.join(LOG_FORMATS)}.")
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    sampler = SamplingFilter(sampling)
+    handler.addFilter(sampler)
+    listener = _Listener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    listener.start()
+    return LogPipeline(handler, listener, sampler)
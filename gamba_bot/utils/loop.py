@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Callable, Optional
+
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+EVENT_LOOPS = ("asyncio", "uvloop")
+
+
+def event_loop_factory(name: str) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    if name == "asyncio":
+        return None
+    if name == "uvloop":
+        try:
+            import uvloop
+        except ImportError as exc:
+            raise RuntimeError("EVENT_LOOP=uvloop needs the uvloop package (pip install uvloop).") from exc
+        return uvloop.new_event_loop
+    raise ValueError(f"Unknown event loop {name!r}; expected one of {', '.join(EVENT_LOOPS)}.")
+
+
+class LoopStall:
+    __slots__ = ("started", "duration", "stack")
+
+    def __init__(self, started: float, stack: str):
+        self.started = started
+        self.duration = 0.0
+        self.stack = stack
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = 0.25,
+        stall_threshold_seconds: float = 0.25,
+        keep_stalls: int = 20,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.stall_threshold_seconds = stall_threshold_seconds
+        self.metrics = metrics or Metrics(enabled=False)
+        self.metrics.add_collector(self._collect_metrics)
+        self.stalls: deque[LoopStall] = deque(maxlen=keep_stalls)
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._window_max_lag = 0.0
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            self._beat = now
+            lag = max(0.0, now - expected)
+            self.max_lag = max(self.max_lag, lag)
+            self._window_max_lag = max(self._window_max_lag, lag)
+            self.metrics.observe("gamba_loop_lag_seconds", lag)
+
+    def _watch(self) -> None:
+        # Runs off the loop: if the sampler has not ticked for longer than its interval
+        # plus the threshold, whatever the loop thread is executing now is the culprit.
+        limit = self.interval_seconds + self.stall_threshold_seconds
+        poll = min(self.interval_seconds, self.stall_threshold_seconds) / 2
+        current: Optional[LoopStall] = None
+        while not self._stopping.wait(poll):
+            beat = self._beat
+            now = time.monotonic()
+            if now - beat <= limit:
+                if current is not None:
+                    current.duration = beat - current.started
+                    log.warning(
+                        "Event loop blocked for %.0fms:\n%s",
+                        current.duration * 1000,
+                        current.stack,
+                    )
+                    current = None
+                continue
+            if current is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+            current = LoopStall(beat + self.interval_seconds, stack)
+            self.stalls.append(current)
+            self.stall_count += 1
+
+    def _collect_metrics(self, metrics: Metrics) -> None:
+        metrics.set_counter("gamba_loop_stalls_total", self.stall_count)
+        metrics.set_gauge("gamba_loop_lag_max_seconds", self._window_max_lag)
+        self._window_max_lag = 0.0
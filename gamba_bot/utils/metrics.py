@@ -0,0 +1,221 @@
+import logging
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[idx] if idx < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class StageRecorder:
+    __slots__ = ("metrics", "name", "labels")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: LabelKey):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __call__(self, stage: str) -> "_Timer | _NullTimer":
+        if not self.metrics.enabled:
+            return _NULL_TIMER
+        return _Timer(self.metrics._histogram(self.name, self.labels + (("stage", stage),)))
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    parts = []
+    for key, value in labels:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: dict[str, dict[LabelKey, Histogram]] = {}
+        self.counters: dict[str, dict[LabelKey, float]] = {}
+        self.gauges: dict[str, dict[LabelKey, float]] = {}
+        self._collectors: list[Callable[["Metrics"], None]] = []
+
+    def _histogram(self, name: str, labels: LabelKey) -> Histogram:
+        series = self.histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = Histogram()
+            series[labels] = histogram
+        return histogram
+
+    def time(self, name: str, **labels: object) -> "_Timer | _NullTimer":
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._histogram(name, _label_key(labels)))
+
+    def stages(self, name: str, **labels: object) -> StageRecorder:
+        return StageRecorder(self, name, _label_key(labels))
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        if self.enabled:
+            self._histogram(name, _label_key(labels)).observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: object) -> None:
+        if self.enabled:
+            series = self.counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_counter(self, name: str, value: float, **labels: object) -> None:
+        if self.enabled:
+            self.counters.setdefault(name, {})[_label_key(labels)] = value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        if self.enabled:
+            self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def series(self, name: str) -> list[tuple[dict[str, str], Histogram]]:
+        return [(dict(labels), histogram) for labels, histogram in self.histograms.get(name, {}).items()]
+
+    def add_collector(self, collector: Callable[["Metrics"], None]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception:
+                log.exception("Metrics collector failed.")
+
+    def render_prometheus(self) -> str:
+        self.collect()
+        lines: list[str] = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += bucket_count
+                    bucket_labels = labels + (("le", _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, metrics: Metrics, host: str, port: int):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.metrics.render_prometheus(),
+            content_type="text/plain",
+            charset="utf-8",
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        log.info("Metrics endpoint listening on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,55 @@
+from bisect import bisect_right
+from typing import Any, Mapping, Optional, Sequence
+
+import discord
+
+from gamba_bot.utils.currency import Money
+
+
+class StakeTable:
+    def __init__(self, tiers: Mapping[str, Mapping[str, Any]], order: Sequence[str]):
+        self.order = tuple(order)
+        self.values = {tier: tuple(sorted(tiers[tier]["values"])) for tier in self.order}
+        self.labels = {tier: tuple(str(Money(v)) for v in self.values[tier]) for tier in self.order}
+        self._minimums = [self.values[tier][0] for tier in self.order]
+        if self._minimums != sorted(self._minimums):
+            raise ValueError("Stake tiers must be ordered by their smallest stake.")
+
+    def affordable_count(self, tier: str, balance: int) -> int:
+        return bisect_right(self.values[tier], balance)
+
+    def affordable_values(self, tier: str, balance: int) -> tuple[int, ...]:
+        values = self.values[tier]
+        return values[: bisect_right(values, balance)]
+
+    def affordable_tiers(self, balance: int) -> tuple[str, ...]:
+        return self.order[: bisect_right(self._minimums, balance)]
+
+    def best_affordable_tier(self, balance: int) -> Optional[str]:
+        count = bisect_right(self._minimums, balance)
+        if count == 0:
+            return None
+        return self.order[count - 1]
+
+
+class PayloadCache:
+    __slots__ = ("_embed", "_components")
+
+    def __init__(self) -> None:
+        self._embed: Optional[dict[str, Any]] = None
+        self._components: Optional[list[dict[str, Any]]] = None
+
+    def update(self, embed: discord.Embed, view: discord.ui.View) -> bool:
+        # Both halves are stored on every change: the next render can only be
+        # skipped if it matches the embed and the components that were sent.
+        embed_dict = embed.to_dict()
+        components = view.to_components()
+        if embed_dict == self._embed and components == self._components:
+            return False
+        self._embed = embed_dict
+        self._components = components
+        return True
+
+    def clear(self) -> None:
+        self._embed = None
+        self._components = None
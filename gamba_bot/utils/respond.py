@@ -1,19 +1,211 @@
 import asyncio
+import re
 import time
-from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Hashable, Mapping, Optional
 
+import aiohttp
 import discord
 
+from gamba_bot.utils.bounded import BoundedStateMap
+from gamba_bot.utils.metrics import Metrics
+from gamba_bot.utils.sessions import shard_id_for
+
+_WEBHOOK_PATH = re.compile(r"/webhooks/\d+/([^/]+)")
+_CHANNEL_PATH = re.compile(r"/channels/(\d+)")
+
 
 def in_guild(interaction: discord.Interaction) -> bool:
     return interaction.guild is not None
 
 
+def _route_key(path: str) -> Optional[str]:
+    match = _WEBHOOK_PATH.search(path)
+    if match:
+        return f"webhook:{match.group(1)}"
+    match = _CHANNEL_PATH.search(path)
+    if match:
+        return f"channel:{match.group(1)}"
+    return None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        # Tokens may go negative; the caller sleeps off the debt it just took on.
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+@dataclass
+class RouteLimit:
+    remaining: int
+    reset_at: float
+
+
+class _UserState:
+    __slots__ = ("lock", "last_send")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.last_send = 0.0
+
+
+def _user_state_idle(state: _UserState) -> bool:
+    return not state.lock.locked()
+
+
+class _PendingEdit:
+    __slots__ = ("fields", "done")
+
+    def __init__(self, fields: dict[str, Any]):
+        self.fields = fields
+        # Created only when a later edit folds into this one and has to wait.
+        self.done: Optional[asyncio.Future[None]] = None
+
+
 class ResponseCoordinator:
-    def __init__(self, min_gap_seconds: float = 0.4):
+    def __init__(
+        self,
+        min_gap_seconds: float = 0.4,
+        *,
+        global_rate: float = 50.0,
+        channel_rate: float = 5.0,
+        channel_burst: float = 5.0,
+        max_tracked: int = 10_000,
+        idle_ttl_seconds: float = 300.0,
+        metrics: Optional[Metrics] = None,
+    ):
         self.min_gap_seconds = min_gap_seconds
-        self._last_send = defaultdict(float)
-        self._locks = defaultdict(asyncio.Lock)
+        self.metrics = metrics or Metrics(enabled=False)
+        self.metrics.add_collector(self._collect_metrics)
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        # Per-key state is bounded: idle users, channels and routes age out, and a
+        # user whose lock is held is never evicted.
+        self._users: BoundedStateMap[int, _UserState] = BoundedStateMap(
+            _UserState,
+            max_entries=max_tracked,
+            ttl_seconds=idle_ttl_seconds,
+            can_evict=_user_state_idle,
+        )
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._channel_buckets: BoundedStateMap[int, TokenBucket] = BoundedStateMap(
+            lambda: TokenBucket(channel_rate, channel_burst),
+            max_entries=max_tracked,
+            ttl_seconds=idle_ttl_seconds,
+        )
+        self._route_limits: BoundedStateMap[str, RouteLimit] = BoundedStateMap(
+            lambda: RouteLimit(0, 0.0),
+            max_entries=max_tracked,
+            ttl_seconds=idle_ttl_seconds,
+        )
+        self._global_reset_at = 0.0
+        self._pending_edits: dict[Hashable, _PendingEdit] = {}
+        # Edits in flight; _idle is set whenever the count is zero.
+        self._unsettled = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.sent_by_shard: dict[int, int] = {}
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    async def _on_request_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        self.observe_headers(params.url.path, params.response.status, params.response.headers)
+
+    def observe_headers(self, path: str, status: int, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        if status == 429 and (
+            headers.get("X-RateLimit-Global") or headers.get("X-RateLimit-Scope") == "global"
+        ):
+            retry_after = float(headers.get("Retry-After", "1"))
+            self._global_reset_at = max(self._global_reset_at, now + retry_after)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        key = _route_key(path)
+        if key is None or remaining is None or reset_after is None:
+            return
+        limit = self._route_limits.get(key, now)
+        limit.remaining = int(remaining)
+        limit.reset_at = now + float(reset_after)
+
+    def _route_delay(self, key: str, now: float) -> float:
+        limit = self._route_limits.peek(key)
+        if limit is None:
+            return 0.0
+        if limit.reset_at <= now:
+            self._route_limits.pop(key)
+            return 0.0
+        if limit.remaining > 0:
+            limit.remaining -= 1
+            return 0.0
+        return limit.reset_at - now
+
+    def memory_report(self) -> dict[str, int]:
+        return {
+            "users": len(self._users),
+            "user_evictions": self._users.evictions,
+            "channel_buckets": len(self._channel_buckets),
+            "channel_evictions": self._channel_buckets.evictions,
+            "route_limits": len(self._route_limits),
+            "pending_edits": len(self._pending_edits),
+        }
+
+    def _collect_metrics(self, metrics: Metrics) -> None:
+        metrics.set_counter("gamba_responses_sent_total", self.sent_count)
+        for shard_id, count in self.sent_by_shard.items():
+            metrics.set_counter("gamba_responses_sent_by_shard_total", count, shard=shard_id)
+        metrics.set_counter("gamba_responses_coalesced_total", self.coalesced_count)
+        for key, value in self.memory_report().items():
+            metrics.set_gauge("gamba_responses_tracked", value, kind=key)
+
+    def _count_sent(self, interaction: discord.Interaction) -> None:
+        shard_id = shard_id_for(interaction.guild)
+        self.sent_by_shard[shard_id] = self.sent_by_shard.get(shard_id, 0) + 1
+        self.sent_count += 1
+
+    async def _wait_turn(
+        self,
+        interaction: discord.Interaction,
+        state: _UserState,
+        *,
+        webhook: bool,
+    ) -> None:
+        now = time.monotonic()
+        wait_for = max(
+            0.0,
+            self.min_gap_seconds - (now - state.last_send),
+            self._global_reset_at - now,
+            self._global_bucket.reserve(now),
+        )
+        if interaction.channel_id is not None:
+            bucket = self._channel_buckets.get(interaction.channel_id, now)
+            wait_for = max(wait_for, bucket.reserve(now))
+        if webhook:
+            wait_for = max(wait_for, self._route_delay(f"webhook:{interaction.token}", now))
+        self.metrics.observe("gamba_response_wait_seconds", wait_for)
+        if wait_for:
+            await asyncio.sleep(wait_for)
 
     async def defer(self, interaction: discord.Interaction) -> None:
         if not interaction.response.is_done():
@@ -25,27 +217,71 @@ class ResponseCoordinator:
         *,
         content: str,
     ) -> None:
-        async with self._locks[interaction.user.id]:
-            now = time.monotonic()
-            elapsed = now - self._last_send[interaction.user.id]
-            wait_for = max(0.0, self.min_gap_seconds - elapsed)
-            if wait_for:
-                await asyncio.sleep(wait_for)
+        state = self._users.get(interaction.user.id)
+        async with state.lock:
+            followup = interaction.response.is_done()
+            await self._wait_turn(interaction, state, webhook=followup)
 
             ephemeral = in_guild(interaction)
-            if interaction.response.is_done():
-                await interaction.followup.send(content, ephemeral=ephemeral)
-            else:
-                await interaction.response.send_message(content, ephemeral=ephemeral)
-            self._last_send[interaction.user.id] = time.monotonic()
-
-    async def edit_original(self, interaction: discord.Interaction, *, content: str) -> None:
-        async with self._locks[interaction.user.id]:
-            now = time.monotonic()
-            elapsed = now - self._last_send[interaction.user.id]
-            wait_for = max(0.0, self.min_gap_seconds - elapsed)
-            if wait_for:
-                await asyncio.sleep(wait_for)
-
-            await interaction.edit_original_response(content=content)
-            self._last_send[interaction.user.id] = time.monotonic()
+            with self.metrics.time("gamba_response_api_seconds", kind="followup" if followup else "send"):
+                if followup:
+                    await interaction.followup.send(content, ephemeral=ephemeral)
+                else:
+                    await interaction.response.send_message(content, ephemeral=ephemeral)
+            state.last_send = time.monotonic()
+            self._count_sent(interaction)
+
+    async def wait_idle(self) -> None:
+        await self._idle.wait()
+
+    def _edit_key(self, interaction: discord.Interaction) -> Hashable:
+        # Component interactions edit the message they are attached to, so clicks on
+        # the same view share one key no matter which interaction token carries them.
+        if interaction.message is not None:
+            return interaction.message.id
+        return interaction.token
+
+    async def edit_original(self, interaction: discord.Interaction, **fields: Any) -> None:
+        key = self._edit_key(interaction)
+        pending = self._pending_edits.get(key)
+        if pending is not None:
+            # An edit for this message is still waiting for its turn; fold this state
+            # into it so only the latest render goes out.
+            pending.fields.update(fields)
+            self.coalesced_count += 1
+            if pending.done is None:
+                pending.done = asyncio.get_running_loop().create_future()
+            await asyncio.shield(pending.done)
+            return
+
+        pending = _PendingEdit(dict(fields))
+        self._pending_edits[key] = pending
+        self._unsettled += 1
+        self._idle.clear()
+        try:
+            state = self._users.get(interaction.user.id)
+            async with state.lock:
+                await self._wait_turn(interaction, state, webhook=True)
+                if self._pending_edits.get(key) is pending:
+                    del self._pending_edits[key]
+                with self.metrics.time("gamba_response_api_seconds", kind="edit"):
+                    await interaction.edit_original_response(**pending.fields)
+                state.last_send = time.monotonic()
+                self._count_sent(interaction)
+        except BaseException as exc:
+            if self._pending_edits.get(key) is pending:
+                del self._pending_edits[key]
+            if pending.done is not None:
+                if isinstance(exc, asyncio.CancelledError):
+                    pending.done.cancel()
+                else:
+                    pending.done.set_exception(exc)
+                    pending.done.exception()
+            raise
+        else:
+            if pending.done is not None:
+                pending.done.set_result(None)
+        finally:
+            self._unsettled -= 1
+            if not self._unsettled:
+                self._idle.set()
@@ -0,0 +1,39 @@
+from typing import Optional
+
+import discord
+
+
+def shard_id_for(guild: Optional[discord.Guild]) -> int:
+    # DMs and private channels are always delivered on shard 0.
+    return 0 if guild is None else guild.shard_id
+
+
+class SessionRegistry:
+    def __init__(self) -> None:
+        self._by_shard: dict[int, dict[int, discord.ui.View]] = {}
+        self._shard_of: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._shard_of)
+
+    def add(self, view: discord.ui.View, *, shard_id: int) -> None:
+        self._by_shard.setdefault(shard_id, {})[id(view)] = view
+        self._shard_of[id(view)] = shard_id
+
+    def discard(self, view: discord.ui.View) -> None:
+        shard_id = self._shard_of.pop(id(view), None)
+        if shard_id is None:
+            return
+        views = self._by_shard.get(shard_id)
+        if views is not None:
+            views.pop(id(view), None)
+            if not views:
+                del self._by_shard[shard_id]
+
+    def views(self, shard_id: Optional[int] = None) -> list[discord.ui.View]:
+        if shard_id is not None:
+            return list(self._by_shard.get(shard_id, {}).values())
+        return [view for views in self._by_shard.values() for view in views.values()]
+
+    def count_by_shard(self) -> dict[int, int]:
+        return {shard_id: len(views) for shard_id, views in self._by_shard.items()}
@@ -0,0 +1,114 @@
+import importlib.abc
+import importlib.machinery
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Iterator, Optional, Sequence
+
+from gamba_bot.utils.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    def __init__(self, label: str, *, metrics: Optional[Metrics] = None):
+        self.label = label
+        self.metrics = metrics or Metrics(enabled=False)
+        self.started = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases.append((name, seconds))
+        self.metrics.set_gauge("gamba_phase_seconds", seconds, label=self.label, phase=name)
+        log.info("%s phase %s took %.1f ms", self.label, name, seconds * 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark(self, name: str) -> None:
+        self.record(name, self.elapsed())
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        return f"{self.label} total {self.elapsed() * 1000:.0f}ms ({parts})"
+
+
+class _TimingLoader(importlib.abc.Loader):
+    def __init__(self, loader: Any, profiler: "ImportProfiler", name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    def __init__(self) -> None:
+        self.inclusive: dict[str, float] = {}
+        self.self_time: dict[str, float] = {}
+        self._stack: list[tuple[str, float, float]] = []
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self, fullname)
+            return spec
+        return None
+
+    def _enter(self, name: str) -> None:
+        self._stack.append((name, time.perf_counter(), 0.0))
+
+    def _exit(self, name: str) -> None:
+        _, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.inclusive[name] = elapsed
+        self.self_time[name] = elapsed - children
+        if self._stack:
+            parent, parent_started, parent_children = self._stack[-1]
+            self._stack[-1] = (parent, parent_started, parent_children + elapsed)
+
+    def report(self, limit: int = 15) -> str:
+        slowest = sorted(self.inclusive.items(), key=lambda item: item[1], reverse=True)[:limit]
+        lines = [f"Imported {len(self.inclusive)} modules; slowest (inclusive / self):"]
+        for name, seconds in slowest:
+            lines.append(f"  {seconds * 1000:8.1f} ms / {self.self_time[name] * 1000:8.1f} ms  {name}")
+        return "\n".join(lines)
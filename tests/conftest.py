@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+from gamba_bot.database import Database
+from gamba_bot.services.ledger import LedgerUser
+
+STARTING_BALANCE = 10_000
+
+
+def user(user_id: int, name: str = "player") -> LedgerUser:
+    return LedgerUser(user_id, name)
+
+
+@pytest.fixture
+def with_db(tmp_path: Any) -> Callable[..., Any]:
+    # The suite has no async plugin: each test drives its own event loop.
+    def run(scenario: Callable[[Database], Awaitable[Any]], *, starting_balance: int = STARTING_BALANCE) -> Any:
+        async def main() -> Any:
+            db = Database(str(tmp_path / "gamba.db"), starting_balance)
+            await db.initialize()
+            try:
+                return await scenario(db)
+            finally:
+                await db.close()
+
+        return asyncio.run(main())
+
+    return run
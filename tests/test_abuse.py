@@ -0,0 +1,87 @@
+import random
+
+from gamba_bot.utils.abuse import AbuseDetector
+
+
+def _detector() -> AbuseDetector:
+    return AbuseDetector(
+        window_seconds=10,
+        max_actions=5,
+        cooldown_seconds=15,
+        strikes_to_block=3,
+        block_seconds=600,
+        rhythm_samples=30,
+        rhythm_share=0.9,
+    )
+
+
+def test_window_overflow_starts_cooldown():
+    detector = _detector()
+    verdicts = [detector.check(1, "roulette", now=1_000.0 + idx) for idx in range(6)]
+    assert [verdict.allowed for verdict in verdicts] == [True] * 5 + [False]
+    assert verdicts[-1].reason == "rate"
+    later = detector.check(1, "roulette", now=1_010.0)
+    assert not later.allowed and later.reason == "cooldown"
+    assert detector.check(1, "roulette", now=1_021.0).allowed
+
+
+def test_repeated_cooldowns_block():
+    detector = _detector()
+    now = 1_000.0
+    verdict = None
+    for _ in range(3):
+        while (verdict := detector.check(1, "roulette", now=now)).allowed:
+            now += 0.5
+        now += 16
+    assert verdict is not None and verdict.reason == "blocked"
+    assert not detector.check(1, "roulette", now=now).allowed
+
+
+def test_machine_regular_clicks_cool_down_before_a_block():
+    rng = random.Random(7)
+    detector = _detector()
+    verdicts = [
+        detector.check(1, "slots.spin", now=5_000 + idx * 3.0 + rng.uniform(-0.02, 0.02)) for idx in range(200)
+    ]
+    refusals = [(idx, verdict.reason) for idx, verdict in enumerate(verdicts) if not verdict.allowed]
+    assert refusals[0] == (30, "rhythm")
+    # The script keeps its rhythm through two cooldowns and is blocked on the third strike.
+    causes = [reason for _, reason in refusals if reason != "cooldown"]
+    assert causes[:3] == ["rhythm", "rhythm", "blocked"]
+
+
+def test_slow_casual_play_is_never_blocked():
+    rng = random.Random(7)
+    detector = _detector()
+    now = 0.0
+    for _ in range(500):
+        now += rng.uniform(45, 165)
+        assert detector.check(1, "roulette", now=now).allowed
+
+
+def test_varied_human_pace_is_not_blocked():
+    rng = random.Random(7)
+    detector = AbuseDetector()
+    now = 0.0
+    for _ in range(500):
+        now += rng.lognormvariate(1.2, 0.5)
+        assert detector.check(1, "slots.spin", now=now).allowed
+
+
+def test_blocked_users_are_kept_until_the_block_ends():
+    detector = AbuseDetector(max_actions=2, window_seconds=10, strikes_to_block=1, block_seconds=600, max_tracked=1)
+    for idx in range(3):
+        detector.check(1, "roulette", now=1_000.0 + idx)
+    detector.check(2, "roulette", now=1_100.0)
+    # Eviction is judged by the clock the checks run on, not the host's uptime.
+    assert len(detector._users) == 2
+    detector.check(3, "roulette", now=1_700.0)
+    assert 1 not in detector._users
+
+
+def test_users_are_tracked_separately():
+    detector = _detector()
+    for idx in range(5):
+        detector.check(1, "roulette", now=1_000.0 + idx)
+    assert not detector.check(1, "roulette", now=1_005.0).allowed
+    assert detector.check(2, "roulette", now=1_005.0).allowed
@@ -0,0 +1,63 @@
+import asyncio
+
+from benchmarks.fakes import CallLog, FakeBot, FakeInteraction, FakeMessage, FakeUser
+from gamba_bot.cogs.blackjack import BlackjackSessionView
+from gamba_bot.utils.metrics import Metrics
+from gamba_bot.utils.respond import ResponseCoordinator
+
+
+def _open_hand(with_db, scenario):
+    async def run(db):
+        settlements = []
+        settle_many = db.settle_many
+
+        async def counted(entries):
+            settlements.append(len(entries))
+            return await settle_many(entries)
+
+        db.settle_many = counted
+        metrics = Metrics(enabled=False)
+        responses = ResponseCoordinator(min_gap_seconds=0.0, global_rate=1e9, channel_rate=1e9, channel_burst=1e9)
+        bot = FakeBot(db, metrics=metrics, responses=responses)
+        log = CallLog()
+        user = FakeUser(7)
+        message = FakeMessage(1)
+        record = await db.ensure_user(user)
+        origin = FakeInteraction(user, log, message=message)
+        view = BlackjackSessionView(bot, origin_interaction=origin, balance=record.balance)
+        # Naturals settle on the deal; keep dealing until a hand is left open.
+        while True:
+            await view.deal_hand(FakeInteraction(user, log, message=message))
+            if view.hand_in_progress():
+                break
+            await view.new_hand_yes(FakeInteraction(user, log, message=message))
+        settlements.clear()
+        try:
+            return await scenario(view, settlements, lambda: FakeInteraction(user, log, message=message))
+        finally:
+            view.stop()
+            if not view._watchdog_task.done():
+                view._watchdog_task.cancel()
+
+    return with_db(run)
+
+
+def test_click_during_drain_cannot_settle_the_round_twice(with_db):
+    async def scenario(view, settlements, click):
+        late = click()
+        await asyncio.gather(view.drain(0), view.stick(late))
+        return settlements, late.response.is_done(), view.finished
+
+    settlements, answered, finished = _open_hand(with_db, scenario)
+    assert settlements == [1]
+    assert answered and finished
+
+
+def test_overlapping_clicks_settle_once(with_db):
+    async def scenario(view, settlements, click):
+        await asyncio.gather(*(view.stick(click()) for _ in range(3)))
+        return settlements, view.awaiting_new_hand
+
+    settlements, awaiting = _open_hand(with_db, scenario)
+    assert settlements == [1]
+    assert awaiting
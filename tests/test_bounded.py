@@ -0,0 +1,76 @@
+import pytest
+
+from gamba_bot.utils.bounded import BoundedStateMap
+
+
+def make(**kwargs: object) -> BoundedStateMap[int, list[int]]:
+    options: dict = {"max_entries": 3, "ttl_seconds": 60.0}
+    options.update(kwargs)
+    return BoundedStateMap(list, **options)
+
+
+def test_get_creates_once_and_returns_the_same_value() -> None:
+    states = make()
+    first = states.get(1, now=0.0)
+    first.append(7)
+    assert states.get(1, now=1.0) == [7]
+    assert len(states) == 1
+
+
+def test_over_capacity_evicts_least_recently_used() -> None:
+    states = make()
+    for key in (1, 2, 3):
+        states.get(key, now=float(key))
+    states.get(1, now=4.0)
+    states.get(4, now=5.0)
+    assert sorted(key for key, _ in states.items()) == [1, 3, 4]
+    assert states.evictions == 1
+
+
+def test_prune_drops_idle_entries_only() -> None:
+    states = make()
+    states.get(1, now=0.0)
+    states.get(2, now=30.0)
+    assert states.prune(now=61.0) == 1
+    assert 1 not in states and 2 in states
+    assert states.prune(now=89.0) == 0
+    assert states.prune(now=90.0) == 1
+    assert len(states) == 0
+
+
+def test_entries_in_use_are_skipped() -> None:
+    states: BoundedStateMap[int, list[int]] = make(can_evict=lambda value: not value)
+    states.get(1, now=0.0).append(1)
+    states.get(2, now=1.0)
+    assert states.prune(now=100.0) == 1
+    assert 1 in states and 2 not in states
+
+
+def test_capacity_may_be_exceeded_while_every_entry_is_in_use() -> None:
+    states: BoundedStateMap[int, list[int]] = make(max_entries=2, can_evict=lambda value: False)
+    for key in range(5):
+        states.get(key, now=float(key))
+    assert len(states) == 5
+    assert states.evictions == 0
+
+
+def test_pop_and_peek_do_not_create_entries() -> None:
+    states = make()
+    assert states.peek(1) is None
+    assert states.pop(1) is None
+    assert len(states) == 0
+
+
+def test_rejects_empty_capacity() -> None:
+    with pytest.raises(ValueError):
+        make(max_entries=0)
+
+
+def test_new_entry_survives_when_every_older_entry_is_pinned() -> None:
+    states: BoundedStateMap[int, list[int]] = make(max_entries=2, can_evict=lambda value: not value)
+    for key in (1, 2):
+        states.get(key, now=float(key)).append(key)
+    fresh = states.get(3, now=3.0)
+    assert 3 in states
+    assert states.get(3, now=4.0) is fresh
+    assert len(states) == 3
@@ -0,0 +1,61 @@
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from gamba_bot.utils.currency import Money, format_cents, parse_credits_to_cents
+
+
+def decimal_cents(amount: float) -> int:
+    value = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def decimal_text(cents: int) -> str:
+    return f"{Decimal(cents) / Decimal(100):,.2f}"
+
+
+@pytest.mark.parametrize("amount", [0.005, -0.005, 1.005, -1.005, 2.675, 1234.565, 1e-5, 1e20, -1e20, 7, -7])
+def test_from_credits_matches_decimal_on_edges(amount: float) -> None:
+    assert Money.from_credits(amount) == decimal_cents(amount)
+
+
+def test_parse_rejects_non_positive_stakes() -> None:
+    assert parse_credits_to_cents(1234.565) == 123_457
+    with pytest.raises(ValueError):
+        parse_credits_to_cents(0.004)
+
+
+def test_from_credits_matches_decimal_near_half_cents() -> None:
+    rng = random.Random(29)
+    for _ in range(50_000):
+        # Odd thousandths sit on or next to a half-cent once they become a float.
+        amount = (rng.randint(-10**9, 10**9) * 10 + 5) / 1000
+        assert Money.from_credits(amount) == decimal_cents(amount), amount
+    for _ in range(50_000):
+        amount = rng.uniform(-1e12, 1e12)
+        assert Money.from_credits(amount) == decimal_cents(amount), amount
+
+
+def test_grouped_text_matches_decimal() -> None:
+    rng = random.Random(29)
+    values = [0, 5, -5, 99_999, 100_000, -100_000, 10**15]
+    values += [rng.randint(-10**6, 10**6) for _ in range(5_000)]
+    values += [rng.randint(-10**15, 10**15) for _ in range(5_000)]
+    for cents in values:
+        expected = decimal_text(cents)
+        assert str(Money(cents)) == expected
+        assert f"{Money(cents)}" == expected
+        assert format_cents(cents, grouping=True) == expected
+        assert format_cents(cents) == expected.replace(",", "")
+
+
+def test_format_specs() -> None:
+    assert f"{Money(-5):>8}" == "   -0.05"
+    assert f"{Money(12_345):*^10}" == "**123.45**"
+    assert f"{Money(123_456_789):plain}" == "1234567.89"
+
+
+@pytest.mark.parametrize("spec", ["d", ",", ".2f", "+d", "08", "x", "=10", "_"])
+def test_numeric_specs_format_the_cents(spec: str) -> None:
+    assert format(Money(-12_345), spec) == format(-12_345, spec)
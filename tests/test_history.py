@@ -0,0 +1,54 @@
+import itertools
+
+from gamba_bot import database
+
+from .conftest import user
+
+
+def _record_bets(monkeypatch, with_db, scenario):
+    # Three bets per millisecond, so pages have to break ties on id.
+    clock = itertools.count()
+    monkeypatch.setattr(database, "_now_ms", lambda: 1_000 + next(clock) // 3)
+
+    async def run(db):
+        player, other = user(1), user(2)
+        for n in range(25):
+            await db.settle_bet(player, 10, n)
+            if n % 4 == 0:
+                await db.settle_bet(other, 10, 1)
+        return await scenario(db)
+
+    return with_db(run)
+
+
+def test_full_history_is_newest_first(monkeypatch, with_db):
+    async def scenario(db):
+        return await db.bet_history(1, limit=100)
+
+    rows = _record_bets(monkeypatch, with_db, scenario)
+    assert [row.delta for row in rows] == list(range(24, -1, -1))
+    assert [(row.ts, row.id) for row in rows] == sorted(((row.ts, row.id) for row in rows), reverse=True)
+    assert all(row.user_id == 1 for row in rows)
+
+
+def test_pages_back_and_forward_without_gaps_or_repeats(monkeypatch, with_db):
+    async def scenario(db):
+        full = await db.bet_history(1, limit=100)
+        older = []
+        page = await db.bet_history(1, limit=10)
+        while page:
+            older.append(page)
+            page = await db.bet_history(1, limit=10, before=(page[-1].ts, page[-1].id))
+        newer = []
+        page = await db.bet_history(1, limit=10, before=(full[-6].ts, full[-6].id))
+        while page:
+            newer.append(page)
+            page = await db.bet_history(1, limit=10, after=(page[0].ts, page[0].id))
+        return full, older, newer
+
+    full, older, newer = _record_bets(monkeypatch, with_db, scenario)
+    assert [len(page) for page in older] == [10, 10, 5]
+    assert [row for page in older for row in page] == full
+    # Paging towards newer bets still returns each page newest first.
+    assert [len(page) for page in newer] == [5, 10, 10]
+    assert [row for page in reversed(newer) for row in page] == full
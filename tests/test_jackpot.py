@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+import pytest
+
+from gamba_bot.database import InsufficientBalanceError
+from gamba_bot.services.jackpot import JackpotPool
+from gamba_bot.services.ledger import LedgerClient, LedgerServer
+
+from .conftest import STARTING_BALANCE, user
+
+SEED = 5_000
+
+
+async def _stored_pool(db):
+    return await db.add_to_jackpot("slots", 0, seed=SEED)
+
+
+def test_contributions_carry_fractions_and_flush_once(with_db):
+    async def scenario(db):
+        pool = JackpotPool(contribution_bps=150, seed=SEED)
+        await pool.start(db, flush_seconds=3600)
+        for _ in range(3):
+            pool.contribute(99)
+        pending = pool.pool
+        flushed = await pool.flush()
+        stored = await _stored_pool(db)
+        await pool.close()
+        return pending, flushed, stored
+
+    # 3 x 1.485 cents: the carried fractions add up to a fourth whole cent.
+    assert with_db(scenario) == (SEED + 4, 4, SEED + 4)
+
+
+def test_win_pays_pool_and_resets_to_seed(with_db):
+    async def scenario(db):
+        pool = JackpotPool(contribution_bps=100, seed=SEED)
+        await pool.start(db, flush_seconds=3600)
+        pool.contribute(1_000)
+        await pool.flush()
+        pool.contribute(500)
+        record, won = await pool.claim(user(1), 100, 1_900, game="slots")
+        stored = await _stored_pool(db)
+        await pool.close()
+        return record, won, stored, pool.pool
+
+    record, won, stored, in_memory = with_db(scenario)
+    assert won == SEED + 15
+    assert record.balance == STARTING_BALANCE + 1_900 + won
+    assert stored == in_memory == SEED
+
+
+def test_rejected_win_keeps_pool_and_pending(with_db):
+    async def scenario(db):
+        pool = JackpotPool(contribution_bps=100, seed=SEED)
+        await pool.start(db, flush_seconds=3600)
+        await db.ensure_user(user(1))
+        pool.contribute(1_000)
+        with pytest.raises(InsufficientBalanceError):
+            await pool.claim(user(1), STARTING_BALANCE + 1, 0)
+        stored = await _stored_pool(db)
+        in_memory = pool.pool
+        await pool.close()
+        return stored, in_memory, await _stored_pool(db), await db.get_user(1)
+
+    stored, in_memory, after_close, record = with_db(scenario)
+    assert stored == SEED
+    assert in_memory == after_close == SEED + 10
+    assert record.balance == STARTING_BALANCE
+
+
+def test_rejected_win_inside_ledger_batch_is_rolled_back(with_db, tmp_path):
+    # The ledger applies every call inside one outer batch and answers a refused
+    # bet instead of raising; the refused win must not touch the pool.
+    async def scenario(db):
+        server = LedgerServer(db, os.path.join(str(tmp_path), "ledger.sock"))
+        await server.start()
+        client = LedgerClient(server.socket_path)
+        await client.initialize()
+        try:
+            await client.add_to_jackpot("slots", 1_000, seed=SEED)
+            poor, bystander = user(1), user(2)
+            await client.ensure_user(poor)
+            win, bet = await asyncio.gather(
+                client.settle_jackpot_win(poor, STARTING_BALANCE + 1, 0, name="slots", contribution=10, seed=SEED),
+                client.settle_bet(bystander, 100, 40),
+                return_exceptions=True,
+            )
+            return win, bet, await _stored_pool(client), await client.get_user(poor.id)
+        finally:
+            await client.close()
+            await server.close()
+
+    win, bet, stored, record = with_db(scenario)
+    assert isinstance(win, InsufficientBalanceError)
+    assert bet.balance == STARTING_BALANCE + 40
+    assert stored == SEED + 1_000
+    assert record.balance == STARTING_BALANCE
@@ -0,0 +1,188 @@
+import asyncio
+import os
+
+import pytest
+
+from gamba_bot.database import InsufficientBalanceError
+from gamba_bot.services.ledger import (
+    MAX_FRAME_BYTES,
+    OPCODES,
+    STATUS_ERROR,
+    STATUS_OK,
+    LedgerClient,
+    LedgerError,
+    LedgerProtocolError,
+    LedgerServer,
+    decode_frame,
+    encode_frame,
+    read_frame,
+)
+from gamba_bot.utils.metrics import Metrics
+
+from .conftest import STARTING_BALANCE, user
+
+
+def _body(frame: bytes) -> bytes:
+    return frame[4:]
+
+
+def test_frame_round_trip() -> None:
+    values = (None, True, False, 0, -(2**63), 2**63 - 1, "", "jäckpot ✓", (1, ("nested", None)), [2, 3])
+    request_id, code, decoded = decode_frame(_body(encode_frame(0xFFFFFFFF, 7, values)))
+    assert (request_id, code) == (0xFFFFFFFF, 7)
+    # Lists travel as tuples.
+    assert decoded == values[:-1] + ((2, 3),)
+
+
+def test_read_frame_splits_a_stream() -> None:
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame(1, 5, (10,)) + encode_frame(2, 6, ("x",)))
+        reader.feed_eof()
+        return [decode_frame(await read_frame(reader)) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [(1, 5, (10,)), (2, 6, ("x",))]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        _body(encode_frame(1, 1, ())) + b"n",  # trailing bytes
+        _body(encode_frame(1, 1, ()))[:5] + b"i" + bytes(8),  # not a tuple
+        _body(encode_frame(1, 1, ()))[:5] + b"?",  # unknown tag
+    ],
+)
+def test_malformed_frames_are_rejected(body: bytes) -> None:
+    with pytest.raises(LedgerProtocolError):
+        decode_frame(body)
+
+
+def test_every_truncation_is_a_protocol_error() -> None:
+    body = _body(encode_frame(3, 1, (1, "héllo", (None, True, [2, "x"]), -5)))
+    for size in range(len(body)):
+        with pytest.raises(LedgerProtocolError):
+            decode_frame(body[:size])
+    with pytest.raises(LedgerProtocolError):
+        decode_frame(body[:5] + b"s" + (2).to_bytes(4, "big") + b"\xff\xfe")
+    with pytest.raises(LedgerProtocolError):
+        decode_frame(body[:5] + b"l\x00\x00\x00\x01" * 100_000 + b"n")
+
+
+def test_unencodable_and_oversized_values_are_rejected() -> None:
+    with pytest.raises(LedgerProtocolError):
+        encode_frame(1, 1, (1.5,))
+    with pytest.raises(LedgerProtocolError):
+        encode_frame(1, 1, ("x" * MAX_FRAME_BYTES,))
+
+    async def oversized_header():
+        reader = asyncio.StreamReader()
+        reader.feed_data((MAX_FRAME_BYTES + 1).to_bytes(4, "big"))
+        await read_frame(reader)
+
+    with pytest.raises(LedgerProtocolError):
+        asyncio.run(oversized_header())
+
+
+def _serve(tmp_path, scenario, metrics=None):
+    async def run(db):
+        server = LedgerServer(db, os.path.join(str(tmp_path), "ledger.sock"), metrics=metrics)
+        await server.start()
+        client = LedgerClient(server.socket_path)
+        await client.initialize()
+        try:
+            return await scenario(client, server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return run
+
+
+def test_pipelined_calls_share_batches_and_get_their_own_replies(with_db, tmp_path):
+    metrics = Metrics()
+
+    async def scenario(client, server):
+        players = [user(user_id) for user_id in range(1, 51)]
+        return await asyncio.gather(
+            *(client.settle_bet(player, 100, player.id) for player in players),
+            client.settle_bet(user(99), STARTING_BALANCE + 1, 0),
+            return_exceptions=True,
+        )
+
+    results = with_db(_serve(tmp_path, scenario, metrics))
+    *records, refused = results
+    assert [record.user_id for record in records] == list(range(1, 51))
+    assert [record.balance for record in records] == [STARTING_BALANCE + n for n in range(1, 51)]
+    # A refused call fails on its own without undoing its batch neighbours.
+    assert isinstance(refused, InsufficientBalanceError)
+    assert metrics.counters["gamba_ledger_calls_total"][()] > metrics.counters["gamba_ledger_batches_total"][()]
+
+
+def test_unknown_opcode_gets_an_error_reply(with_db, tmp_path):
+    async def scenario(client, server):
+        reader, writer = await asyncio.open_unix_connection(server.socket_path)
+        writer.write(encode_frame(5, 200, ()) + encode_frame(6, OPCODES["get_meta"], ("missing",)))
+        await writer.drain()
+        replies = [decode_frame(await read_frame(reader)) for _ in range(2)]
+        writer.close()
+        return replies
+
+    (first_id, first_status, _), second = with_db(_serve(tmp_path, scenario))
+    assert (first_id, first_status) == (5, STATUS_ERROR)
+    assert second == (6, STATUS_OK, (None,))
+
+
+@pytest.mark.parametrize("failure", [ValueError("bad call"), RuntimeError("constraint failed")])
+def test_a_failing_call_is_undone_without_failing_its_batch(with_db, tmp_path, failure):
+    async def scenario(client, server):
+        async def write_then_fail(user_id, display_name, amount):
+            await server.db.set_meta("half-done", "yes")
+            raise failure
+
+        server._handlers[OPCODES["add_credits"]] = write_then_fail
+        return await asyncio.gather(
+            client.set_meta("before", "1"),
+            client.add_credits(user(1), 100),
+            client.settle_bet(user(2), 100, 50),
+            return_exceptions=True,
+        ) + [await client.get_meta("before"), await client.get_meta("half-done")]
+
+    before, failed, record, stored_before, half_done = with_db(_serve(tmp_path, scenario))
+    assert before is None and record.balance == STARTING_BALANCE + 50
+    assert isinstance(failed, (ValueError, LedgerError))
+    assert (stored_before, half_done) == ("1", None)
+
+
+def test_truncated_frames_drop_the_connection_not_the_ledger(with_db, tmp_path):
+    async def scenario(client, server):
+        reader, writer = await asyncio.open_unix_connection(server.socket_path)
+        truncated = _body(encode_frame(1, OPCODES["get_user"], (12_345,)))[:-2]
+        writer.write(len(truncated).to_bytes(4, "big") + truncated)
+        await writer.drain()
+        dropped = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return dropped, await client.get_meta("key")
+
+    assert with_db(_serve(tmp_path, scenario)) == (b"", None)
+
+
+def test_a_truncated_reply_fails_pending_calls(tmp_path):
+    async def reply_badly(reader, writer):
+        body = await read_frame(reader)
+        reply = _body(encode_frame(int.from_bytes(body[:4], "big"), STATUS_OK, (12_345,)))[:-2]
+        writer.write(len(reply).to_bytes(4, "big") + reply)
+        await writer.drain()
+
+    async def scenario():
+        path = os.path.join(str(tmp_path), "bad.sock")
+        server = await asyncio.start_unix_server(reply_badly, path=path)
+        client = LedgerClient(path)
+        await client.initialize()
+        try:
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(client.get_meta("key"), timeout=5)
+        finally:
+            await client.close()
+            server.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,31 @@
+import discord
+
+from gamba_bot.utils.render import PayloadCache
+
+
+def _render(footer: str, *, disabled: bool = False) -> tuple[discord.Embed, discord.ui.View]:
+    embed = discord.Embed(title="Slots").set_footer(text=footer)
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(label="Spin", custom_id="spin", disabled=disabled))
+    return embed, view
+
+
+def test_identical_renders_after_a_change_are_skipped():
+    cache = PayloadCache()
+    sent = [
+        cache.update(*_render("first")),
+        cache.update(*_render("first")),
+        cache.update(*_render("second")),
+        cache.update(*_render("second")),
+        cache.update(*_render("second")),
+        cache.update(*_render("second", disabled=True)),
+        cache.update(*_render("second", disabled=True)),
+    ]
+    assert sent == [True, False, True, False, False, True, False]
+
+
+def test_clear_forces_the_next_render():
+    cache = PayloadCache()
+    cache.update(*_render("first"))
+    cache.clear()
+    assert cache.update(*_render("first")) is True
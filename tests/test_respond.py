@@ -0,0 +1,64 @@
+import asyncio
+
+from benchmarks.fakes import CallLog, FakeInteraction, FakeMessage, FakeUser
+from gamba_bot.utils.respond import ResponseCoordinator
+
+
+def _coordinator() -> ResponseCoordinator:
+    return ResponseCoordinator(min_gap_seconds=0.0, global_rate=1e9, channel_rate=1e9, channel_burst=1e9)
+
+
+def test_edits_to_one_message_coalesce():
+    async def scenario():
+        coordinator = _coordinator()
+        log = CallLog(latency=0.01)
+        message = FakeMessage(1)
+        clicks = [FakeInteraction(FakeUser(1), log, message=message) for _ in range(5)]
+        await asyncio.gather(*(coordinator.edit_original(click, content=str(idx)) for idx, click in enumerate(clicks)))
+        return coordinator, log
+
+    coordinator, log = asyncio.run(scenario())
+    # The first edit goes out at once; the four queued behind it fold into one.
+    assert [fields["content"] for _, fields in log.calls] == ["0", "4"]
+    assert coordinator.coalesced_count == 3
+    assert coordinator.memory_report()["pending_edits"] == 0
+
+
+def test_wait_idle_waits_for_edits_in_flight():
+    async def scenario():
+        coordinator = _coordinator()
+        log = CallLog(latency=0.02)
+        edits = [
+            asyncio.create_task(coordinator.edit_original(FakeInteraction(FakeUser(idx), log), content="x"))
+            for idx in range(3)
+        ]
+        await asyncio.sleep(0)
+        await asyncio.wait_for(coordinator.wait_idle(), timeout=1.0)
+        finished = all(edit.done() for edit in edits)
+        await asyncio.wait_for(coordinator.wait_idle(), timeout=0.1)
+        return finished, log.count
+
+    assert asyncio.run(scenario()) == (True, 3)
+
+
+def test_failed_edit_reaches_coalesced_callers():
+    class Failing(FakeInteraction):
+        async def edit_original_response(self, **fields):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("edit failed")
+
+    async def scenario():
+        coordinator = _coordinator()
+        log = CallLog()
+        message = FakeMessage(2)
+        # The second edit queues behind the first; the third folds into the second.
+        results = await asyncio.gather(
+            *(coordinator.edit_original(Failing(FakeUser(1), log, message=message), content=c) for c in "abc"),
+            return_exceptions=True,
+        )
+        await asyncio.wait_for(coordinator.wait_idle(), timeout=0.1)
+        return coordinator, results
+
+    coordinator, results = asyncio.run(scenario())
+    assert coordinator.coalesced_count == 1
+    assert [type(result) for result in results] == [RuntimeError] * 3
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from gamba_bot.database import BetEntry, InsufficientBalanceError
+
+from .conftest import STARTING_BALANCE, user
+
+
+def test_entries_apply_in_order(with_db):
+    async def scenario(db):
+        alice = user(1)
+        outcomes = await db.settle_many(
+            [
+                BetEntry(alice, STARTING_BALANCE, -STARTING_BALANCE, "blackjack"),
+                # Nothing left to stake after the first entry.
+                BetEntry(alice, 100, 100, "blackjack"),
+            ]
+        )
+        return outcomes, await db.get_user(alice.id)
+
+    outcomes, record = with_db(scenario)
+    assert [outcome.accepted for outcome in outcomes] == [True, False]
+    assert outcomes[0].balance == 0
+    assert record.balance == 0
+
+
+def test_history_rows_only_for_accepted_entries(with_db):
+    async def scenario(db):
+        alice, bob = user(1), user(2)
+        await db.settle_many(
+            [
+                BetEntry(alice, 500, 250, "blackjack"),
+                BetEntry(bob, STARTING_BALANCE + 1, 0, "blackjack"),
+            ]
+        )
+        return await db.bet_history(alice.id, limit=10), await db.bet_history(bob.id, limit=10)
+
+    alice_rows, bob_rows = with_db(scenario)
+    assert [(row.stake, row.delta, row.balance_after) for row in alice_rows] == [(500, 250, STARTING_BALANCE + 250)]
+    assert bob_rows == []
+
+
+def test_invalid_stake_writes_nothing(with_db):
+    async def scenario(db):
+        alice = user(1)
+        with pytest.raises(ValueError):
+            await db.settle_many([BetEntry(alice, 100, 50, "blackjack"), BetEntry(alice, 0, 0, "blackjack")])
+        return await db.get_user(alice.id)
+
+    assert with_db(scenario) is None
+
+
+def test_failed_batch_rolls_back_every_entry(with_db):
+    async def scenario(db):
+        alice = user(1)
+        await db.ensure_user(alice)
+        with pytest.raises(RuntimeError):
+            async with db.batch():
+                await db.settle_bet(alice, 100, 900)
+                raise RuntimeError("boom")
+        return await db.get_user(alice.id), await db.bet_history(alice.id, limit=10)
+
+    record, rows = with_db(scenario)
+    assert record.balance == STARTING_BALANCE
+    assert rows == []
+
+
+def test_other_writers_wait_for_an_open_batch(with_db):
+    # A bet from another task must not join a batch that later rolls back.
+    async def scenario(db):
+        alice, bob = user(1), user(2)
+        await db.ensure_user(alice)
+        await db.ensure_user(bob)
+        inside = asyncio.Event()
+
+        async def failing_batch():
+            async with db.batch():
+                await db.settle_bet(alice, 100, 900)
+                inside.set()
+                await asyncio.sleep(0.05)
+                raise RuntimeError("boom")
+
+        async def bystander():
+            await inside.wait()
+            return await db.settle_bet(bob, 100, 40)
+
+        batch_task = asyncio.create_task(failing_batch())
+        reported = await bystander()
+        with pytest.raises(RuntimeError):
+            await batch_task
+        return reported, await db.get_user(alice.id), await db.get_user(bob.id)
+
+    reported, alice_record, bob_record = with_db(scenario)
+    assert alice_record.balance == STARTING_BALANCE
+    assert reported.balance == bob_record.balance == STARTING_BALANCE + 40
+
+
+def test_rejected_single_bet_leaves_balance(with_db):
+    async def scenario(db):
+        alice = user(1)
+        with pytest.raises(InsufficientBalanceError):
+            await db.settle_bet(alice, STARTING_BALANCE + 1, 0)
+        return await db.get_user(alice.id)
+
+    assert with_db(scenario).balance == STARTING_BALANCE
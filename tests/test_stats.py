@@ -0,0 +1,61 @@
+import time
+
+from gamba_bot.services.stats import GameStats, StatTotals
+
+# Flushes prune buckets by the wall clock, so the recorded bets have to be recent.
+NOW = int(time.time())
+
+
+def _totals(db_rows):
+    stats = GameStats()
+    stats.restore(db_rows)
+    return stats.totals("1h", now=NOW)
+
+
+def test_processes_add_to_shared_buckets(with_db):
+    async def scenario(db):
+        first, second = GameStats(), GameStats()
+        first._db = second._db = db
+        first.record("slots", 1, 100, 50, now=NOW)
+        second.record("slots", 1, 200, -200, now=NOW)
+        await first.flush()
+        await second.flush()
+        # A flush with nothing new must not add the same bets again.
+        assert await first.flush() == 0
+        first.record("slots", 1, 100, -100, now=NOW)
+        await first.flush()
+        return await db.load_game_stats(GameStats.oldest_buckets(NOW))
+
+    assert _totals(with_db(scenario)) == {"slots": StatTotals(bets=3, wins=1, stake=400, delta=-250)}
+
+
+def test_failed_flush_is_added_to_the_next_one(with_db):
+    async def scenario(db):
+        stats = GameStats()
+
+        class Failing:
+            async def save_game_stats(self, rows, keep_from):
+                raise ConnectionError("ledger down")
+
+        stats._db = Failing()
+        stats.record("roulette", 1, 100, 100, now=NOW)
+        try:
+            await stats.flush()
+        except ConnectionError:
+            pass
+        stats._db = db
+        stats.record("roulette", 1, 100, -100, now=NOW)
+        await stats.flush()
+        return await db.load_game_stats(GameStats.oldest_buckets(NOW))
+
+    assert _totals(with_db(scenario)) == {"roulette": StatTotals(bets=2, wins=1, stake=200, delta=0)}
+
+
+def test_increments_survive_a_reused_slot():
+    stats = GameStats()
+    stats.record("slots", 1, 100, 10, now=NOW)
+    # 60 minutes later the 1m ring puts the new bucket in the same slot.
+    stats.record("slots", 1, 100, 10, now=NOW + 3600)
+    minute_rows = [row for row in stats.take_dirty() if row[2] == "1m"]
+    assert sorted(row[3] for row in minute_rows) == [NOW // 60, NOW // 60 + 60]
+    assert all(row[4:] == (1, 1, 100, 10) for row in minute_rows)